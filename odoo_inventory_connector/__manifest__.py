@@ -19,12 +19,16 @@ Features:
     'depends': ['base', 'web', 'mail'],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/inventory_views.xml',
         'views/field_definition_views.xml',
         'views/field_aggregation_views.xml',
         'views/field_value_views.xml',
         'views/item_views.xml',
+        'views/tag_views.xml',
         'views/import_wizard_views.xml',
+        'views/sync_job_views.xml',
+        'views/sync_run_views.xml',
         'views/menu_views.xml',
     ],
     'assets': {
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""End-to-end benchmark: action_sync_inventory and action_import_items inside Odoo.
+
+Needs an Odoo installation and a database with odoo_inventory_connector
+installed; the synthetic inventories are served by the local stand-in API:
+
+    python3 odoo_inventory_connector/benchmarks/bench_odoo_sync.py -d bench \\
+        --addons-path /opt/odoo/addons,. --sizes 1000,10000,100000
+
+Each size runs in a fresh process so its peak RSS is not inflated by the
+previous one. One JSON object per action is printed: wall time, peak RSS,
+SQL query count and the per-phase figures of the recorded sync run. The
+transaction is rolled back afterwards unless --keep is given.
+
+--incremental turns on incremental sync against a stand-in API with ETag
+and 'since' support; --touch N modifies N items remotely before each
+re-import, so both the unchanged and the changed paths are measured.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+_BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, _BENCH_DIR)
+
+from fake_inventory_api import FakeInventoryApi, SyntheticInventory  # noqa: E402
+
+
+def _peak_rss_kb():
+    # ru_maxrss is in kilobytes on Linux, in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _run_action(env, inventory, action, size, args):
+    cr = env.cr
+    queries = cr.sql_log_count
+    start = time.perf_counter()
+    getattr(inventory, action)()
+    env.flush_all()
+    elapsed = time.perf_counter() - start
+    query_count = cr.sql_log_count - queries
+
+    run = env['inventory.connector.sync.run'].search([('inventory_id', '=', inventory.id)], limit=1)
+    return {
+        'benchmark': 'odoo_sync',
+        'action': action,
+        'items': size,
+        'import_mode': args.import_mode,
+        'page_size': args.page_size,
+        'incremental': args.incremental,
+        'touched': args.touch,
+        'fields': args.text_fields + args.numeric_fields + args.boolean_fields + args.multiline_fields,
+        'tags': args.tags,
+        'seconds': round(elapsed, 3),
+        'items_per_second': round(size / elapsed, 1) if action == 'action_import_items' and elapsed else None,
+        'peak_rss_kb': _peak_rss_kb(),
+        'sql_queries': query_count,
+        'phases': {
+            phase.phase: {
+                'wall_time': round(phase.wall_time, 3),
+                'http_time': round(phase.http_time, 3),
+                'http_requests': phase.http_requests,
+                'http_bytes': phase.http_bytes,
+                'rows_created': phase.rows_created,
+                'rows_updated': phase.rows_updated,
+                'rows_skipped': phase.rows_skipped,
+                'query_count': phase.query_count,
+            } for phase in run.phase_ids
+        },
+    }
+
+
+def run_size(size, args):
+    """Benchmark one inventory size in this process, returning the result dicts"""
+    import odoo
+    from odoo.modules.registry import Registry
+
+    config_args = ['-d', args.database]
+    if args.config:
+        config_args += ['-c', args.config]
+    if args.addons_path:
+        config_args += ['--addons-path', args.addons_path]
+    odoo.tools.config.parse_config(config_args)
+
+    synthetic = SyntheticInventory(size, args.text_fields, args.numeric_fields, args.boolean_fields,
+                                   args.multiline_fields, tag_count=args.tags, tags_per_item=args.tags_per_item)
+    token = f"bench-{uuid.uuid4().hex}"
+    results = []
+    with FakeInventoryApi(synthetic, latency=args.latency, token=token, conditional=args.incremental) as api:
+        registry = Registry(args.database)
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            inventory = env['inventory.connector.inventory'].create({
+                'name': f"Benchmark {size}",
+                'api_url': api.url,
+                'api_token': token,
+                'import_mode': args.import_mode,
+                'import_page_size': args.page_size,
+                'incremental_sync': args.incremental,
+                'auto_sync': False,
+            })
+            actions = ['action_sync_inventory', 'action_import_items']
+            # A second import measures the unchanged-items path
+            actions += ['action_import_items'] * args.reimports
+            for position, action in enumerate(actions):
+                if position > 1 and args.touch:
+                    synthetic.touch(range(1, min(args.touch, size) + 1))
+                result = _run_action(env, inventory, action, size, args)
+                result['http_server_requests'] = api.stats['requests']
+                result['http_not_modified'] = api.stats['not_modified']
+                results.append(result)
+            if args.keep:
+                cr.commit()
+            else:
+                cr.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('-c', '--config', help="Odoo configuration file")
+    parser.add_argument('--addons-path')
+    parser.add_argument('--sizes', default='1000,10000,100000', help="comma separated item counts")
+    parser.add_argument('--text-fields', type=int, default=2)
+    parser.add_argument('--numeric-fields', type=int, default=2)
+    parser.add_argument('--boolean-fields', type=int, default=2)
+    parser.add_argument('--multiline-fields', type=int, default=0)
+    parser.add_argument('--tags', type=int, default=50, help="distinct tags in the inventory")
+    parser.add_argument('--tags-per-item', type=int, default=3)
+    parser.add_argument('--import-mode', default='paged', choices=('single', 'paged', 'stream', 'pipeline'))
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.0, help="server delay per request (s)")
+    parser.add_argument('--reimports', type=int, default=1, help="unchanged re-imports after the first import")
+    parser.add_argument('--incremental', action='store_true', help="incremental sync against a conditional API")
+    parser.add_argument('--touch', type=int, default=0, help="items modified remotely before each re-import")
+    parser.add_argument('--keep', action='store_true', help="commit the benchmark inventories")
+    parser.add_argument('--output', help="also append the JSON lines to this file")
+    parser.add_argument('--size', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size:
+        for result in run_size(args.size, args):
+            print(json.dumps(result), flush=True)
+        return
+
+    output = open(args.output, 'a') if args.output else None
+    try:
+        for size in (int(size) for size in args.sizes.split(',') if size.strip()):
+            # One child process per size, for a meaningful peak RSS
+            child = subprocess.run([sys.executable, os.path.abspath(__file__), '--size', str(size)] + sys.argv[1:],
+                                   stdout=subprocess.PIPE, universal_newlines=True, check=True)
+            for line in child.stdout.splitlines():
+                if line.startswith('{'):
+                    print(line, flush=True)
+                    if output:
+                        output.write(line + '\n')
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
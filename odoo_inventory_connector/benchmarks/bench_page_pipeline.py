@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Benchmark: sequential paged download vs. the concurrent PagePipeline.
+
+Runs against the local stand-in API without an Odoo server; the database
+work of each page is emulated with a fixed cost per item:
+
+    python3 odoo_inventory_connector/benchmarks/bench_page_pipeline.py --items 20000 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+_BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+# Addon directory, for the tools package which runs without Odoo
+sys.path.insert(0, os.path.dirname(_BENCH_DIR))
+sys.path.insert(0, _BENCH_DIR)
+
+from fake_inventory_api import API_PREFIX, FakeInventoryApi, SyntheticInventory  # noqa: E402
+from tools import http_client, page_pipeline  # noqa: E402
+
+OPTIONS = {'pool_size': 16, 'connect_timeout': 10, 'read_timeout': None}
+
+
+def _fetcher(api, page_size):
+    items_url = f"{api.url}{API_PREFIX}/items"
+
+    def fetch_page(page):
+        response = http_client.fetch(items_url, OPTIONS, params={
+            'token': api.token, 'page': page, 'pageSize': page_size})
+        response.raise_for_status()
+        return response.json()
+    return fetch_page
+
+
+def _consume(pages, write_cost):
+    count = 0
+    for items in pages:
+        time.sleep(write_cost * len(items))
+        count += len(items)
+    return count
+
+
+def _sequential_pages(fetch_page, page_size):
+    page = 1
+    while True:
+        items = fetch_page(page)
+        if items:
+            yield items
+        if len(items) != page_size:
+            return
+        page += 1
+
+
+def run(item_count, page_size, latency, write_cost, workers, max_buffered):
+    inventory = SyntheticInventory(item_count)
+    results = []
+    with FakeInventoryApi(inventory, latency=latency) as api:
+        fetch_page = _fetcher(api, page_size)
+        for mode, pages in (
+            ('sequential', lambda: _sequential_pages(fetch_page, page_size)),
+            ('pipeline', lambda: page_pipeline.PagePipeline(fetch_page, workers, max_buffered)),
+        ):
+            start = time.perf_counter()
+            count = _consume(pages(), write_cost)
+            elapsed = time.perf_counter() - start
+            if count != item_count:
+                raise AssertionError(f"{mode}: consumed {count} of {item_count} items")
+            results.append({
+                'benchmark': 'page_pipeline',
+                'mode': mode,
+                'items': item_count,
+                'page_size': page_size,
+                'latency': latency,
+                'write_cost': write_cost,
+                'workers': workers if mode == 'pipeline' else 1,
+                'seconds': round(elapsed, 3),
+                'items_per_second': round(count / elapsed, 1),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.05, help="server delay per request (s)")
+    parser.add_argument('--write-cost', type=float, default=0.00005, help="emulated DB cost per item (s)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-buffered', type=int, default=8)
+    args = parser.parse_args()
+    for result in run(args.items, args.page_size, args.latency, args.write_cost, args.workers, args.max_buffered):
+        print(json.dumps(result))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark: compiled payload normalizer vs. the per-item key lookups and strptime.
+
+Runs without an Odoo server:
+
+    python3 odoo_inventory_connector/benchmarks/bench_payload_normalizer.py --items 50000
+
+The legacy path is the incremental filter and batch upsert of the item
+import before the normalizer: chained dict.get() calls per item and a
+cascade of strptime() formats per timestamp.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Addon directory, for the tools package which runs without Odoo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import payload_normalizer  # noqa: E402
+
+LEGACY_FORMATS = [
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S',
+]
+
+
+def legacy_parse_datetime(datetime_str):
+    """Inventory._parse_datetime before the normalizer"""
+    if not datetime_str:
+        return None
+    clean_str = datetime_str
+    if clean_str.endswith('Z'):
+        clean_str = clean_str[:-1]
+    if '.' in clean_str:
+        date_part, microsecond_part = clean_str.split('.')
+        clean_str = f"{date_part}.{microsecond_part[:6].ljust(6, '0')}"
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(clean_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_item(item_data):
+    updated_at = legacy_parse_datetime(item_data.get('updatedAt') or item_data.get('UpdatedAt'))
+    external_id = str(item_data.get('id'))
+    name = item_data.get('name', f"Item {external_id}")
+    if item_data.get('tags'):
+        tag_names = item_data.get('tags')
+    elif item_data.get('tagsString'):
+        tag_names = [tag_name.strip() for tag_name in item_data.get('tagsString', '').split(',')]
+    else:
+        tag_names = []
+    return external_id, name, updated_at, tag_names
+
+
+def normalized_item(item):
+    if item.tags:
+        tag_names = item.tags
+    elif item.tags_string:
+        tag_names = [tag_name.strip() for tag_name in item.tags_string.split(',')]
+    else:
+        tag_names = []
+    return str(item.id), item.name or f"Item {item.id}", item.updated_at, tag_names
+
+
+def build_items(item_count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1)
+    items = []
+    for item_id in range(1, item_count + 1):
+        updated_at = start + timedelta(seconds=rng.randint(0, 10 ** 7), microseconds=rng.randint(0, 999999))
+        items.append({
+            'id': item_id,
+            'name': f"Item {item_id}",
+            # .NET serializes 7 fraction digits, which fromisoformat() rejects before Python 3.11
+            'updatedAt': updated_at.strftime('%Y-%m-%dT%H:%M:%S.%f') + str(rng.randint(0, 9)),
+            'tagsString': 'red, blue' if item_id % 3 else '',
+            'customFields': {},
+        })
+    return items
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def run(item_count):
+    items = build_items(item_count)
+
+    legacy_rows, legacy_time = _timed(lambda: [legacy_item(item) for item in items])
+    normalized_rows, normalizer_time = _timed(
+        lambda: [normalized_item(item) for item in payload_normalizer.ITEM.normalize_all(items)])
+
+    if legacy_rows != normalized_rows:
+        raise AssertionError("Normalized items differ from the legacy lookups")
+
+    return {
+        'benchmark': 'payload_normalizer',
+        'items': item_count,
+        'legacy_seconds': round(legacy_time, 4),
+        'normalizer_seconds': round(normalizer_time, 4),
+        'speedup': round(legacy_time / normalizer_time, 1) if normalizer_time else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, nargs='+', default=[10000, 50000])
+    args = parser.parse_args()
+    for item_count in args.items:
+        print(json.dumps(run(item_count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""Local stand-in for the InventoryApi endpoints of InventoryMgmt.MVC.
+
+Serves synthetic inventories on /api/InventoryApi/info, /aggregated and
+/items, with the same JSON shape and the same page/pageSize behaviour as
+InventoryApiController.GetInventoryItems. Used by the benchmarks:
+
+    python3 odoo_inventory_connector/benchmarks/fake_inventory_api.py --items 10000 --port 8765
+
+The real controller has no conditional requests; --conditional adds
+ETag / If-None-Match and Last-Modified to every endpoint and the 'since'
+filter to /items, to exercise the incremental sync paths. Like the real
+backend, editing an item does not move the inventory updatedAt.
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = '/api/InventoryApi'
+SLOTS_PER_TYPE = 3
+
+
+class SyntheticInventory(object):
+    """Deterministic synthetic inventory: field definitions, items and tags"""
+
+    def __init__(self, item_count=1000, text_fields=2, numeric_fields=2, boolean_fields=2,
+                 multiline_fields=0, tag_count=50, tags_per_item=3, seed=42):
+        self.item_count = item_count
+        self.tag_count = tag_count
+        self.tags_per_item = tags_per_item
+        self.seed = seed
+        self.updated_at = datetime(2025, 9, 1, 12, 0, 0)
+        # Items are dated relative to the initial updatedAt, touch() edits single items
+        self.items_updated_at = self.updated_at
+        self.touched = {}
+        self.fields = (
+            [(f"Text {i}", 'text') for i in range(1, text_fields + 1)]
+            + [(f"Notes {i}", 'multiline') for i in range(1, multiline_fields + 1)]
+            + [(f"Number {i}", 'numeric') for i in range(1, numeric_fields + 1)]
+            + [(f"Flag {i}", 'boolean') for i in range(1, boolean_fields + 1)]
+        )
+
+    def info(self):
+        return {
+            'id': 1,
+            'title': 'Benchmark Inventory',
+            'description': f'{self.item_count} synthetic items',
+            'category': 'Benchmark',
+            'isPublic': True,
+            'createdAt': '2025-01-01T00:00:00',
+            'updatedAt': self.updated_at.isoformat(),
+        }
+
+    def item(self, index):
+        rng = random.Random(self.seed * 1000003 + index)
+        custom_fields = {}
+        slots = {}
+        slot_counters = {'text': 0, 'numeric': 0, 'boolean': 0}
+        for name, field_type in self.fields:
+            if field_type == 'numeric':
+                value = round(rng.uniform(0, 1000), 2)
+            elif field_type == 'boolean':
+                value = rng.random() < 0.5
+            else:
+                value = f"value {rng.randint(1, 100)}"
+            custom_fields[name] = value
+            if field_type in slot_counters and slot_counters[field_type] < SLOTS_PER_TYPE:
+                slot_counters[field_type] += 1
+                slots[f"{field_type}Field{slot_counters[field_type]}Value"] = value
+        tags = sorted({f"tag-{rng.randint(1, self.tag_count)}" for _i in range(self.tags_per_item)}) if self.tag_count else []
+        item = {
+            'id': index,
+            'inventoryId': 1,
+            'customId': f"ITEM-{index:07d}",
+            'name': f"Item {index} (edited)" if index in self.touched else f"Item {index}",
+            'createdAt': '2025-01-01T00:00:00',
+            'updatedAt': self.item_updated_at(index).isoformat(),
+            'customFields': custom_fields,
+            'tags': tags,
+        }
+        item.update(slots)
+        return item
+
+    def item_updated_at(self, index):
+        return self.touched.get(index) or self.items_updated_at - timedelta(minutes=index % 1440)
+
+    def touch(self, indexes, when=None):
+        """Edit items remotely: rename them and move their updatedAt, not the inventory's"""
+        when = when or max([self.items_updated_at] + list(self.touched.values())) + timedelta(minutes=1)
+        for index in indexes:
+            self.touched[index] = when
+
+    def items(self, page=None, page_size=None, since=None):
+        start, stop = 1, self.item_count + 1
+        if page and page_size:
+            start = (page - 1) * page_size + 1
+            stop = min(stop, start + page_size)
+        if since:
+            return [self.item(index) for index in range(start, stop) if self.item_updated_at(index) >= since]
+        return [self.item(index) for index in range(start, stop)]
+
+    def aggregated(self):
+        values = {name: [] for name, _type in self.fields}
+        for index in range(1, self.item_count + 1):
+            for name, value in self.item(index)['customFields'].items():
+                values[name].append(value)
+        results = []
+        for name, field_type in self.fields:
+            field_values = values[name]
+            result = {'fieldName': name, 'fieldType': field_type}
+            if field_type == 'numeric' and field_values:
+                ordered = sorted(field_values)
+                middle = len(ordered) // 2
+                result.update({
+                    'minValue': ordered[0],
+                    'maxValue': ordered[-1],
+                    'averageValue': sum(ordered) / len(ordered),
+                    'medianValue': ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2,
+                })
+            elif field_type == 'boolean' and field_values:
+                true_count = sum(1 for value in field_values if value)
+                result.update({
+                    'trueCount': true_count,
+                    'falseCount': len(field_values) - true_count,
+                    'truePercentage': true_count * 100.0 / len(field_values),
+                })
+            elif field_values:
+                counts = {}
+                for value in field_values:
+                    counts[value] = counts.get(value, 0) + 1
+                top = sorted(counts.items(), key=lambda pair: (-pair[1], pair[0]))[:5]
+                result['mostCommonValues'] = [
+                    {'value': value, 'frequency': count, 'percentage': count * 100.0 / len(field_values)}
+                    for value, count in top
+                ]
+            results.append(result)
+        return {
+            'inventoryId': 1,
+            'itemCount': self.item_count,
+            'customFields': [
+                {'name': name, 'type': field_type, 'description': '', 'showInTable': True,
+                 'numericConfig': {'minValue': 0, 'maxValue': 1000, 'isInteger': False} if field_type == 'numeric' else None}
+                for name, field_type in self.fields
+            ],
+            'aggregatedResults': results,
+        }
+
+
+class FakeInventoryApi(object):
+    """Threaded HTTP server serving a SyntheticInventory.
+
+    latency adds a fixed delay (seconds) to every response, to emulate a
+    remote backend. conditional enables ETag / Last-Modified validators and
+    the 'since' item filter. Request counts, 304 responses and bytes sent
+    are recorded in stats.
+    """
+
+    def __init__(self, inventory, host='127.0.0.1', port=0, latency=0.0, token='bench-token', conditional=False):
+        self.inventory = inventory
+        self.latency = latency
+        self.token = token
+        self.conditional = conditional
+        self.stats = {'requests': 0, 'not_modified': 0, 'bytes': 0}
+        self._stats_lock = threading.Lock()
+        self._aggregated = None
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                status, body = api.handle(parts.path, query)
+                payload = json.dumps(body).encode('utf-8')
+                headers = {}
+                if api.conditional and status == 200:
+                    headers['ETag'] = '"%s"' % hashlib.sha1(payload).hexdigest()
+                    headers['Last-Modified'] = format_datetime(api.inventory.updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+                    if self.headers.get('If-None-Match') == headers['ETag']:
+                        status, payload = 304, b''
+                if api.latency:
+                    time.sleep(api.latency)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                with api._stats_lock:
+                    api.stats['requests'] += 1
+                    api.stats['not_modified'] += status == 304
+                    api.stats['bytes'] += len(payload)
+
+        return Handler
+
+    def handle(self, path, query):
+        if not path.startswith(API_PREFIX):
+            return 404, {'error': 'Not found'}
+        if not query.get('token'):
+            return 400, {'error': 'API token is required'}
+        if query['token'] != self.token:
+            return 401, {'error': 'Invalid API token'}
+
+        endpoint = path[len(API_PREFIX):]
+        if endpoint == '/info':
+            return 200, self.inventory.info()
+        if endpoint == '/aggregated':
+            if self._aggregated is None:
+                self._aggregated = self.inventory.aggregated()
+            return 200, self._aggregated
+        if endpoint == '/items':
+            page = int(query['page']) if query.get('page') else None
+            page_size = int(query['pageSize']) if query.get('pageSize') else None
+            since = datetime.fromisoformat(query['since']) if self.conditional and query.get('since') else None
+            return 200, self.inventory.items(page, page_size, since)
+        return 404, {'error': 'Not found'}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--text-fields', type=int, default=2)
+    parser.add_argument('--numeric-fields', type=int, default=2)
+    parser.add_argument('--boolean-fields', type=int, default=2)
+    parser.add_argument('--multiline-fields', type=int, default=0)
+    parser.add_argument('--tags', type=int, default=50)
+    parser.add_argument('--tags-per-item', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--token', default='bench-token')
+    parser.add_argument('--conditional', action='store_true', help="support ETag validators and 'since'")
+    args = parser.parse_args()
+
+    inventory = SyntheticInventory(args.items, args.text_fields, args.numeric_fields, args.boolean_fields,
+                                   args.multiline_fields, tag_count=args.tags, tags_per_item=args.tags_per_item)
+    api = FakeInventoryApi(inventory, port=args.port, latency=args.latency, token=args.token,
+                           conditional=args.conditional)
+    print(f"Serving {args.items} items on {api.url}{API_PREFIX} (token: {args.token})")
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
 from . import inventory
+from . import inventory_scheduler
+from . import sync_job
+from . import sync_run
 from . import field_definition
 from . import field_aggregation
 from . import item
 from . import field_value
-from . import tag
\ No newline at end of file
+from . import tag
+from . import inventory_pivot
+from . import text_search
\ No newline at end of file
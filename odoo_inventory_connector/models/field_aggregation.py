@@ -3,6 +3,9 @@
 from odoo import api, fields, models, _
 import json
 
+# Number of most common values kept for text fields, as the remote AggregationService does
+TOP_VALUES_LIMIT = 5
+
 class InventoryConnectorFieldAggregation(models.Model):
     _name = 'inventory.connector.field.aggregation'
     _description = 'Inventory Field Aggregation'
@@ -22,6 +25,7 @@ class InventoryConnectorFieldAggregation(models.Model):
     max_value = fields.Float('Maximum Value', digits=(16, 6))
     average_value = fields.Float('Average Value', digits=(16, 6))
     median_value = fields.Float('Median Value', digits=(16, 6))
+    stddev_value = fields.Float('Standard Deviation', digits=(16, 6))
     
     # Boolean field aggregations
     true_count = fields.Integer('True Count')
@@ -31,10 +35,13 @@ class InventoryConnectorFieldAggregation(models.Model):
     # Text field aggregations (stored as JSON)
     common_values_json = fields.Text('Common Values (JSON)')
     
+    # Running aggregate state (JSON) when maintained during import
+    aggregate_state = fields.Text('Aggregate State', readonly=True, copy=False)
+    
     # Computed fields for UI display
     display_aggregation = fields.Html('Aggregated Results', compute='_compute_display_aggregation')
     
-    @api.depends('field_type', 'min_value', 'max_value', 'average_value', 'median_value',
+    @api.depends('field_type', 'min_value', 'max_value', 'average_value', 'median_value', 'stddev_value',
                 'true_count', 'false_count', 'true_percentage', 'common_values_json')
     def _compute_display_aggregation(self):
         """Compute a readable display of the aggregation"""
@@ -46,6 +53,8 @@ class InventoryConnectorFieldAggregation(models.Model):
                     <strong>Average:</strong> {record.average_value:.2f}<br/>
                     <strong>Median:</strong> {record.median_value:.2f}
                 """
+                if record.stddev_value:
+                    record.display_aggregation += f"<br/><strong>Std. Deviation:</strong> {record.stddev_value:.2f}"
             elif record.field_type == 'boolean':
                 record.display_aggregation = f"""
                     <strong>True:</strong> {record.true_count} ({record.true_percentage:.1f}%)<br/>
@@ -62,4 +71,77 @@ class InventoryConnectorFieldAggregation(models.Model):
                 except Exception as e:
                     record.display_aggregation = f"<em>Error parsing values: {str(e)}</em>"
             else:
-                record.display_aggregation = "<em>No aggregation data available</em>"
\ No newline at end of file
+                record.display_aggregation = "<em>No aggregation data available</em>"
+    
+    @api.model
+    def _compute_local_values(self, inventory):
+        """Return the create values of the aggregations of inventory, computed in SQL from its active items"""
+        query, params = self.env['inventory.connector.field.value']._values_query(inventory)
+        cr = self.env.cr
+        
+        cr.execute(f"""
+            SELECT v.field_name, v.field_type,
+                   MIN(v.numeric_value) FILTER (WHERE v.field_type = 'numeric'),
+                   MAX(v.numeric_value) FILTER (WHERE v.field_type = 'numeric'),
+                   AVG(v.numeric_value) FILTER (WHERE v.field_type = 'numeric'),
+                   percentile_cont(0.5) WITHIN GROUP (ORDER BY v.numeric_value) FILTER (WHERE v.field_type = 'numeric'),
+                   stddev_pop(v.numeric_value) FILTER (WHERE v.field_type = 'numeric'),
+                   COUNT(*) FILTER (WHERE v.field_type = 'boolean' AND v.boolean_value),
+                   COUNT(*) FILTER (WHERE v.field_type = 'boolean' AND NOT COALESCE(v.boolean_value, FALSE))
+              FROM ({query}) v
+             WHERE v.active
+          GROUP BY v.field_name, v.field_type
+          ORDER BY MIN(v.position)
+        """, params)
+        aggregations = {}
+        for field_name, field_type, min_value, max_value, average, median, stddev, true_count, false_count in cr.fetchall():
+            values = {
+                'inventory_id': inventory.id,
+                'field_name': field_name,
+                'field_type': field_type,
+            }
+            if field_type == 'numeric':
+                values.update({
+                    'min_value': min_value or 0.0,
+                    'max_value': max_value or 0.0,
+                    'average_value': average or 0.0,
+                    'median_value': median or 0.0,
+                    'stddev_value': stddev or 0.0,
+                })
+            elif field_type == 'boolean':
+                total = true_count + false_count
+                values.update({
+                    'true_count': true_count,
+                    'false_count': false_count,
+                    'true_percentage': true_count * 100.0 / total if total else 0.0,
+                })
+            aggregations[(field_name, field_type)] = values
+        
+        cr.execute(f"""
+            SELECT field_name, field_type, text_value, frequency, total
+              FROM (
+                    SELECT v.field_name, v.field_type, v.text_value, COUNT(*) AS frequency,
+                           SUM(COUNT(*)) OVER (PARTITION BY v.field_name, v.field_type) AS total,
+                           ROW_NUMBER() OVER (PARTITION BY v.field_name, v.field_type
+                                              ORDER BY COUNT(*) DESC, v.text_value) AS rank
+                      FROM ({query}) v
+                     WHERE v.active
+                       AND v.field_type IN ('text', 'multiline')
+                       AND COALESCE(v.text_value, '') != ''
+                  GROUP BY v.field_name, v.field_type, v.text_value
+                   ) ranked
+             WHERE rank <= %s
+          ORDER BY field_name, field_type, rank
+        """, params + [TOP_VALUES_LIMIT])
+        common_values = {}
+        for field_name, field_type, text_value, frequency, total in cr.fetchall():
+            common_values.setdefault((field_name, field_type), []).append({
+                'value': text_value,
+                'frequency': frequency,
+                'percentage': frequency * 100.0 / float(total),
+            })
+        for key, values in common_values.items():
+            if key in aggregations:
+                aggregations[key]['common_values_json'] = json.dumps(values)
+        
+        return list(aggregations.values())
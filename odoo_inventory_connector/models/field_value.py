@@ -1,5 +1,8 @@
 from odoo import models, fields, api
 
+# Rows per multi-row INSERT statement
+INSERT_BATCH_SIZE = 1000
+
 class FieldValue(models.Model):
     _name = 'inventory.connector.field.value'
     _description = 'Field Value for Inventory Item'
@@ -24,12 +27,141 @@ class FieldValue(models.Model):
     # Display value for list views
     display_value = fields.Char(string='Value', compute='_compute_display_value', store=True)
     
+    def init(self):
+        # Composite indexes for per-item lookups and per-field filtering and sorting
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inventory_connector_field_value_item_field_idx
+                ON inventory_connector_field_value (item_id, field_name)
+        """)
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inventory_connector_field_value_field_numeric_idx
+                ON inventory_connector_field_value (field_name, numeric_value)
+        """)
+    
+    @staticmethod
+    def _format_display_value(field_type, text_value, numeric_value, boolean_value):
+        if field_type == 'numeric':
+            return str(numeric_value or 0.0)
+        elif field_type == 'boolean':
+            return 'Yes' if boolean_value else 'No'
+        return text_value or ''
+    
+    @staticmethod
+    def _to_json_value(field_type, text_value, numeric_value, boolean_value):
+        """Typed value of a field value row as stored in item.custom_values"""
+        if field_type == 'numeric':
+            return numeric_value
+        elif field_type == 'boolean':
+            return boolean_value
+        return text_value
+    
+    @staticmethod
+    def _from_json_values(custom_values, field_types):
+        """Turn an item.custom_values dict into (field_name, field_type, text, numeric, boolean) tuples typed by field_types"""
+        rows = []
+        for field_name, value in (custom_values or {}).items():
+            field_type = field_types.get(field_name)
+            if field_type is None:
+                field_type = 'boolean' if isinstance(value, bool) else 'numeric' if isinstance(value, (int, float)) else 'text'
+            if field_type == 'numeric':
+                rows.append((field_name, field_type, None, value, None))
+            elif field_type == 'boolean':
+                rows.append((field_name, field_type, None, None, value))
+            else:
+                rows.append((field_name, field_type, value, None, None))
+        return rows
+    
+    @api.model
+    def _values_query(self, inventory=None, item_ids=None, field_names=None):
+        """Return (sql, params) listing the field values of inventory or item_ids in either storage, optionally of field_names only"""
+        self.flush_model()
+        self.env['inventory.connector.item'].flush_model(['inventory_id', 'active', 'custom_values'])
+        self.env['inventory.connector.field.definition'].flush_model(['inventory_id', 'name', 'field_type', 'sequence'])
+        if inventory is not None:
+            where, params = "i.inventory_id = %s", [inventory.id]
+        else:
+            where, params = "i.id = ANY(%s)", [list(item_ids)]
+        rows_where, jsonb_where = where, where
+        if field_names is not None:
+            rows_where += " AND v.field_name = ANY(%s)"
+            jsonb_where += " AND e.key = ANY(%s)"
+            params = params + [list(field_names)]
+        
+        rows_query = f"""
+            SELECT v.item_id, i.active, v.id AS position, v.field_name, v.field_type,
+                   v.text_value, v.numeric_value, v.boolean_value
+              FROM inventory_connector_field_value v
+              JOIN inventory_connector_item i ON i.id = v.item_id
+             WHERE {rows_where}
+        """
+        # Values without a definition (slot fallbacks) take the type of their JSON value
+        jsonb_query = f"""
+            SELECT i.id AS item_id, i.active, COALESCE(d.sequence, 0) AS position, e.key AS field_name,
+                   COALESCE(d.field_type, CASE jsonb_typeof(e.value) WHEN 'number' THEN 'numeric'
+                                                                     WHEN 'boolean' THEN 'boolean'
+                                                                     ELSE 'text' END) AS field_type,
+                   CASE WHEN jsonb_typeof(e.value) = 'string' THEN e.value #>> '{{}}' END AS text_value,
+                   CASE WHEN jsonb_typeof(e.value) = 'number' THEN (e.value #>> '{{}}')::double precision END AS numeric_value,
+                   CASE WHEN jsonb_typeof(e.value) = 'boolean' THEN (e.value #>> '{{}}')::boolean END AS boolean_value
+              FROM inventory_connector_item i
+        CROSS JOIN LATERAL jsonb_each(i.custom_values) e
+         LEFT JOIN inventory_connector_field_definition d ON d.inventory_id = i.inventory_id AND d.name = e.key
+             WHERE {jsonb_where} AND i.custom_values IS NOT NULL
+        """
+        if inventory is None:
+            return f"{rows_query} UNION ALL {jsonb_query}", params + params
+        if inventory.value_storage == 'jsonb':
+            return jsonb_query, params
+        return rows_query, params
+    
     @api.depends('field_type', 'text_value', 'numeric_value', 'boolean_value')
     def _compute_display_value(self):
         for record in self:
-            if record.field_type == 'numeric':
-                record.display_value = str(record.numeric_value)
-            elif record.field_type == 'boolean':
-                record.display_value = 'Yes' if record.boolean_value else 'No'
+            record.display_value = self._format_display_value(
+                record.field_type, record.text_value, record.numeric_value, record.boolean_value)
+    
+    @api.model
+    def _bulk_replace_values(self, clear_item_ids, rows, return_removed=False):
+        """Delete the values of clear_item_ids and insert rows with plain SQL; with return_removed, return the deleted rows"""
+        self.flush_model()
+        cr = self.env.cr
+        removed = []
+        
+        if clear_item_ids:
+            if return_removed:
+                cr.execute("""
+                    DELETE FROM inventory_connector_field_value
+                     WHERE item_id = ANY(%s)
+                 RETURNING item_id, field_name, field_type, text_value, numeric_value, boolean_value
+                """, (list(clear_item_ids),))
+                removed = cr.fetchall()
             else:
-                record.display_value = record.text_value or ''
\ No newline at end of file
+                cr.execute("DELETE FROM inventory_connector_field_value WHERE item_id = ANY(%s)", (list(clear_item_ids),))
+        
+        if rows:
+            uid = self.env.uid
+            now = fields.Datetime.now()
+            for offset in range(0, len(rows), INSERT_BATCH_SIZE):
+                chunk = rows[offset:offset + INSERT_BATCH_SIZE]
+                params = []
+                for item_id, field_name, field_type, text_value, numeric_value, boolean_value in chunk:
+                    params.extend((
+                        item_id, field_name, field_type, text_value, numeric_value, boolean_value,
+                        self._format_display_value(field_type, text_value, numeric_value, boolean_value),
+                        uid, now, uid, now,
+                    ))
+                placeholders = ', '.join(['(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'] * len(chunk))
+                cr.execute(f"""
+                    INSERT INTO inventory_connector_field_value
+                        (item_id, field_name, field_type, text_value, numeric_value, boolean_value,
+                         display_value, create_uid, create_date, write_uid, write_date)
+                    VALUES {placeholders}
+                """, params)
+        
+        # The ORM cache does not know about the rows changed above
+        self.invalidate_model()
+        Item = self.env['inventory.connector.item']
+        Item.invalidate_model(['field_value_ids'])
+        # Schedule the recompute of the stored item summaries, for the touched items only
+        Item.browse(set(clear_item_ids) | {row[0] for row in rows}).modified(['field_value_ids'])
+        return removed
\ No newline at end of file
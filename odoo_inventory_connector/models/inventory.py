@@ -2,14 +2,39 @@
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools import float_compare
 import requests
+import hashlib
 import json
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
 import re
+import time
+
+from ..tools import http_client
+from ..tools.field_mapper import FieldMapper
+from ..tools.json_stream import iter_json_array
+from ..tools.page_pipeline import DEFAULT_MAX_BUFFERED, DEFAULT_WORKERS, PagePipeline
+from ..tools import payload_normalizer
+from ..tools.streaming_aggregates import FieldAggregate, StreamingAggregates
+from ..tools.sync_metrics import NULL_METRICS, SyncMetrics
 
 _logger = logging.getLogger(__name__)
 
+# Read size for streamed API responses
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# API locations and auth schemes probed by the connection test, most likely first
+DEFAULT_API_PATH = '/api/InventoryApi'
+API_PATHS = (DEFAULT_API_PATH, '/api/inventory', '/api', '/')
+AUTH_SCHEMES = [
+    ('query', 'Token Parameter'),
+    ('bearer', 'Bearer Token'),
+]
+
+# Overall time limit of the connection test, whatever the number of probes
+TEST_CONNECTION_DEADLINE = 15
+
 class InventoryConnectorInventory(models.Model):
     _name = 'inventory.connector.inventory'
     _description = 'External Inventory'
@@ -21,6 +46,10 @@ class InventoryConnectorInventory(models.Model):
     external_id = fields.Integer('External ID', readonly=True)
     api_token = fields.Char('API Token', required=True)
     api_url = fields.Char('API URL', required=True, default='https://localhost:5001')
+    api_path = fields.Char('API Path', default=DEFAULT_API_PATH, copy=False,
+        help="Path of the inventory API on the server, found by Test Connection.")
+    api_auth_scheme = fields.Selection(AUTH_SCHEMES, string='API Authentication', default='query', required=True,
+        help="How the API token is sent, found by Test Connection.")
     category = fields.Char('Category')
     is_public = fields.Boolean('Is Public')
     created_at = fields.Datetime('Created At')
@@ -29,10 +58,60 @@ class InventoryConnectorInventory(models.Model):
     last_sync = fields.Datetime('Last Synchronized', readonly=True)
     active = fields.Boolean('Active', default=True)
     
+    # Import settings
+    import_mode = fields.Selection([
+        ('single', 'Single Request'),
+        ('paged', 'Paged'),
+        ('stream', 'Streaming'),
+        ('pipeline', 'Concurrent Pages'),
+    ], string='Import Mode', default='paged', required=True,
+        help="Paged mode walks the items endpoint with page/pageSize so memory use is bounded by the page size. "
+             "Streaming mode pulls all items in one request but parses the response incrementally. "
+             "Concurrent Pages downloads pages in background threads while the previous pages are written.")
+    import_page_size = fields.Integer('Import Page Size', default=500,
+        help="Items per page in paged mode, items per batch in streaming mode.")
+    import_workers = fields.Integer('Download Threads', default=DEFAULT_WORKERS,
+        help="Threads fetching item pages in Concurrent Pages mode.")
+    import_queue_size = fields.Integer('Page Buffer', default=DEFAULT_MAX_BUFFERED,
+        help="Maximum pages downloaded ahead of the database writes in Concurrent Pages mode.")
+    incremental_sync = fields.Boolean('Incremental Sync',
+        help="Send ETag/If-Modified-Since validators and only import items modified since the previous import.")
+    http_validators = fields.Text('HTTP Validators', readonly=True, copy=False,
+        help="ETag and Last-Modified values per API endpoint (JSON), used by incremental sync.")
+    items_watermark = fields.Datetime('Items Watermark', readonly=True, copy=False,
+        help="Latest remote updatedAt seen during item import, sent as the 'since' filter.")
+    aggregation_source = fields.Selection([
+        ('remote', 'Remote API'),
+        ('local', 'Imported Items'),
+        ('streaming', 'Imported Items (Incremental)'),
+    ], string='Aggregations From', default='remote', required=True,
+        help="Remote API takes the field statistics from the aggregated endpoint. "
+             "Imported Items computes them locally from the imported field values after each import. "
+             "Incremental keeps running statistics updated with the values each import writes or replaces; "
+             "the median and most common values are then estimates.")
+    checkpoint_import = fields.Boolean('Checkpointed Import',
+        help="Commit the import after every page (or every Import Page Size items) and keep a resume cursor, "
+             "so an interrupted import continues where it stopped instead of starting over.")
+    import_resume_page = fields.Integer('Resume After Page', readonly=True, copy=False,
+        help="Last page committed by an interrupted checkpointed import, 0 when there is nothing to resume.")
+    import_resume_external_id = fields.Char('Resume After Item', readonly=True, copy=False,
+        help="External ID of the last item committed by an interrupted checkpointed import.")
+    import_resume_state = fields.Text('Resume State', readonly=True, copy=False,
+        help="Timestamp, counts and watermark of the interrupted import (JSON).")
+    value_storage = fields.Selection([
+        ('rows', 'One Record per Value'),
+        ('jsonb', 'Compact (JSONB)'),
+    ], string='Value Storage', default='rows', required=True,
+        help="One Record per Value stores each custom field value as a field value record. "
+             "Compact keeps the typed values of an item in a single JSONB column with a GIN index, "
+             "which is much smaller and faster to import; the values are then not editable one by one. "
+             "Changing it migrates the stored values.")
+    
     # Relations
     field_definition_ids = fields.One2many('inventory.connector.field.definition', 'inventory_id', string='Field Definitions')
     field_aggregation_ids = fields.One2many('inventory.connector.field.aggregation', 'inventory_id', string='Field Aggregations')
     item_ids = fields.One2many('inventory.connector.item', 'inventory_id', string='Items')
+    sync_run_ids = fields.One2many('inventory.connector.sync.run', 'inventory_id', string='Sync Runs')
     tag_ids = fields.One2many('inventory.connector.tag', 'inventory_id', string='Tags')
     
     _sql_constraints = [
@@ -45,49 +124,205 @@ class InventoryConnectorInventory(models.Model):
             if not record.api_token:
                 raise ValidationError(_("API Token cannot be empty"))
     
+    @api.constrains('import_page_size', 'import_workers', 'import_queue_size')
+    def _check_import_page_size(self):
+        for record in self:
+            if record.import_page_size <= 0:
+                raise ValidationError(_("Import page size must be a positive number"))
+            if record.import_workers <= 0 or record.import_queue_size <= 0:
+                raise ValidationError(_("Download threads and page buffer must be positive numbers"))
+    
+    def write(self, vals):
+        if vals.get('value_storage'):
+            for inventory in self.filtered(lambda inventory: inventory.value_storage != vals['value_storage']):
+                inventory._migrate_value_storage(vals['value_storage'])
+        return super().write(vals)
+    
+    def _migrate_value_storage(self, target):
+        """Move the custom values of this inventory's items to the target storage"""
+        self.ensure_one()
+        FieldValue = self.env['inventory.connector.field.value']
+        Item = self.env['inventory.connector.item']
+        cr = self.env.cr
+        
+        if target == 'jsonb':
+            FieldValue.flush_model()
+            Item.flush_model(['inventory_id', 'custom_values'])
+            # Duplicate names keep the last value, like the rows read back in id order
+            cr.execute("""
+                UPDATE inventory_connector_item AS item
+                   SET custom_values = data.custom_values
+                  FROM (
+                        SELECT v.item_id,
+                               jsonb_object_agg(v.field_name, CASE v.field_type
+                                   WHEN 'numeric' THEN to_jsonb(v.numeric_value)
+                                   WHEN 'boolean' THEN to_jsonb(v.boolean_value)
+                                   ELSE to_jsonb(v.text_value) END ORDER BY v.id) AS custom_values
+                          FROM inventory_connector_field_value v
+                          JOIN inventory_connector_item i ON i.id = v.item_id
+                         WHERE i.inventory_id = %s
+                      GROUP BY v.item_id
+                       ) AS data
+                 WHERE item.id = data.item_id
+             RETURNING item.id
+            """, (self.id,))
+            item_ids = [row[0] for row in cr.fetchall()]
+            cr.execute("""
+                DELETE FROM inventory_connector_field_value v
+                 USING inventory_connector_item i
+                 WHERE i.id = v.item_id AND i.inventory_id = %s
+            """, (self.id,))
+            FieldValue.invalidate_model()
+            Item.invalidate_model(['custom_values', 'field_value_ids'])
+            Item.browse(item_ids).modified(['custom_values'])
+        else:
+            Item.flush_model(['inventory_id', 'custom_values'])
+            cr.execute("""
+                SELECT id
+                  FROM inventory_connector_item
+                 WHERE inventory_id = %s AND custom_values IS NOT NULL
+              ORDER BY id
+            """, (self.id,))
+            item_ids = [row[0] for row in cr.fetchall()]
+            for offset in range(0, len(item_ids), self.import_page_size):
+                chunk = item_ids[offset:offset + self.import_page_size]
+                query, params = FieldValue._values_query(item_ids=chunk)
+                cr.execute(f"""
+                    SELECT item_id, field_name, field_type, text_value, numeric_value, boolean_value
+                      FROM ({query}) v
+                  ORDER BY item_id, position
+                """, params)
+                FieldValue._bulk_replace_values([], cr.fetchall())
+            cr.execute("""
+                UPDATE inventory_connector_item
+                   SET custom_values = NULL
+                 WHERE id = ANY(%s)
+            """, (item_ids,))
+            Item.invalidate_model(['custom_values'])
+        _logger.info("Moved the custom values of %s items of inventory %s to %s storage",
+                     len(item_ids), self.id, target)
+    
     def _parse_datetime(self, datetime_str):
         """Parse datetime string from API response"""
-        if not datetime_str:
-            return None
+        parsed = payload_normalizer.parse_datetime(datetime_str)
+        if datetime_str and parsed is None:
+            _logger.warning("Could not parse datetime string: %s", datetime_str)
+        return parsed
+    
+    @api.model
+    def _info_values(self, info_data):
+        """Return the inventory values of an info payload, whatever the casing of its keys"""
+        info = payload_normalizer.INFO.normalize(info_data)
+        values = {name: value for name, value in info._asdict().items() if value is not None}
+        for name in ('created_at', 'updated_at'):
+            if name in values:
+                values[name] = self._parse_datetime(values[name])
+        return values
+    
+    @staticmethod
+    def _item_external_id(item_data):
+        """External id of an item payload, whatever the casing of its id key"""
+        return str(payload_normalizer.ITEM.normalize(item_data).id)
+    
+    def _get_http_validators(self):
+        """Return the stored HTTP validators as a dict endpoint -> {'etag', 'last_modified'}"""
+        try:
+            return json.loads(self.http_validators or '{}')
+        except ValueError:
+            return {}
+    
+    def _api_get(self, url, endpoint, params=None, timeout=10, **kwargs):
+        """GET an API url, sending the stored validators of endpoint when incremental sync is enabled"""
+        auth_params, auth_headers = self._auth_request_args(self.api_auth_scheme, self.api_token)
+        params = dict(auth_params, **(params or {}))
+        headers = dict(auth_headers, **(kwargs.pop('headers', None) or {}))
+        endpoint_validators = (self._get_http_validators().get(endpoint) or {}) if self.incremental_sync else {}
+        if endpoint_validators.get('etag'):
+            headers['If-None-Match'] = endpoint_validators['etag']
+        if endpoint_validators.get('last_modified'):
+            headers['If-Modified-Since'] = endpoint_validators['last_modified']
         
+        response = http_client.get(self.env, url, params=params, headers=headers, timeout=timeout, verify=False, **kwargs)
+        # A streamed body is counted while it is read
+        self._get_sync_metrics().add_http(endpoint, response, nbytes=0 if kwargs.get('stream') else None)
+        return response
+    
+    def _store_http_validators(self, endpoint, response):
+        """Remember the validators of a 200 response whose payload was applied successfully"""
+        if not self.incremental_sync or response.status_code != 200:
+            return
+        validators = self._get_http_validators()
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+        if new_validators != validators.get(endpoint) and any(new_validators.values()):
+            validators[endpoint] = new_validators
+            self.http_validators = json.dumps(validators)
+    
+    def _get_sync_metrics(self):
+        """Return the metrics collector of the sync run in progress, if any"""
+        return self.env.context.get('sync_metrics') or NULL_METRICS
+    
+    def _record_sync_run(self, run_type, method, *args, **kwargs):
+        """Call method with metrics collection enabled and store them as a sync run, failed or not"""
+        self.ensure_one()
+        SyncRun = self.env['inventory.connector.sync.run']
+        metrics = SyncMetrics(self.env.cr)
+        started_at = fields.Datetime.now()
         try:
-            # Remove timezone info and extra precision if present
-            # Handle formats like: 2025-08-30T17:59:37.85758, 2025-08-30T17:59:37.857Z, etc.
-            clean_str = datetime_str
-            
-            # Remove 'Z' suffix if present
-            if clean_str.endswith('Z'):
-                clean_str = clean_str[:-1]
-            
-            # Handle microseconds - limit to 6 digits
-            if '.' in clean_str:
-                date_part, microsecond_part = clean_str.split('.')
-                # Limit microseconds to 6 digits and pad if necessary
-                microsecond_part = microsecond_part[:6].ljust(6, '0')
-                clean_str = f"{date_part}.{microsecond_part}"
-            
-            # Try different datetime formats
-            formats = [
-                '%Y-%m-%dT%H:%M:%S.%f',  # With microseconds
-                '%Y-%m-%dT%H:%M:%S',     # Without microseconds
-                '%Y-%m-%d %H:%M:%S.%f',  # Space separated with microseconds
-                '%Y-%m-%d %H:%M:%S',     # Space separated without microseconds
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(clean_str, fmt)
-                except ValueError:
-                    continue
-            
-            # If none of the formats work, log the issue and return None
-            _logger.warning("Could not parse datetime string: %s", datetime_str)
-            return None
-            
+            result = getattr(self.with_context(sync_metrics=metrics), method)(*args, **kwargs)
         except Exception as e:
-            _logger.error("Error parsing datetime '%s': %s", datetime_str, str(e))
-            return None
-                
+            SyncRun._store_failed(self, run_type, started_at, metrics, str(e))
+            raise
+        SyncRun._store(self, run_type, started_at, metrics)
+        return result
+    
+    @staticmethod
+    def _build_api_url(base_url, api_path, endpoint):
+        """Return the URL of endpoint (info, aggregated, items) under the API path"""
+        return f"{base_url}{(api_path or DEFAULT_API_PATH).rstrip('/')}/{endpoint}"
+    
+    @staticmethod
+    def _auth_request_args(auth_scheme, token):
+        """Return the (params, headers) authenticating a request with token"""
+        if auth_scheme == 'bearer':
+            return {}, {'Authorization': f'Bearer {token}'}
+        return {'token': token}, {}
+    
+    def _api_endpoint_url(self, base_url, endpoint):
+        """URL of endpoint under the API path found by the connection test"""
+        return self._build_api_url(base_url, self.api_path, endpoint)
+    
+    def _probe_api(self, base_url, deadline=TEST_CONNECTION_DEADLINE):
+        """Probe the info endpoint of every candidate API path and auth scheme concurrently"""
+        options = dict(http_client.get_options(self.env))
+        options['connect_timeout'] = min(options['connect_timeout'], deadline)
+        options['read_timeout'] = min(options['read_timeout'] or deadline, deadline)
+        token = self.api_token
+        
+        def probe(api_path, auth_scheme):
+            params, headers = self._auth_request_args(auth_scheme, token)
+            response = http_client.fetch(self._build_api_url(base_url, api_path, 'info'), options,
+                                         params=params, headers=headers, verify=False)
+            return response.status_code, response.text[:150]
+        
+        candidates = [(api_path, auth_scheme) for api_path in API_PATHS for auth_scheme, _label in AUTH_SCHEMES]
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix='inventory_connector_probe')
+        futures = {executor.submit(probe, *candidate): candidate for candidate in candidates}
+        done, _pending = wait(futures, timeout=deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        results = []
+        for future, (api_path, auth_scheme) in futures.items():
+            if future not in done:
+                results.append((api_path, auth_scheme, None, _("No answer within %s seconds") % deadline))
+            elif future.exception() is not None:
+                results.append((api_path, auth_scheme, None, str(future.exception())))
+            else:
+                results.append((api_path, auth_scheme) + future.result())
+        return results
+    
     def action_test_connection(self):
         """Test the connection to the API server"""
         self.ensure_one()
@@ -101,88 +336,37 @@ class InventoryConnectorInventory(models.Model):
             message = f"Testing connection to API...\n"
             message += f"Base URL: {base_url}\n\n"
             
-            # Based on your InventoryApiController, test the actual endpoints
-            test_endpoints = [
-                "/api/InventoryApi/info",
-                "/api/InventoryApi/aggregated", 
-                "/api/InventoryApi/items",
-                "/swagger",
-                "/swagger/index.html"
-            ]
-            
-            for endpoint in test_endpoints:
-                test_url = f"{base_url}{endpoint}"
-                message += f"Trying endpoint: {test_url}\n"
-                try:
-                    # First try without token
-                    response = requests.get(test_url, timeout=10, verify=False)
-                    message += f"  Response (no auth): Status {response.status_code}\n"
-                    if response.status_code == 400 and 'token' in response.text.lower():
-                        message += f"  API expects token parameter\n"
-                    elif response.status_code == 200:
-                        message += f"  Content: {response.text[:150]}...\n"
-                        message += f"  SUCCESS! This endpoint works without authentication.\n"
-                    
-                    # Now try with token as query parameter
-                    if self.api_token:
-                        response = requests.get(test_url, params={'token': self.api_token}, timeout=10, verify=False)
-                        message += f"  Response (with token): Status {response.status_code}\n"
-                        if response.status_code == 200:
-                            message += f"  Content: {response.text[:150]}...\n"
-                            message += f"  SUCCESS! This endpoint works with token.\n"
-                        elif response.status_code == 401:
-                            message += f"  Got 401 - token invalid or user not authorized\n"
-                        elif response.status_code == 400:
-                            message += f"  Got 400 - bad request, check token format\n"
-                    
-                except Exception as e:
-                    message += f"  Error: {str(e)}\n"
-                message += "\n"
+            started = time.monotonic()
+            results = self._probe_api(base_url)
+            elapsed = time.monotonic() - started
             
-            # Now try some paths with authentication
-            message += f"\nTrying paths with authentication token...\n"
-            auth_endpoints = [
-                "/api/inventory/info",
-                "/api/InventoryApi/info",
-                "/info", 
-                "/api/Info",
-                "/api/Inventory"
-            ]
+            scheme_labels = dict(AUTH_SCHEMES)
+            working = None
+            for api_path, auth_scheme, status, detail in results:
+                message += f"Trying endpoint: {self._build_api_url(base_url, api_path, 'info')} ({scheme_labels[auth_scheme]})\n"
+                if status is None:
+                    message += f"  Error: {detail}\n"
+                    continue
+                message += f"  Status {status}\n"
+                if status == 200:
+                    message += f"  Content: {detail}...\n"
+                    working = working or (api_path, auth_scheme)
+                elif status == 401:
+                    message += f"  Got 401 - endpoint exists but token invalid/required\n"
+                elif status == 400:
+                    message += f"  Got 400 - bad request, check token format\n"
+                elif status == 404:
+                    message += f"  Got 404 - endpoint not found\n"
+            message += f"\nProbed {len(results)} endpoints in {elapsed:.1f}s\n"
             
-            for endpoint in auth_endpoints:
-                test_url = f"{base_url}{endpoint}"
-                message += f"Trying endpoint with token: {test_url}\n"
-                
-                # Try as query parameter
-                try:
-                    response = requests.get(test_url, params={'token': self.api_token}, timeout=10, verify=False)
-                    message += f"  Query param auth - Status: {response.status_code}\n"
-                    if response.status_code == 200:
-                        message += f"  Content: {response.text[:150]}...\n"
-                        message += f"  SUCCESS! This endpoint works with token as query parameter.\n"
-                    elif response.status_code == 401:
-                        message += f"  Got 401 - endpoint exists but token invalid/required\n"
-                    elif response.status_code == 404:
-                        message += f"  Got 404 - endpoint not found\n"
-                except Exception as e:
-                    message += f"  Query param error: {str(e)}\n"
-                    
-                # Try as Bearer token
-                try:
-                    headers = {'Authorization': f'Bearer {self.api_token}'}
-                    response = requests.get(test_url, headers=headers, timeout=10, verify=False)
-                    message += f"  Bearer token auth - Status: {response.status_code}\n"
-                    if response.status_code == 200:
-                        message += f"  Content: {response.text[:150]}...\n"
-                        message += f"  SUCCESS! This endpoint works with Bearer token.\n"
-                    elif response.status_code == 401:
-                        message += f"  Got 401 - endpoint exists but token invalid/required\n"
-                    elif response.status_code == 404:
-                        message += f"  Got 404 - endpoint not found\n"
-                except Exception as e:
-                    message += f"  Bearer token error: {str(e)}\n"
-                
-                message += "\n"
+            if working:
+                api_path, auth_scheme = working
+                if (self.api_path, self.api_auth_scheme) != working:
+                    self.write({'api_path': api_path, 'api_auth_scheme': auth_scheme})
+                message += (f"SUCCESS! Synchronization and import will use {self._api_endpoint_url(base_url, '...')} "
+                            f"with {scheme_labels[auth_scheme]}.\n")
+            else:
+                message += f"No endpoint answered, keeping {self._api_endpoint_url(base_url, '...')}.\n"
                 
             # Return diagnostic information
             return {
@@ -192,7 +376,7 @@ class InventoryConnectorInventory(models.Model):
                     'title': _('Connection Test Results'),
                     'message': message,
                     'sticky': True,
-                    'type': 'info',
+                    'type': 'success' if working else 'warning',
                 }
             }
         except Exception as e:
@@ -211,6 +395,11 @@ class InventoryConnectorInventory(models.Model):
     def action_sync_inventory(self):
         """Synchronize inventory data from external API"""
         self.ensure_one()
+        return self._record_sync_run('sync', '_run_sync_inventory')
+    
+    def _run_sync_inventory(self):
+        """Fetch the inventory info and aggregated data, see action_sync_inventory"""
+        metrics = self._get_sync_metrics()
         
         try:
             # First, get basic inventory info
@@ -223,153 +412,107 @@ class InventoryConnectorInventory(models.Model):
                 # Also update the stored URL
                 self.api_url = base_url
             
-            # Based on the InventoryApiController, use the correct endpoint
-            info_url = f"{base_url}/api/InventoryApi/info"
+            # Endpoint found by the connection test, the InventoryApiController by default
+            info_url = self._api_endpoint_url(base_url, 'info')
             
-            _logger.info("Attempting to connect to API: %s with token: %s", info_url, self.api_token)
+            _logger.info("Attempting to connect to API: %s", info_url)
             
-            # Try the API endpoint with token as query parameter
-            try:
-                response = requests.get(info_url, params={'token': self.api_token}, timeout=10, verify=False)
-                _logger.info("API response status: %s", response.status_code)
-                
-                if response.status_code != 200:
-                    error_msg = f"Failed to connect to API: Status {response.status_code}"
-                    if hasattr(response, 'text'):
-                        error_msg += f" - {response.text or 'No response content'}"
-                    raise UserError(_(error_msg))
+            with metrics.phase('info'):
+                try:
+                    response = self._api_get(info_url, 'info', timeout=10)
+                    _logger.debug("API response status: %s", response.status_code)
                     
-            except requests.exceptions.RequestException as e:
-                _logger.error("Request exception: %s", str(e))
-                raise UserError(_("Connection error: %s - Please check if the API server is running and accessible") % str(e))
-                
-            try:
-                info_data = response.json()
-                _logger.info("Parsed info data: %s", info_data)
-            except Exception as e:
-                _logger.error("Failed to parse JSON: %s", str(e))
-                _logger.error("Response content: %s", response.text[:500])
-                raise UserError(_("Failed to parse API response: %s") % str(e))
-            
-            # Update basic inventory information - handle different possible field names
-            update_values = {
-                'last_sync': fields.Datetime.now(),
-            }
-            
-            # Try different possible field names based on common API naming conventions
-            if 'title' in info_data:
-                update_values['name'] = info_data.get('title')
-            elif 'name' in info_data:
-                update_values['name'] = info_data.get('name')
-                
-            if 'description' in info_data:
-                update_values['description'] = info_data.get('description')
-                
-            if 'id' in info_data:
-                update_values['external_id'] = info_data.get('id')
-            elif 'inventoryId' in info_data:
-                update_values['external_id'] = info_data.get('inventoryId')
-                
-            if 'category' in info_data:
-                update_values['category'] = info_data.get('category')
-                
-            if 'isPublic' in info_data:
-                update_values['is_public'] = info_data.get('isPublic')
-            elif 'public' in info_data:
-                update_values['is_public'] = info_data.get('public')
-                
-            if 'createdAt' in info_data:
-                update_values['created_at'] = self._parse_datetime(info_data.get('createdAt'))
-            elif 'createDate' in info_data:
-                update_values['created_at'] = self._parse_datetime(info_data.get('createDate'))
-            elif 'creationDate' in info_data:
-                update_values['created_at'] = self._parse_datetime(info_data.get('creationDate'))
+                    if response.status_code not in (200, 304):
+                        error_msg = f"Failed to connect to API: Status {response.status_code}"
+                        if hasattr(response, 'text'):
+                            error_msg += f" - {response.text or 'No response content'}"
+                        raise UserError(_(error_msg))
+                        
+                except requests.exceptions.RequestException as e:
+                    _logger.error("Request exception: %s", str(e))
+                    raise UserError(_("Connection error: %s - Please check if the API server is running and accessible") % str(e))
+                    
+                # The remote inventory updatedAt does not move with its items,
+                # so the aggregated data is requested in any case
+                if response.status_code == 304:
+                    _logger.info("Inventory info not modified, keeping the current values")
+                    self.write({'last_sync': fields.Datetime.now()})
+                else:
+                    try:
+                        info_data = response.json()
+                        _logger.debug("Parsed info data: %s", info_data)
+                    except Exception as e:
+                        _logger.error("Failed to parse JSON: %s", str(e))
+                        _logger.error("Response content: %s", response.text[:500])
+                        raise UserError(_("Failed to parse API response: %s") % str(e))
+                    
+                    # Update basic inventory information
+                    update_values = self._info_values(info_data)
+                    update_values['last_sync'] = fields.Datetime.now()
+                    self.write(update_values)
+                    self._store_http_validators('info', response)
                 
-            if 'updatedAt' in info_data:
-                update_values['updated_at'] = self._parse_datetime(info_data.get('updatedAt'))
-            elif 'updateDate' in info_data:
-                update_values['updated_at'] = self._parse_datetime(info_data.get('updateDate'))
-            elif 'lastModified' in info_data:
-                update_values['updated_at'] = self._parse_datetime(info_data.get('lastModified'))
-            
-            self.write(update_values)
-            
             # Then, get aggregated data - use the correct endpoint
-            aggregated_url = f"{base_url}/api/InventoryApi/aggregated"
+            aggregated_url = self._api_endpoint_url(base_url, 'aggregated')
             
             _logger.info("Trying aggregated data endpoint: %s", aggregated_url)
-            try:
-                response = requests.get(aggregated_url, params={'token': self.api_token}, timeout=10, verify=False)
-                
-                if response.status_code != 200:
-                    # If we couldn't get aggregated data, just skip this part
-                    _logger.warning("Could not get aggregated data: Status %s - %s", response.status_code, response.text)
-                else:
-                    aggregated_data = response.json()
-                    _logger.info("Aggregated data received: %s", json.dumps(aggregated_data, indent=2))
-                    
-                    # Update item count
-                    self.item_count = aggregated_data.get('itemCount', 0)
-                    
-                    # Debug the entire aggregated_data structure
-                    _logger.info("Full aggregated data: %s", json.dumps(aggregated_data, indent=2))
-                    
-                    # Try both PascalCase and camelCase field names (for .NET / JSON conventions)
-                    custom_fields = None
-                    if 'customFields' in aggregated_data:
-                        custom_fields = aggregated_data.get('customFields')
-                        _logger.info("Found customFields (camelCase): %s", len(custom_fields))
-                    elif 'CustomFields' in aggregated_data:
-                        custom_fields = aggregated_data.get('CustomFields')
-                        _logger.info("Found CustomFields (PascalCase): %s", len(custom_fields))
-                    else:
-                        # Try to find the key case-insensitive
-                        for key in aggregated_data.keys():
-                            if key.lower() == 'customfields':
-                                custom_fields = aggregated_data.get(key)
-                                _logger.info("Found custom fields with key: %s", key)
-                                break
-                    
-                    _logger.info("Custom fields data: %s", json.dumps(custom_fields, indent=2) if custom_fields else "None")
-                    if not custom_fields:
-                        _logger.warning("No custom fields found! Available keys: %s", list(aggregated_data.keys()))
-                    
-                    # Process custom fields if found
-                    if custom_fields:
-                        self._process_custom_fields(custom_fields)
-                    else:
-                        _logger.error("No custom fields found in API response. Please check the API implementation.")
-                    
-                    # Process field aggregations - try both naming conventions
-                    aggregated_results = None
-                    if 'aggregatedResults' in aggregated_data:
-                        aggregated_results = aggregated_data.get('aggregatedResults')
-                        _logger.info("Found aggregatedResults (camelCase): %s", len(aggregated_results))
-                    elif 'AggregatedResults' in aggregated_data:
-                        aggregated_results = aggregated_data.get('AggregatedResults')
-                        _logger.info("Found AggregatedResults (PascalCase): %s", len(aggregated_results))
-                    else:
-                        # Try to find the key case-insensitive
-                        for key in aggregated_data.keys():
-                            if key.lower() == 'aggregatedresults':
-                                aggregated_results = aggregated_data.get(key)
-                                _logger.info("Found aggregated results with key: %s", key)
-                                break
-                                
-                    _logger.info("Aggregated results data: %s", json.dumps(aggregated_results, indent=2) if aggregated_results else "None")
-                    if not aggregated_results:
-                        _logger.warning("No aggregated results found! Available keys: %s", list(aggregated_data.keys()))
+            with metrics.phase('aggregated'):
+                try:
+                    response = self._api_get(aggregated_url, 'aggregated', timeout=10)
                     
-                    # Process field aggregations if found
-                    if aggregated_results:
-                        self._process_field_aggregations(aggregated_results)
+                    if response.status_code == 304:
+                        _logger.info("Aggregated data not modified, keeping current field definitions and aggregations")
+                    elif response.status_code != 200:
+                        # If we couldn't get aggregated data, just skip this part
+                        _logger.warning("Could not get aggregated data: Status %s - %s", response.status_code, response.text)
                     else:
-                        _logger.error("No aggregated results found in API response. Please check the API implementation.")
-                    
-            except Exception as e:
-                _logger.warning("Error getting aggregated data: %s", str(e))
-                # Continue anyway with the basic information
-            
+                        aggregated_data = response.json()
+                        # Pretty-printing the payload is costly, only do it when debugging
+                        if _logger.isEnabledFor(logging.DEBUG):
+                            _logger.debug("Aggregated data received: %s", json.dumps(aggregated_data, indent=2))
+                        
+                        # PascalCase (.NET) and camelCase keys map to the same record
+                        aggregated = payload_normalizer.AGGREGATED.normalize(aggregated_data)
+                        self.item_count = aggregated.item_count or 0
+                        
+                        custom_fields = aggregated.custom_fields
+                        _logger.debug("Found %s custom fields", len(custom_fields or ()))
+                        if not custom_fields:
+                            _logger.warning("No custom fields found! Available keys: %s", list(aggregated_data.keys()))
+                        
+                        # Process custom fields if found
+                        if custom_fields:
+                            created, updated, unchanged = self._process_custom_fields(custom_fields)
+                            metrics.count('aggregated', created=created, updated=updated, skipped=unchanged)
+                        else:
+                            _logger.error("No custom fields found in API response. Please check the API implementation.")
+                        
+                        # Field statistics computed from the imported items instead of the remote ones
+                        if self.aggregation_source == 'local':
+                            created, updated, unchanged = self._refresh_local_aggregations()
+                            metrics.count('aggregated', created=created, updated=updated, skipped=unchanged)
+                        elif self.aggregation_source == 'streaming':
+                            _logger.debug("Field aggregations of inventory %s are maintained during import", self.id)
+                        else:
+                            aggregated_results = aggregated.aggregated_results
+                            _logger.debug("Found %s aggregated results", len(aggregated_results or ()))
+                            if not aggregated_results:
+                                _logger.warning("No aggregated results found! Available keys: %s", list(aggregated_data.keys()))
+                            
+                            # Process field aggregations if found
+                            if aggregated_results:
+                                created, updated, unchanged = self._process_field_aggregations(aggregated_results)
+                                metrics.count('aggregated', created=created, updated=updated, skipped=unchanged)
+                            else:
+                                _logger.error("No aggregated results found in API response. Please check the API implementation.")
+                        
+                        # Only now: a failure above must not turn the next syncs into 304s
+                        self._store_http_validators('aggregated', response)
+                        
+                except Exception as e:
+                    _logger.warning("Error getting aggregated data: %s", str(e))
+                    # Continue anyway with the basic information
+                
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -386,365 +529,294 @@ class InventoryConnectorInventory(models.Model):
             raise UserError(_("Error synchronizing inventory: %s") % str(e))
     
     def _process_custom_fields(self, custom_fields):
-        """Process and update custom field definitions"""
-        # Remove old field definitions
-        self.field_definition_ids.unlink()
+        """Reconcile the field definitions with the CustomField records of the API, return the (created, updated, unchanged) counts"""
+        _logger.info("Processing %s custom field definitions", len(custom_fields))
         
-        _logger.info(f"Processing {len(custom_fields)} custom field definitions")
-        
-        # Create new field definitions
-        for field_def in custom_fields:
-            # Log the field definition for debugging
-            _logger.info(f"Processing field definition: {field_def}")
+        field_types = dict(self.env['inventory.connector.field.definition']._fields['field_type'].selection)
+        desired = {}
+        for sequence, field_def in enumerate(custom_fields, start=1):
+            _logger.debug("Processing field definition: %s", field_def)
             
-            # Handle both PascalCase and camelCase field names
-            name = field_def.get('name', field_def.get('Name', ''))
-            field_type = field_def.get('type', field_def.get('Type', 'text'))
-            description = field_def.get('description', field_def.get('Description', ''))
-            show_in_table = field_def.get('showInTable', field_def.get('ShowInTable', False))
+            name = field_def.name or 'Unnamed Field'
+            field_type = field_def.field_type or 'text'
+            if field_type not in field_types:
+                field_type = 'text'
             
-            # Get numeric config with case insensitivity
-            numeric_config = field_def.get('numericConfig', field_def.get('NumericConfig', {}))
+            numeric_config = field_def.numeric_config
             min_value = 0
             max_value = 0
             is_integer = False
-            
             if field_type == 'numeric' and numeric_config:
-                if numeric_config is not None:  # Ensure numeric_config is not None
-                    min_value = numeric_config.get('minValue', numeric_config.get('MinValue', 0))
-                    max_value = numeric_config.get('maxValue', numeric_config.get('MaxValue', 0))
-                    is_integer = numeric_config.get('isInteger', numeric_config.get('IsInteger', False))
-                
-            _logger.info(f"Creating field definition: {name} (type: {field_type}, show_in_table: {show_in_table})")
+                min_value = numeric_config.min_value or 0
+                max_value = numeric_config.max_value or 0
+                is_integer = numeric_config.is_integer
             
-            try:
-                field_def_id = self.env['inventory.connector.field.definition'].create({
-                    'inventory_id': self.id,
-                    'name': name,
-                    'field_type': field_type,
-                    'description': description,
-                    'show_in_table': show_in_table,
-                    'min_value': min_value,
-                    'max_value': max_value,
-                    'is_integer': is_integer,
-                })
-                _logger.info(f"Successfully created field definition with ID: {field_def_id.id}")
-            except Exception as e:
-                _logger.error(f"Failed to create field definition '{name}': {str(e)}")
-                # Try again with default values
-                try:
-                    field_def_id = self.env['inventory.connector.field.definition'].create({
-                        'inventory_id': self.id,
-                        'name': name or 'Unnamed Field',
-                        'field_type': field_type or 'text',
-                        'description': description or '',
-                        'show_in_table': show_in_table or False,
-                        'min_value': 0,
-                        'max_value': 0,
-                        'is_integer': False,
-                    })
-                    _logger.info(f"Created field definition with fallback values, ID: {field_def_id.id}")
-                except Exception as e2:
-                    _logger.error(f"Failed again to create field definition: {str(e2)}")
+            # Field names are unique per inventory, the first definition wins
+            desired.setdefault((name,), {
+                'name': name,
+                'field_type': field_type,
+                'description': field_def.description or '',
+                'show_in_table': bool(field_def.show_in_table),
+                'min_value': min_value,
+                'max_value': max_value,
+                'is_integer': bool(is_integer),
+                'sequence': sequence,
+            })
+        
+        return self._reconcile_records('inventory.connector.field.definition', ('name',), desired)
     
-    def _process_field_aggregations(self, aggregated_results):
-        """Process and update field aggregation data"""
-        # Remove old aggregations
-        self.field_aggregation_ids.unlink()
+    def _reconcile_records(self, model_name, key_fields, desired):
+        """Upsert the records of model_name of this inventory from {key: values}, return the (created, updated, unchanged) counts"""
+        self.ensure_one()
+        Model = self.env[model_name]
+        compare_fields = sorted({name for values in desired.values() for name in values} - set(key_fields))
+        
+        existing = {}
+        obsolete_ids = []
+        for row in Model.search_read([('inventory_id', '=', self.id)], list(key_fields) + compare_fields, order='id'):
+            key = tuple(row[name] for name in key_fields)
+            if key in desired and key not in existing:
+                existing[key] = row
+            else:
+                obsolete_ids.append(row['id'])
+        
+        create_vals = []
+        updated = unchanged = 0
+        for key, values in desired.items():
+            row = existing.get(key)
+            if row is None:
+                create_vals.append(dict(values, inventory_id=self.id))
+                continue
+            changes = {
+                name: value for name, value in values.items()
+                if name not in key_fields and self._field_value_differs(Model._fields[name], row[name], value)
+            }
+            if changes:
+                Model.browse(row['id']).write(changes)
+                updated += 1
+            else:
+                unchanged += 1
         
-        _logger.info(f"Processing {len(aggregated_results)} field aggregations")
+        if create_vals:
+            Model.create(create_vals)
+        if obsolete_ids:
+            Model.browse(obsolete_ids).unlink()
+        _logger.info("Reconciled %s of inventory %s: %s created, %s updated, %s unchanged, %s deleted",
+                     model_name, self.id, len(create_vals), updated, unchanged, len(obsolete_ids))
+        return len(create_vals), updated, unchanged
+    
+    def _field_value_differs(self, field, current, new):
+        """Compare a value read from the database with a value about to be written"""
+        if field.type == 'float':
+            digits = field.get_digits(self.env)
+            return float_compare(current or 0.0, new or 0.0, precision_digits=digits[1] if digits else 6) != 0
+        return (current or False) != (new or False)
+    
+    def _refresh_local_aggregations(self):
+        """Reconcile the field aggregations with statistics computed from the imported field values"""
+        self.ensure_one()
+        values_list = self.env['inventory.connector.field.aggregation']._compute_local_values(self)
+        desired = {}
+        for values in values_list:
+            values.pop('inventory_id', None)
+            desired.setdefault((values['field_name'],), dict(self._empty_aggregation_values(), **values))
+        _logger.info("Computed %s field aggregations of inventory %s from imported items", len(values_list), self.id)
+        return self._reconcile_records('inventory.connector.field.aggregation', ('field_name',), desired)
+    
+    @staticmethod
+    def _empty_aggregation_values():
+        """Aggregation columns reset to their defaults, so a changed field type leaves nothing stale"""
+        return {
+            'min_value': 0.0,
+            'max_value': 0.0,
+            'average_value': 0.0,
+            'median_value': 0.0,
+            'stddev_value': 0.0,
+            'true_count': 0,
+            'false_count': 0,
+            'true_percentage': 0.0,
+            'common_values_json': False,
+            'aggregate_state': False,
+        }
+    
+    def _load_streaming_aggregates(self):
+        """Return the running aggregates of this inventory, rebuilt from the stored values when no usable state is saved"""
+        self.ensure_one()
+        aggregates = {}
+        for aggregation in self.field_aggregation_ids:
+            state = json.loads(aggregation.aggregate_state) if aggregation.aggregate_state else None
+            aggregate = FieldAggregate.from_dict(state)
+            if aggregate is None or aggregation.field_name in aggregates:
+                return self._seed_streaming_aggregates()
+            aggregates[aggregation.field_name] = aggregate
+        if not aggregates:
+            return self._seed_streaming_aggregates()
+        return StreamingAggregates(aggregates)
+    
+    def _seed_streaming_aggregates(self):
+        """Build the running aggregates from the field values stored for the active items of this inventory"""
+        query, params = self.env['inventory.connector.field.value']._values_query(self)
+        aggregates = StreamingAggregates()
+        cr = self.env.cr
+        # Archived items are left out, like in FieldAggregation._compute_local_values
+        cr.execute(f"""
+            SELECT v.field_name, v.field_type, v.text_value, v.numeric_value, v.boolean_value
+              FROM ({query}) v
+             WHERE v.active
+        """, params)
+        while True:
+            rows = cr.fetchmany(10000)
+            if not rows:
+                break
+            aggregates.add_rows(rows)
+        # Every field must be written back, including the ones left untouched by the import
+        aggregates.changed.update(aggregates.aggregates)
+        return aggregates
+    
+    @api.model
+    def _streaming_activity_updates(self, items, active):
+        """Apply items being archived or restored to the running aggregates, return the [(inventory, aggregates)] to save"""
+        changed = items.filtered(lambda item: item.active != active)
+        updates = []
+        for inventory in changed.inventory_id:
+            if inventory.aggregation_source != 'streaming' or not inventory.field_aggregation_ids:
+                continue
+            aggregates = inventory._load_streaming_aggregates()
+            query, params = self.env['inventory.connector.field.value']._values_query(
+                item_ids=changed.filtered(lambda item: item.inventory_id == inventory).ids)
+            self.env.cr.execute(f"""
+                SELECT v.field_name, v.field_type, v.text_value, v.numeric_value, v.boolean_value
+                  FROM ({query}) v
+            """, params)
+            rows = self.env.cr.fetchall()
+            if active:
+                aggregates.add_rows(rows)
+            else:
+                aggregates.remove_rows(rows)
+            updates.append((inventory, aggregates))
+        return updates
+    
+    def _save_streaming_aggregates(self, aggregates, refresh_extremes=True):
+        """Store the changed running aggregates, recomputing their stale extremes if refresh_extremes"""
+        self.ensure_one()
+        stale = aggregates.stale_extremes() if refresh_extremes else None
+        if stale:
+            # Min/max cannot be recovered from a running state once the extreme value was removed
+            query, params = self.env['inventory.connector.field.value']._values_query(self, field_names=stale)
+            self.env.cr.execute(f"""
+                SELECT v.field_name, MIN(v.numeric_value), MAX(v.numeric_value)
+                  FROM ({query}) v
+                 WHERE v.active AND v.field_type = 'numeric'
+              GROUP BY v.field_name
+            """, params)
+            extremes = {field_name: (min_value, max_value) for field_name, min_value, max_value in self.env.cr.fetchall()}
+            for field_name in stale:
+                # No value left: no extremes either
+                aggregates.aggregates[field_name].set_extremes(*extremes.get(field_name, (None, None)))
+                aggregates.changed.add(field_name)
         
-        # Create new aggregations
+        existing = {}
+        obsolete = self.env['inventory.connector.field.aggregation']
+        for aggregation in self.field_aggregation_ids:
+            if aggregation.field_name in existing:
+                obsolete |= aggregation
+            else:
+                existing[aggregation.field_name] = aggregation
+        create_vals = []
+        for field_name in aggregates.changed:
+            aggregate = aggregates.aggregates[field_name]
+            # The type may have changed: reset the columns of the other types
+            values = dict(self._empty_aggregation_values(), **aggregate.aggregation_values())
+            values.update(field_type=aggregate.field_type, aggregate_state=json.dumps(aggregate.to_dict()))
+            if field_name in existing:
+                existing[field_name].write(values)
+            else:
+                values.update(inventory_id=self.id, field_name=field_name)
+                create_vals.append(values)
+        if create_vals:
+            self.env['inventory.connector.field.aggregation'].create(create_vals)
+        # Duplicates of a field and records without a state, leftovers of another aggregation source
+        obsolete |= self.field_aggregation_ids.filtered(
+            lambda aggregation: not aggregation.aggregate_state and aggregation.field_name not in aggregates.aggregates
+        )
+        obsolete.unlink()
+        aggregates.changed.clear()
+    
+    def action_refresh_aggregations(self):
+        """Recompute the field aggregations from the imported items"""
+        self.ensure_one()
+        if self.aggregation_source == 'streaming':
+            self._save_streaming_aggregates(self._seed_streaming_aggregates())
+        else:
+            self._refresh_local_aggregations()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Aggregations Updated'),
+                'message': _('%s field aggregations computed from the imported items') % len(self.field_aggregation_ids),
+                'sticky': False,
+                'type': 'success',
+            }
+        }
+    
+    def _process_field_aggregations(self, aggregated_results):
+        """Reconcile the field aggregations with the FieldAggregation records of the API, return the (created, updated, unchanged) counts"""
+        _logger.info("Processing %s field aggregations", len(aggregated_results))
+        
+        field_types = dict(self.env['inventory.connector.field.aggregation']._fields['field_type'].selection)
+        desired = {}
         for agg in aggregated_results:
-            # Log the aggregation for debugging
-            _logger.info(f"Processing aggregation: {agg}")
+            _logger.debug("Processing aggregation: %s", agg)
             
-            # Handle both PascalCase and camelCase field names
-            field_name = agg.get('fieldName', agg.get('FieldName', ''))
-            field_type = agg.get('fieldType', agg.get('FieldType', 'text'))
+            field_name = agg.field_name
+            field_type = agg.field_type or 'text'
+            if field_type not in field_types:
+                field_type = 'text'
             
             if not field_name:
-                _logger.warning(f"Skipping aggregation with no field name: {agg}")
+                _logger.warning("Skipping aggregation with no field name: %s", agg)
                 continue
-                
-            values = {
-                'inventory_id': self.id,
-                'field_name': field_name,
-                'field_type': field_type,
-            }
+            
+            values = dict(self._empty_aggregation_values(), field_name=field_name, field_type=field_type)
             
             # Add type-specific values
             if field_type == 'numeric':
                 values.update({
-                    'min_value': agg.get('minValue', agg.get('MinValue', 0)),
-                    'max_value': agg.get('maxValue', agg.get('MaxValue', 0)),
-                    'average_value': agg.get('averageValue', agg.get('AverageValue', 0)),
-                    'median_value': agg.get('medianValue', agg.get('MedianValue', 0)),
+                    'min_value': agg.min_value or 0.0,
+                    'max_value': agg.max_value or 0.0,
+                    'average_value': agg.average_value or 0.0,
+                    'median_value': agg.median_value or 0.0,
                 })
             elif field_type == 'boolean':
                 values.update({
-                    'true_count': agg.get('trueCount', agg.get('TrueCount', 0)),
-                    'false_count': agg.get('falseCount', agg.get('FalseCount', 0)),
-                    'true_percentage': agg.get('truePercentage', agg.get('TruePercentage', 0)),
+                    'true_count': agg.true_count or 0,
+                    'false_count': agg.false_count or 0,
+                    'true_percentage': agg.true_percentage or 0.0,
                 })
             elif field_type in ['text', 'multiline']:
                 # Store most common values as JSON
-                most_common_values = agg.get('mostCommonValues', agg.get('MostCommonValues', []))
-                if most_common_values:
-                    values['common_values_json'] = json.dumps(most_common_values)
-            
-            _logger.info(f"Creating field aggregation: {field_name} (type: {field_type})")
-            
-            try:
-                agg_id = self.env['inventory.connector.field.aggregation'].create(values)
-                _logger.info(f"Successfully created field aggregation with ID: {agg_id.id}")
-            except Exception as e:
-                _logger.error(f"Failed to create field aggregation '{field_name}': {str(e)}")
-                # Try again with minimal values
-                try:
-                    minimal_values = {
-                        'inventory_id': self.id,
-                        'field_name': field_name or 'Unnamed Field',
-                        'field_type': field_type or 'text',
-                    }
-                    agg_id = self.env['inventory.connector.field.aggregation'].create(minimal_values)
-                    _logger.info(f"Created field aggregation with minimal values, ID: {agg_id.id}")
-                except Exception as e2:
-                    _logger.error(f"Failed again to create field aggregation: {str(e2)}")
+                if agg.most_common_values:
+                    values['common_values_json'] = json.dumps(agg.most_common_values)
             
+            desired.setdefault((field_name,), values)
+        
+        return self._reconcile_records('inventory.connector.field.aggregation', ('field_name',), desired)
+    
     def action_import_items(self):
         """Import inventory items from external API"""
         self.ensure_one()
         
         try:
-            # Get items from API
-            base_url = self.api_url.rstrip('/')
-            # Force HTTPS if port 5001 is detected
-            if ':5001' in base_url and not base_url.startswith('https'):
-                base_url = 'https://localhost:5001'
-                
-            items_url = f"{base_url}/api/InventoryApi/items"
-            response = requests.get(items_url, params={'token': self.api_token}, timeout=30, verify=False)
-            
-            if response.status_code != 200:
-                raise UserError(_("Failed to get items from API: %s") % response.text)
-                
-            items_data = response.json()
-            _logger.info("Items data structure: %s", json.dumps(items_data[:2] if items_data else [], indent=2))  # Log first 2 items
-            
-            # Process each item
-            imported_count = 0
-            updated_count = 0
-            now = fields.Datetime.now()
-            
-            for item_data in items_data:
-                # Check if item already exists
-                external_id = str(item_data.get('id'))
-                existing_item = self.env['inventory.connector.item'].search([
-                    ('inventory_id', '=', self.id),
-                    ('external_id', '=', external_id)
-                ], limit=1)
-                
-                item_values = {
-                    'name': item_data.get('name', f"Item {external_id}"),
-                    'inventory_id': self.id,
-                    'external_id': external_id,
-                    'last_update': now,
-                }
-                
-                if existing_item:
-                    # Update existing item
-                    existing_item.write(item_values)
-                    
-                    # Clear existing field values
-                    existing_item.field_value_ids.unlink()
-                    updated_count += 1
-                else:
-                    # Create new item
-                    item_values['import_date'] = now
-                    item = self.env['inventory.connector.item'].create(item_values)
-                    existing_item = item
-                    imported_count += 1
-                
-                # Process custom field values
-                # First check if we have a customFields dictionary
-                processed_fields = {}
-                
-                if item_data.get('customFields'):
-                    _logger.info(f"Processing customFields dictionary for item {existing_item.name}")
-                    for field_name, field_value in item_data.get('customFields').items():
-                        # Skip empty values
-                        if field_value is None or field_value == '':
-                            continue
-                            
-                        # Find field definition
-                        field_def = self.field_definition_ids.filtered(lambda fd: fd.name == field_name)
-                        if not field_def:
-                            _logger.warning(f"No field definition found for field '{field_name}'")
-                            continue
-                            
-                        # Create field value
-                        field_value_data = {
-                            'item_id': existing_item.id,
-                            'field_name': field_name,
-                            'field_type': field_def.field_type,
-                        }
-                        
-                        # Set type-specific value
-                        if field_def.field_type == 'numeric':
-                            field_value_data['numeric_value'] = float(field_value)
-                        elif field_def.field_type == 'boolean':
-                            field_value_data['boolean_value'] = bool(field_value)
-                        else:
-                            field_value_data['text_value'] = str(field_value)
-                            
-                        self.env['inventory.connector.field.value'].create(field_value_data)
-                        processed_fields[field_name] = True
-                
-                # Now check for individual field properties in the item data
-                _logger.info(f"Checking for individual field properties for item {existing_item.name}")
-                
-                # Process text fields
-                for i in range(1, 4):  # 1 to 3
-                    field_key = f"textField{i}Value"
-                    if field_key in item_data and item_data[field_key] is not None:
-                        field_name_key = f"textField{i}Name"
-                        field_name = None
-                        
-                        # Try to get the field name from field definitions
-                        for field_def in self.field_definition_ids:
-                            if field_def.field_type == 'text' and not processed_fields.get(field_def.name):
-                                field_name = field_def.name
-                                processed_fields[field_name] = True
-                                break
-                        
-                        if not field_name:
-                            # If we don't find a matching field definition, use a default name
-                            field_name = f"Text Field {i}"
-                            
-                        _logger.info(f"Creating text field value '{field_name}' = '{item_data[field_key]}'")
-                        
-                        self.env['inventory.connector.field.value'].create({
-                            'item_id': existing_item.id,
-                            'field_name': field_name,
-                            'field_type': 'text',
-                            'text_value': str(item_data[field_key]),
-                        })
-                
-                # Process numeric fields
-                for i in range(1, 4):  # 1 to 3
-                    field_key = f"numericField{i}Value"
-                    if field_key in item_data and item_data[field_key] is not None:
-                        field_name_key = f"numericField{i}Name"
-                        field_name = None
-                        
-                        # Try to get the field name from field definitions
-                        for field_def in self.field_definition_ids:
-                            if field_def.field_type == 'numeric' and not processed_fields.get(field_def.name):
-                                field_name = field_def.name
-                                processed_fields[field_name] = True
-                                break
-                        
-                        if not field_name:
-                            # If we don't find a matching field definition, use a default name
-                            field_name = f"Numeric Field {i}"
-                            
-                        _logger.info(f"Creating numeric field value '{field_name}' = {item_data[field_key]}")
-                        
-                        self.env['inventory.connector.field.value'].create({
-                            'item_id': existing_item.id,
-                            'field_name': field_name,
-                            'field_type': 'numeric',
-                            'numeric_value': float(item_data[field_key]),
-                        })
-                
-                # Process boolean fields
-                for i in range(1, 4):  # 1 to 3
-                    field_key = f"booleanField{i}Value"
-                    if field_key in item_data and item_data[field_key] is not None:
-                        field_name_key = f"booleanField{i}Name"
-                        field_name = None
-                        
-                        # Try to get the field name from field definitions
-                        for field_def in self.field_definition_ids:
-                            if field_def.field_type == 'boolean' and not processed_fields.get(field_def.name):
-                                field_name = field_def.name
-                                processed_fields[field_name] = True
-                                break
-                        
-                        if not field_name:
-                            # If we don't find a matching field definition, use a default name
-                            field_name = f"Boolean Field {i}"
-                            
-                        _logger.info(f"Creating boolean field value '{field_name}' = {item_data[field_key]}")
-                        
-                        self.env['inventory.connector.field.value'].create({
-                            'item_id': existing_item.id,
-                            'field_name': field_name,
-                            'field_type': 'boolean',
-                            'boolean_value': bool(item_data[field_key]),
-                        })
-                
-                # Process tags
-                tag_ids = []
-                
-                # Check for tags array
-                if item_data.get('tags'):
-                    _logger.info(f"Processing tags array for item {existing_item.name}")
-                    for tag_name in item_data.get('tags'):
-                        tag = self.env['inventory.connector.tag'].search([
-                            ('inventory_id', '=', self.id),
-                            ('name', '=', tag_name)
-                        ], limit=1)
-                        
-                        if not tag:
-                            tag = self.env['inventory.connector.tag'].create({
-                                'name': tag_name,
-                                'inventory_id': self.id,
-                            })
-                            _logger.info(f"Created new tag: {tag_name}")
-                            
-                        tag_ids.append(tag.id)
-                
-                # Check for comma-separated tag string
-                elif item_data.get('tagsString'):
-                    _logger.info(f"Processing tags string for item {existing_item.name}")
-                    tag_names = item_data.get('tagsString', '').split(',')
-                    for tag_name in tag_names:
-                        tag_name = tag_name.strip()
-                        if not tag_name:
-                            continue
-                            
-                        tag = self.env['inventory.connector.tag'].search([
-                            ('inventory_id', '=', self.id),
-                            ('name', '=', tag_name)
-                        ], limit=1)
-                        
-                        if not tag:
-                            tag = self.env['inventory.connector.tag'].create({
-                                'name': tag_name,
-                                'inventory_id': self.id,
-                            })
-                            _logger.info(f"Created new tag: {tag_name}")
-                            
-                        tag_ids.append(tag.id)
-                
-                # Apply tags to the item
-                if tag_ids:
-                    _logger.info(f"Applying {len(tag_ids)} tags to item {existing_item.name}")
-                    existing_item.tag_ids = [(6, 0, tag_ids)]
-            
-            # Update last_sync
-            self.write({
-                'last_sync': now
-            })
+            counts = self._import_items()
             
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Items Imported'),
-                    'message': _('%s items imported, %s items updated') % (imported_count, updated_count),
+                    'message': _('%s items imported, %s items updated, %s unchanged items skipped') % (
+                        counts['imported'], counts['updated'], counts['skipped']),
                     'sticky': False,
                     'type': 'success',
                 }
@@ -752,4 +824,488 @@ class InventoryConnectorInventory(models.Model):
             
         except Exception as e:
             _logger.error("Error importing inventory items: %s", str(e))
-            raise UserError(_("Error importing inventory items: %s") % str(e))
\ No newline at end of file
+            raise UserError(_("Error importing inventory items: %s") % str(e))
+    
+    def _import_items(self, progress_callback=None, deadline=None):
+        """Import all items of this inventory from the API, return the imported, updated and skipped counts"""
+        self.ensure_one()
+        return self._record_sync_run('import', '_run_import_items', progress_callback, deadline)
+    
+    def _run_import_items(self, progress_callback=None, deadline=None):
+        """Import the items, see _import_items"""
+        metrics = self._get_sync_metrics()
+        
+        # Get items from API
+        base_url = self.api_url.rstrip('/')
+        # Force HTTPS if port 5001 is detected
+        if ':5001' in base_url and not base_url.startswith('https'):
+            base_url = 'https://localhost:5001'
+            
+        # Process the items batch by batch: a single prefetch of existing
+        # items, then one multi-record create and grouped writes per batch
+        now = fields.Datetime.now()
+        started = time.monotonic()
+        with metrics.phase('items'):
+            existing_items = self._prefetch_existing_items()
+            mapper = self._compile_field_mapper()
+        with metrics.phase('tags'):
+            tag_cache = self._prefetch_tags()
+        aggregates = None
+        if self.aggregation_source == 'streaming':
+            with metrics.phase('aggregated'):
+                aggregates = self._load_streaming_aggregates()
+        counts = {'imported': 0, 'updated': 0, 'skipped': 0}
+        since = self.items_watermark if self.incremental_sync else None
+        watermark = since
+        
+        checkpointed = self.checkpoint_import or deadline is not None
+        checkpoint = self._load_import_checkpoint() if checkpointed else None
+        if checkpointed:
+            resume_page, resume_external_id = 0, None
+            if checkpoint:
+                resume_page = self.import_resume_page
+                resume_external_id = self.import_resume_external_id
+                now, counts, watermark = checkpoint['now'], checkpoint['counts'], checkpoint['watermark']
+                _logger.info("Resuming the import of inventory %s after page %s (item %s)",
+                             self.id, resume_page, resume_external_id)
+            chunks = self._iter_import_chunks(base_url, since, resume_page, resume_external_id)
+        else:
+            chunks = enumerate(self._iter_item_batches(base_url, since), start=1)
+        
+        # Downloading and parsing the pages counts as items phase time
+        for pages_done, items_data in metrics.timed_iter('items', chunks):
+            last_external_id = self._item_external_id(items_data[-1]) if items_data else None
+            with metrics.phase('items'):
+                items = payload_normalizer.ITEM.normalize_all(items_data)
+            if self.incremental_sync:
+                items, unmodified_count, watermark = self._filter_modified_items(items, since, watermark)
+                counts['skipped'] += unmodified_count
+                metrics.count('items', skipped=unmodified_count)
+            batch_imported, batch_updated, batch_skipped = self._import_item_batch(
+                items, existing_items, now, mapper, tag_cache, aggregates)
+            counts['imported'] += batch_imported
+            counts['updated'] += batch_updated
+            counts['skipped'] += batch_skipped
+            if checkpointed:
+                self._commit_import_checkpoint(pages_done, last_external_id, now, counts, watermark, aggregates)
+            if progress_callback:
+                progress_callback(pages_done, sum(counts.values()))
+            if deadline is not None and time.monotonic() > deadline:
+                _logger.info("Import of inventory %s paused after page %s, it resumes on the next run",
+                             self.id, pages_done)
+                return counts
+        
+        # Update last_sync, the import is complete so nothing is left to resume
+        self.write({
+            'last_sync': now,
+            'items_watermark': watermark,
+            'import_resume_page': 0,
+            'import_resume_external_id': False,
+            'import_resume_state': False,
+        })
+        
+        if self.aggregation_source == 'local' and (counts['imported'] or counts['updated']):
+            with metrics.phase('aggregated'):
+                self._refresh_local_aggregations()
+        elif aggregates is not None:
+            with metrics.phase('aggregated'):
+                metrics.count('aggregated', updated=len(aggregates.changed))
+                self._save_streaming_aggregates(aggregates)
+        
+        elapsed = time.monotonic() - started
+        processed = sum(counts.values())
+        _logger.info("Imported items of inventory %s: %s processed in %.1fs (%.0f items/s)",
+                     self.id, processed, elapsed, processed / elapsed if elapsed else 0)
+        return counts
+    
+    def _filter_modified_items(self, items, since, watermark):
+        """Drop the items not modified since since, return (modified items, unmodified count, new watermark)"""
+        modified = []
+        for item in items:
+            updated_at = item.updated_at
+            if updated_at and (not watermark or updated_at > watermark):
+                watermark = updated_at
+            if since and updated_at and updated_at < since:
+                continue
+            modified.append(item)
+        return modified, len(items) - len(modified), watermark
+    
+    def _get_items_params(self, since=None):
+        """Query parameters for the items endpoint, authentication excluded"""
+        params = {}
+        if since:
+            params['since'] = since.strftime('%Y-%m-%dT%H:%M:%S')
+        return params
+    
+    def _iter_item_batches(self, base_url, since=None, start_page=1):
+        """Yield lists of item payloads according to the configured import mode"""
+        items_url = self._api_endpoint_url(base_url, 'items')
+        
+        if self.import_mode == 'paged':
+            yield from self._iter_item_pages(items_url, since, start_page)
+            return
+        if self.import_mode == 'stream':
+            yield from self._iter_item_stream(items_url, since)
+            return
+        if self.import_mode == 'pipeline':
+            yield from self._iter_item_pipeline(items_url, since, start_page)
+            return
+        
+        response = self._api_get(items_url, 'items', params=self._get_items_params(since), timeout=30)
+        
+        if response.status_code == 304:
+            _logger.info("Items not modified on the server")
+            return
+        if response.status_code != 200:
+            raise UserError(_("Failed to get items from API: %s") % response.text)
+            
+        items_data = response.json()
+        if _logger.isEnabledFor(logging.DEBUG):
+            _logger.debug("Items data structure: %s", json.dumps(items_data[:2] if items_data else [], indent=2))  # Log first 2 items
+        yield items_data
+        # Reached once the consumer has imported the items
+        self._store_http_validators('items', response)
+    
+    def _iter_item_pages(self, items_url, since=None, start_page=1):
+        """Walk the items endpoint page by page using its page/pageSize parameters"""
+        page_size = self.import_page_size or 500
+        metrics = self._get_sync_metrics()
+        auth_params, auth_headers = self._auth_request_args(self.api_auth_scheme, self.api_token)
+        page = start_page
+        previous_first_item = None
+        full_page_size = None
+        
+        while True:
+            params = dict(auth_params, **self._get_items_params(since), page=page, pageSize=page_size)
+            response = http_client.get(self.env, items_url, params=params, headers=auth_headers, timeout=30, verify=False)
+            metrics.add_http('items', response)
+            
+            if response.status_code != 200:
+                raise UserError(_("Failed to get items page %s from API: %s") % (page, response.text))
+            
+            items_data = response.json()
+            if not items_data:
+                break
+            
+            # Guard against servers that ignore the paging parameters and
+            # return the whole inventory (or the same page) every time; whole
+            # items are compared so the casing of the id key does not matter
+            first_item = items_data[0]
+            if page > start_page and first_item == previous_first_item:
+                _logger.warning("Items endpoint returned page %s twice, stopping paged import", page - 1)
+                break
+            
+            _logger.debug("Fetched items page %s (%s items)", page, len(items_data))
+            yield items_data
+            
+            if full_page_size is None:
+                full_page_size = len(items_data)
+                if full_page_size < page_size:
+                    _logger.debug("Items endpoint returned %s of %s requested items on page %s",
+                                  full_page_size, page_size, page)
+            elif len(items_data) < full_page_size:
+                break
+            previous_first_item = first_item
+            page += 1
+    
+    def _iter_item_pipeline(self, items_url, since=None, start_page=1):
+        """Fetch item pages with a thread pool and yield them in page order"""
+        page_size = self.import_page_size or 500
+        options = http_client.get_options(self.env)
+        auth_params, auth_headers = self._auth_request_args(self.api_auth_scheme, self.api_token)
+        base_params = dict(auth_params, **self._get_items_params(since))
+        metrics = self._get_sync_metrics()
+        
+        def fetch_page(page):
+            # Runs in a worker thread: no ORM access here
+            params = dict(base_params, page=page, pageSize=page_size)
+            response = http_client.fetch(items_url, options, params=params, headers=auth_headers, timeout=30, verify=False)
+            metrics.add_http('items', response)
+            if response.status_code != 200:
+                raise UserError(_("Failed to get items page %s from API: %s") % (page, response.text))
+            return response.json()
+        
+        pipeline = PagePipeline(fetch_page, workers=self.import_workers, max_buffered=self.import_queue_size,
+                                start_page=start_page)
+        for items_data in pipeline:
+            _logger.debug("Received items page (%s items)", len(items_data))
+            yield items_data
+    
+    def _iter_item_stream(self, items_url, since=None):
+        """Download all items in one request and yield them in batches while the body is still arriving"""
+        batch_size = self.import_page_size or 500
+        
+        with self._api_get(items_url, 'items', params=self._get_items_params(since), timeout=30, stream=True) as response:
+            if response.status_code == 304:
+                _logger.info("Items not modified on the server")
+                return
+            if response.status_code != 200:
+                raise UserError(_("Failed to get items from API: %s") % response.text)
+            
+            batch = []
+            chunks = self._get_sync_metrics().add_bytes('items', response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+            for item_data in iter_json_array(chunks):
+                batch.append(item_data)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+            self._store_http_validators('items', response)
+    
+    def _load_import_checkpoint(self):
+        """Return the state saved by an interrupted checkpointed import, None to start from the beginning"""
+        if not self.import_resume_page or not self.import_resume_state:
+            return None
+        state = json.loads(self.import_resume_state)
+        if state.get('mode') != self.import_mode or state.get('page_size') != self.import_page_size:
+            _logger.info("Import settings of inventory %s changed, not resuming the interrupted import", self.id)
+            return None
+        return {
+            'now': fields.Datetime.to_datetime(state['now']),
+            'counts': state['counts'],
+            'watermark': fields.Datetime.to_datetime(state['watermark']) if state.get('watermark') else None,
+        }
+    
+    def action_discard_import_checkpoint(self):
+        """Forget the resume cursor, the next import starts from the first page"""
+        self.write({
+            'import_resume_page': 0,
+            'import_resume_external_id': False,
+            'import_resume_state': False,
+        })
+    
+    def _commit_import_checkpoint(self, page, external_id, now, counts, watermark, aggregates=None):
+        """Commit the items written so far with the resume cursor, then empty the ORM cache"""
+        if aggregates is not None:
+            # Stale extremes are recomputed once, at the end of the import
+            self._save_streaming_aggregates(aggregates, refresh_extremes=False)
+        self.write({
+            'import_resume_page': page,
+            'import_resume_external_id': external_id,
+            'import_resume_state': json.dumps({
+                'mode': self.import_mode,
+                'page_size': self.import_page_size,
+                'now': fields.Datetime.to_string(now),
+                'counts': counts,
+                'watermark': fields.Datetime.to_string(watermark) if watermark else None,
+            }),
+        })
+        self.env.cr.commit()
+        self.env.invalidate_all()
+        _logger.debug("Committed page %s of the import of inventory %s (last item %s)", page, self.id, external_id)
+    
+    def _iter_import_chunks(self, base_url, since=None, resume_page=0, resume_external_id=None):
+        """Yield (page, item payloads) chunks of a checkpointed import, after the resume cursor"""
+        chunk_size = self.import_page_size or 500
+        if self.import_mode in ('paged', 'pipeline'):
+            batches = self._iter_item_batches(base_url, since, start_page=max(resume_page, 1))
+            page = resume_page
+            if resume_page:
+                items_data = next(batches, None)
+                if items_data is None:
+                    return
+                if self._item_external_id(items_data[-1]) != resume_external_id:
+                    _logger.warning("Page %s of inventory %s changed since the interrupted import, importing it again",
+                                    resume_page, self.id)
+                    yield page, items_data
+            for items_data in batches:
+                page += 1
+                yield page, items_data
+            return
+        
+        skip = resume_page * chunk_size
+        position = 0
+        page = resume_page
+        chunk = []
+        for items_data in self._iter_item_batches(base_url, since):
+            for item_data in items_data:
+                position += 1
+                if position <= skip:
+                    if position == skip and self._item_external_id(item_data) != resume_external_id:
+                        _logger.warning("Items of inventory %s were reordered since the interrupted import, "
+                                        "resuming after item %s anyway", self.id, skip)
+                    continue
+                chunk.append(item_data)
+                if len(chunk) >= chunk_size:
+                    page += 1
+                    yield page, chunk
+                    chunk = []
+        if chunk:
+            yield page + 1, chunk
+    
+    def _prefetch_existing_items(self):
+        """Return a dict mapping external_id -> (item id, name, content hash) for this inventory"""
+        # Plain SQL so archived items are matched too (external_id is unique per inventory)
+        self.env['inventory.connector.item'].flush_model(['inventory_id', 'external_id', 'name', 'content_hash'])
+        self.env.cr.execute("""
+            SELECT external_id, id, name, content_hash
+              FROM inventory_connector_item
+             WHERE inventory_id = %s
+        """, (self.id,))
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
+    
+    @staticmethod
+    def _compute_content_hash(name, value_rows, tag_names):
+        """Hash the normalized content of an item payload: name, field values and tags"""
+        payload = json.dumps([name, value_rows, tag_names], separators=(',', ':'), default=str)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def _import_item_batch(self, items, existing_items, now, mapper, tag_cache, aggregates=None):
+        """Upsert a batch of Item records and their values, return the (imported, updated, skipped) counts"""
+        Item = self.env['inventory.connector.item']
+        FieldValue = self.env['inventory.connector.field.value']
+        metrics = self._get_sync_metrics()
+        compact = self.value_storage == 'jsonb'
+        
+        with metrics.phase('items'):
+            # Deduplicate by external id, the last occurrence wins
+            payloads = {}
+            for item in items:
+                payloads[str(item.id)] = item
+            
+            create_vals = []
+            update_ids = []
+            renamed = {}
+            new_hashes = {}
+            changed = {}  # external_id -> (field values, tag names)
+            skipped_count = 0
+            for external_id, item in payloads.items():
+                name = item.name or f"Item {external_id}"
+                values = mapper.map_record(item)
+                tag_names = self._get_item_tag_names(item)
+                content_hash = self._compute_content_hash(name, values, tag_names)
+                
+                existing = existing_items.get(external_id)
+                if existing:
+                    item_id, current_name, current_hash = existing
+                    if current_hash == content_hash:
+                        skipped_count += 1
+                        continue
+                    update_ids.append(item_id)
+                    new_hashes[item_id] = content_hash
+                    if current_name != name:
+                        renamed.setdefault(name, []).append(item_id)
+                    existing_items[external_id] = (item_id, name, content_hash)
+                else:
+                    create_vals.append({
+                        'name': name,
+                        'inventory_id': self.id,
+                        'external_id': external_id,
+                        'import_date': now,
+                        'last_update': now,
+                        'content_hash': content_hash,
+                    })
+                    if compact:
+                        create_vals[-1]['custom_values'] = self._custom_values_dict(values)
+                changed[external_id] = (values, tag_names)
+            
+            # Grouped writes: one for the timestamp, one per distinct new name
+            if update_ids:
+                updated_items = Item.browse(update_ids)
+                updated_items.write({'last_update': now})
+                for name, item_ids in renamed.items():
+                    Item.browse(item_ids).write({'name': name})
+                Item._bulk_set_content_hash(new_hashes)
+            
+            # Single multi-record create for new items
+            if create_vals:
+                created_items = Item.create(create_vals)
+                for item in created_items:
+                    existing_items[item.external_id] = (item.id, item.name, item.content_hash)
+            metrics.count('items', created=len(create_vals), updated=len(update_ids), skipped=skipped_count)
+        
+        # Replace the field values of the whole batch at once
+        value_rows = []
+        # Items without tags in the payload keep their current tags
+        item_tag_names = {}
+        for external_id, (values, tag_names) in changed.items():
+            item_id = existing_items[external_id][0]
+            value_rows.extend((item_id,) + value for value in values)
+            if tag_names:
+                item_tag_names[item_id] = tag_names
+        with metrics.phase('field_values'):
+            if compact:
+                # New items got their values with the create above
+                updated_values = {
+                    existing_items[external_id][0]: self._custom_values_dict(values)
+                    for external_id, (values, _tag_names) in changed.items()
+                    if existing_items[external_id][0] in new_hashes
+                }
+                previous = Item._bulk_set_custom_values(updated_values, return_previous=aggregates is not None)
+                field_types = {name: field[0] for name, field in mapper.fields_by_name.items()}
+                removed_rows = [(item_id,) + row for item_id, custom_values in previous.items()
+                                for row in FieldValue._from_json_values(custom_values, field_types)]
+            else:
+                removed_rows = FieldValue._bulk_replace_values(
+                    update_ids, value_rows, return_removed=aggregates is not None)
+            metrics.count('field_values', created=len(value_rows))
+        if aggregates is not None:
+            with metrics.phase('aggregated'):
+                # The running aggregates only cover active items; new items are active
+                inactive_ids = Item._inactive_ids(update_ids)
+                aggregates.remove_rows(row[1:] for row in removed_rows if row[0] not in inactive_ids)
+                aggregates.add_rows(row[1:] for row in value_rows if row[0] not in inactive_ids)
+        with metrics.phase('tags'):
+            self._apply_item_tags(item_tag_names, tag_cache)
+        
+        return len(create_vals), len(update_ids), skipped_count
+    
+    def _custom_values_dict(self, values):
+        """Turn mapped (field_name, field_type, text, numeric, boolean) values into an item.custom_values dict"""
+        to_json_value = self.env['inventory.connector.field.value']._to_json_value
+        return {value[0]: to_json_value(*value[1:]) for value in values}
+    
+    def _compile_field_mapper(self):
+        """Build the field mapper used to turn item payloads into field value rows"""
+        definitions = self.env['inventory.connector.field.definition'].search_read(
+            [('inventory_id', '=', self.id)], ['name', 'field_type'], order='sequence, id')
+        return FieldMapper((definition['name'], definition['field_type']) for definition in definitions)
+    
+    @staticmethod
+    def _get_item_tag_names(item):
+        """Return the tag names of one item record, from the tags array or tagsString"""
+        if item.tags:
+            tag_names = item.tags
+        elif item.tags_string:
+            tag_names = [tag_name.strip() for tag_name in item.tags_string.split(',')]
+        else:
+            return []
+        # Drop empty names and duplicates, keeping the payload order
+        return list(dict.fromkeys(tag_name for tag_name in tag_names if tag_name))
+    
+    def _prefetch_tags(self):
+        """Return a dict mapping tag name -> tag id for this inventory"""
+        self.env['inventory.connector.tag'].flush_model(['inventory_id', 'name'])
+        self.env.cr.execute("""
+            SELECT name, id
+              FROM inventory_connector_tag
+             WHERE inventory_id = %s
+        """, (self.id,))
+        return dict(self.env.cr.fetchall())
+    
+    def _apply_item_tags(self, item_tag_names, tag_cache):
+        """Apply {item id: tag names} to the items, creating the missing tags in one batch"""
+        if not item_tag_names:
+            return
+        
+        missing_names = []
+        for tag_names in item_tag_names.values():
+            for tag_name in tag_names:
+                if tag_name not in tag_cache:
+                    tag_cache[tag_name] = None
+                    missing_names.append(tag_name)
+        
+        if missing_names:
+            new_tags = self.env['inventory.connector.tag'].create([
+                {'name': tag_name, 'inventory_id': self.id} for tag_name in missing_names
+            ])
+            for tag in new_tags:
+                tag_cache[tag.name] = tag.id
+            self._get_sync_metrics().count('tags', created=len(new_tags))
+            _logger.info("Created %s new tags", len(new_tags))
+        
+        self.env['inventory.connector.item']._bulk_replace_tags({
+            item_id: [tag_cache[tag_name] for tag_name in tag_names]
+            for item_id, tag_names in item_tag_names.items()
+        })
\ No newline at end of file
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+import json
+import logging
+import re
+
+_logger = logging.getLogger(__name__)
+
+# SQL column type of each field type in the attribute table
+PIVOT_COLUMN_TYPES = {
+    'numeric': ('double precision', 'numeric_value'),
+    'boolean': ('boolean', 'boolean_value'),
+    'text': ('text', 'text_value'),
+    'multiline': ('text', 'text_value'),
+    'document': ('text', 'text_value'),
+}
+
+# Only these columns get an index: long text values do not fit in a btree
+PIVOT_INDEXED_TYPES = ('numeric', 'boolean')
+
+# Operators accepted by the custom field filter, with their SQL spelling
+FILTER_OPERATORS = {
+    '=': '=',
+    '!=': '!=',
+    '<': '<',
+    '<=': '<=',
+    '>': '>',
+    '>=': '>=',
+    ':': 'ILIKE',
+}
+FILTER_PATTERN = re.compile(r'^\s*(.+?)\s*(<=|>=|!=|=|<|>|:)\s*(.*?)\s*$')
+
+class InventoryConnectorInventory(models.Model):
+    _inherit = 'inventory.connector.inventory'
+
+    attribute_table = fields.Boolean('Indexed Attribute Table',
+        help="Maintain a materialized view with one typed, indexed column per field definition, "
+             "refreshed after each import, so filtering and sorting items by custom fields are index scans.")
+    attribute_table_signature = fields.Char('Attribute Table Layout', readonly=True, copy=False)
+    
+    def _attribute_table_name(self):
+        return f"inventory_connector_attr_{self.id}"
+    
+    def _attribute_table_columns(self):
+        """Return [(definition id, column name, field type)] of the attribute table"""
+        return [
+            (definition.id, f"f_{definition.id}", definition.field_type)
+            for definition in self.field_definition_ids.sorted('id')
+            if definition.field_type in PIVOT_COLUMN_TYPES
+        ]
+    
+    def _attribute_table_layout(self, columns=None):
+        """Signature of the view the current value storage and field definitions call for"""
+        if columns is None:
+            columns = self._attribute_table_columns()
+        # The view reads from the value storage, a new storage needs a new definition
+        return self.value_storage + ';' + ','.join(
+            f"{definition_id}:{field_type}" for definition_id, _column, field_type in columns)
+    
+    def _attribute_table_usable(self):
+        """True when the attribute table exists and has a column for every current field definition"""
+        return bool(self.attribute_table and self.attribute_table_signature
+                    and self.attribute_table_signature == self._attribute_table_layout())
+    
+    def _drop_attribute_table(self):
+        for inventory in self:
+            self.env.cr.execute(f"DROP MATERIALIZED VIEW IF EXISTS {inventory._attribute_table_name()}")
+        self.filtered('attribute_table_signature').write({'attribute_table_signature': False})
+    
+    def _refresh_attribute_table(self):
+        """Create or refresh the attribute table of this inventory"""
+        self.ensure_one()
+        self.env['inventory.connector.field.value'].flush_model()
+        self.env['inventory.connector.item'].flush_model(['inventory_id', 'custom_values'])
+        cr = self.env.cr
+        table = self._attribute_table_name()
+        columns = self._attribute_table_columns()
+        signature = self._attribute_table_layout(columns)
+        
+        if signature == self.attribute_table_signature:
+            # Concurrently keeps item searches on the view running, it needs the unique index
+            cr.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table}")
+            return
+        
+        query, query_params = self.env['inventory.connector.field.value']._values_query(self)
+        select_columns = []
+        params = []
+        for definition_id, column, field_type in columns:
+            sql_type, value_column = PIVOT_COLUMN_TYPES[field_type]
+            definition = self.env['inventory.connector.field.definition'].browse(definition_id)
+            select_columns.append(
+                f"(array_agg(v.{value_column} ORDER BY v.position DESC) FILTER (WHERE v.field_name = %s))[1]::{sql_type} AS {column}")
+            params.append(definition.name)
+        
+        cr.execute(f"DROP MATERIALIZED VIEW IF EXISTS {table}")
+        cr.execute(f"""
+            CREATE MATERIALIZED VIEW {table} AS
+            SELECT i.id AS item_id{''.join(', ' + column for column in select_columns)}
+              FROM inventory_connector_item i
+         LEFT JOIN ({query}) v ON v.item_id = i.id
+             WHERE i.inventory_id = {int(self.id)}
+          GROUP BY i.id
+        """, params + query_params)
+        cr.execute(f"CREATE UNIQUE INDEX {table}_item_id_idx ON {table} (item_id)")
+        for _definition_id, column, field_type in columns:
+            if field_type in PIVOT_INDEXED_TYPES:
+                cr.execute(f"CREATE INDEX {table}_{column}_idx ON {table} ({column})")
+        cr.execute(f"ANALYZE {table}")
+        self.attribute_table_signature = signature
+        _logger.info("Built attribute table %s with %s field columns", table, len(columns))
+    
+    def _run_import_items(self, progress_callback=None, deadline=None):
+        counts = super()._run_import_items(progress_callback, deadline)
+        # A paused import is refreshed once, when its last chunk is in
+        if self.import_resume_page:
+            return counts
+        if self.attribute_table and (counts['imported'] or counts['updated'] or not self.attribute_table_signature):
+            with self._get_sync_metrics().phase('field_values'):
+                self._refresh_attribute_table()
+        return counts
+    
+    def write(self, vals):
+        if vals.get('attribute_table') is False:
+            self.filtered('attribute_table')._drop_attribute_table()
+        result = super().write(vals)
+        if vals.get('attribute_table'):
+            for inventory in self:
+                inventory._refresh_attribute_table()
+        elif 'value_storage' in vals:
+            for inventory in self.filtered('attribute_table_signature'):
+                inventory._refresh_attribute_table()
+        return result
+    
+    def unlink(self):
+        self.filtered('attribute_table_signature')._drop_attribute_table()
+        return super().unlink()
+    
+    def action_refresh_attribute_table(self):
+        """Rebuild the attribute table from the stored field values"""
+        self.ensure_one()
+        self.attribute_table_signature = False
+        self._refresh_attribute_table()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Attribute Table Rebuilt'),
+                'message': _('The indexed attribute table of %s was rebuilt') % self.name,
+                'sticky': False,
+                'type': 'success',
+            }
+        }
+    
+    def _search_items_by_field(self, field_name, operator, value, order=None, limit=None):
+        """Return the ids of the items of this inventory whose field_name value matches"""
+        query, params = self._items_by_field_query(field_name, operator, value, order, limit)
+        if query is None:
+            return []
+        self.env.cr.execute(query, params)
+        return [row[0] for row in self.env.cr.fetchall()]
+    
+    def _items_by_field_query(self, field_name, operator, value, order=None, limit=None):
+        """Return the (query, params) selecting the items of this inventory whose field_name value matches"""
+        self.ensure_one()
+        definition = self.field_definition_ids.filtered(lambda definition: definition.name == field_name)[:1]
+        if not definition or operator not in FILTER_OPERATORS:
+            return None, []
+        sql_operator = FILTER_OPERATORS[operator]
+        value = self._coerce_filter_value(definition.field_type, operator, value)
+        if value is None:
+            return None, []
+        direction = 'DESC' if order == 'desc' else 'ASC'
+        
+        if self._attribute_table_usable():
+            column = f"f_{definition.id}"
+            query = f"SELECT item_id FROM {self._attribute_table_name()} WHERE {column} {sql_operator} %s"
+            if order:
+                query += f" ORDER BY {column} {direction} NULLS LAST"
+            params = [value]
+        elif self.value_storage == 'jsonb':
+            sql_type, _value_column = PIVOT_COLUMN_TYPES[definition.field_type]
+            self.env['inventory.connector.item'].flush_model(['inventory_id', 'custom_values'])
+            expression = f"(custom_values ->> %s)::{sql_type}"
+            if operator == '=':
+                # Containment is answered by the GIN index on custom_values
+                condition = "custom_values @> %s::jsonb"
+                params = [json.dumps({field_name: value})]
+            else:
+                condition = f"{expression} {sql_operator} %s"
+                params = [field_name, value]
+            query = f"""
+                SELECT id
+                  FROM inventory_connector_item
+                 WHERE inventory_id = %s AND {condition}
+            """
+            params.insert(0, self.id)
+            if order:
+                query += f" ORDER BY {expression} {direction} NULLS LAST"
+                params.append(field_name)
+        else:
+            _sql_type, value_column = PIVOT_COLUMN_TYPES[definition.field_type]
+            self.env['inventory.connector.field.value'].flush_model()
+            self.env['inventory.connector.item'].flush_model(['inventory_id'])
+            query = f"""
+                SELECT v.item_id
+                  FROM inventory_connector_field_value v
+                  JOIN inventory_connector_item i ON i.id = v.item_id
+                 WHERE v.field_name = %s AND v.{value_column} {sql_operator} %s AND i.inventory_id = %s
+            """
+            if order:
+                query += f" ORDER BY v.{value_column} {direction}"
+            params = [field_name, value, self.id]
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        return query, params
+    
+    @staticmethod
+    def _coerce_filter_value(field_type, operator, value):
+        """Convert a filter value to the type of the field, None if it cannot match"""
+        if operator == ':':
+            if field_type in PIVOT_INDEXED_TYPES:
+                return None
+            # The value is matched literally, its wildcards are escaped
+            return '%' + str(value).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        if field_type == 'numeric':
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        if field_type == 'boolean':
+            if isinstance(value, str):
+                return value.strip().lower() in ('1', 'true', 'yes', 'y')
+            return bool(value)
+        return str(value)
+
+
+class InventoryConnectorItem(models.Model):
+    _inherit = 'inventory.connector.item'
+
+    field_filter = fields.Char('Custom Field', compute='_compute_field_filter', search='_search_field_filter',
+        help="Filter on a custom field value, e.g. 'Price >= 10' or 'Color: red'")
+    
+    def _compute_field_filter(self):
+        for item in self:
+            item.field_filter = False
+    
+    def _search_field_filter(self, operator, value):
+        """Search items with a 'Field <op> value' expression, or a (field, op, value) tuple"""
+        if isinstance(value, (list, tuple)) and len(value) == 3:
+            field_name, filter_operator, filter_value = value
+        else:
+            match = FILTER_PATTERN.match(value or '') if isinstance(value, str) else None
+            if not match:
+                raise UserError(_("Invalid custom field filter %r, expected e.g. 'Price >= 10' or 'Color: red'") % (value,))
+            field_name, filter_operator, filter_value = match.groups()
+        
+        inventories = self.env['inventory.connector.field.definition'].search(
+            [('name', '=', field_name)]).inventory_id
+        queries, params = [], []
+        for inventory in inventories:
+            query, query_params = inventory._items_by_field_query(field_name, filter_operator, filter_value)
+            if query is not None:
+                queries.append(f"({query})")
+                params.extend(query_params)
+        domain_operator = 'not in' if operator in ('!=', 'not ilike') else 'in'
+        if not queries:
+            return [('id', domain_operator, [])]
+        # A subquery keeps the item search in the database instead of a list of ids
+        return [('id', domain_operator, SQL(f"({' UNION ALL '.join(queries)})", *params))]
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+_logger = logging.getLogger(__name__)
+
+# Scheduler limits, overridable with system parameters
+PARAM_MAX_WORKERS = 'inventory_connector.scheduler_max_workers'
+PARAM_BATCH_SIZE = 'inventory_connector.scheduler_batch_size'
+PARAM_TIME_BUDGET = 'inventory_connector.scheduler_time_budget'
+PARAM_LEASE_MINUTES = 'inventory_connector.scheduler_lease_minutes'
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_TIME_BUDGET = 600
+DEFAULT_LEASE_MINUTES = 60
+
+class InventoryConnectorInventory(models.Model):
+    _inherit = 'inventory.connector.inventory'
+
+    auto_sync = fields.Boolean('Scheduled Sync', default=True,
+        help="Synchronize this inventory and import its items from the scheduled action.")
+    sync_priority = fields.Selection([
+        ('0', 'Low'),
+        ('1', 'Normal'),
+        ('2', 'High'),
+    ], string='Sync Priority', default='1', required=True)
+    sync_interval_hours = fields.Integer('Sync Interval (hours)', default=24,
+        help="Minimum time between two scheduled synchronizations.")
+    sync_lease_owner = fields.Char('Sync Lease Owner', readonly=True, copy=False)
+    sync_lease_until = fields.Datetime('Sync Lease Expiry', readonly=True, copy=False)
+    sync_job_ids = fields.One2many('inventory.connector.sync.job', 'inventory_id', string='Background Jobs')
+    
+    def _queue_job(self, job_type, message):
+        """Queue a background job for this inventory and notify the user"""
+        self.ensure_one()
+        self.env['inventory.connector.sync.job']._enqueue(self, job_type)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Job Queued'),
+                'message': message,
+                'sticky': False,
+                'type': 'info',
+                'next': {'type': 'ir.actions.client', 'tag': 'soft_reload'},
+            }
+        }
+    
+    def action_queue_sync_inventory(self):
+        """Synchronize metadata in the background"""
+        return self._queue_job('sync', _('Synchronization runs in the background, see the Background Jobs tab for progress'))
+    
+    def action_queue_import_items(self):
+        """Import items in the background"""
+        return self._queue_job('import', _('Item import runs in the background, see the Background Jobs tab for progress'))
+    
+    @api.model
+    def _get_scheduler_settings(self):
+        """Read the scheduler limits from the system parameters"""
+        params = self.env['ir.config_parameter'].sudo()
+        return {
+            'max_workers': max(1, int(params.get_param(PARAM_MAX_WORKERS, DEFAULT_MAX_WORKERS))),
+            'batch_size': max(1, int(params.get_param(PARAM_BATCH_SIZE, DEFAULT_BATCH_SIZE))),
+            'time_budget': float(params.get_param(PARAM_TIME_BUDGET, DEFAULT_TIME_BUDGET)),
+            'lease_minutes': max(1, int(params.get_param(PARAM_LEASE_MINUTES, DEFAULT_LEASE_MINUTES))),
+        }
+    
+    @api.model
+    def _get_sync_candidates(self, limit):
+        """Return ids of inventories due for a scheduled sync, highest priority and stalest first"""
+        self.flush_model(['active', 'auto_sync', 'last_sync', 'sync_interval_hours',
+                          'sync_priority', 'sync_lease_until'])
+        self.env.cr.execute("""
+            SELECT id
+              FROM inventory_connector_inventory
+             WHERE active
+               AND auto_sync
+               AND (last_sync IS NULL
+                    OR last_sync < (now() at time zone 'UTC') - make_interval(hours => GREATEST(sync_interval_hours, 0)))
+               AND (sync_lease_until IS NULL OR sync_lease_until < (now() at time zone 'UTC'))
+          ORDER BY sync_priority DESC, last_sync ASC NULLS FIRST, id
+             LIMIT %s
+        """, (limit,))
+        return [row[0] for row in self.env.cr.fetchall()]
+    
+    def _acquire_sync_lease(self, owner, lease_minutes):
+        """Atomically take and commit the sync lease of this inventory; return True on success"""
+        self.ensure_one()
+        self.env.cr.execute("""
+            UPDATE inventory_connector_inventory
+               SET sync_lease_owner = %s,
+                   sync_lease_until = (now() at time zone 'UTC') + make_interval(mins => %s)
+             WHERE id = %s
+               AND (sync_lease_until IS NULL
+                    OR sync_lease_until < (now() at time zone 'UTC')
+                    OR sync_lease_owner = %s)
+         RETURNING id
+        """, (owner, lease_minutes, self.id, owner))
+        acquired = bool(self.env.cr.fetchone())
+        self.env.cr.commit()
+        self.invalidate_recordset(['sync_lease_owner', 'sync_lease_until'])
+        return acquired
+    
+    def _release_sync_lease(self, owner):
+        """Release the sync lease of this inventory if owner still holds it"""
+        self.ensure_one()
+        self.env.cr.execute("""
+            UPDATE inventory_connector_inventory
+               SET sync_lease_owner = NULL, sync_lease_until = NULL
+             WHERE id = %s AND sync_lease_owner = %s
+        """, (self.id, owner))
+        self.env.cr.commit()
+        self.invalidate_recordset(['sync_lease_owner', 'sync_lease_until'])
+    
+    def _run_scheduled_sync(self):
+        """Synchronize metadata and import items of this inventory (lease already held)"""
+        self.ensure_one()
+        self.action_sync_inventory()
+        self.action_import_items()
+    
+    @api.model
+    def _scheduler_sync_one(self, inventory_id, owner, settings, deadline):
+        """Sync one inventory in its own cursor; runs in a scheduler worker thread"""
+        if time.monotonic() > deadline:
+            return False
+        
+        with self.pool.cursor() as cr:
+            env = api.Environment(cr, self.env.uid, self.env.context)
+            inventory = env[self._name].browse(inventory_id)
+            if not inventory._acquire_sync_lease(owner, settings['lease_minutes']):
+                return False
+            try:
+                inventory._run_scheduled_sync()
+                cr.commit()
+                return True
+            except Exception as e:
+                cr.rollback()
+                _logger.error("Scheduled sync of inventory %s failed: %s", inventory_id, str(e))
+                return False
+            finally:
+                inventory._release_sync_lease(owner)
+    
+    @api.model
+    def _cron_sync_inventories(self):
+        """Scheduled action: sync due inventories through a bounded pool of workers"""
+        settings = self._get_scheduler_settings()
+        candidates = self._get_sync_candidates(settings['batch_size'])
+        if not candidates:
+            return
+        
+        owner = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+        deadline = time.monotonic() + settings['time_budget']
+        started = time.monotonic()
+        
+        workers = min(settings['max_workers'], len(candidates))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='inventory_connector_sync') as executor:
+            results = list(executor.map(
+                lambda inventory_id: self._scheduler_sync_one(inventory_id, owner, settings, deadline),
+                candidates))
+        
+        _logger.info("Scheduled inventory sync: %s of %s due inventories synchronized in %.1fs",
+                     sum(1 for synced in results if synced), len(candidates), time.monotonic() - started)
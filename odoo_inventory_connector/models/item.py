@@ -1,4 +1,8 @@
 from odoo import models, fields, api
+from collections import defaultdict
+import json
+
+from .field_value import INSERT_BATCH_SIZE
 
 class Item(models.Model):
     _name = 'inventory.connector.item'
@@ -11,49 +15,209 @@ class Item(models.Model):
     import_date = fields.Datetime(string='Import Date')
     last_update = fields.Datetime(string='Last Update')
     active = fields.Boolean(default=True)
+    content_hash = fields.Char(string='Content Hash', readonly=True, copy=False,
+                               help="Hash of the imported name, field values and tags, used to skip unchanged items")
+    
+    # Typed values {field name: value} of inventories using the JSONB value storage
+    custom_values = fields.Json(string='Custom Values', readonly=True, copy=False)
+    value_storage = fields.Selection(related='inventory_id.value_storage')
     
     # Relationships
     field_value_ids = fields.One2many('inventory.connector.field.value', 'item_id', string='Field Values')
     tag_ids = fields.Many2many('inventory.connector.tag', string='Tags')
     
     # Computed fields for easier access to common field values
-    text_fields = fields.Text(compute='_compute_text_fields', string='Text Fields', store=False)
-    numeric_fields = fields.Text(compute='_compute_numeric_fields', string='Numeric Fields', store=False)
-    boolean_fields = fields.Text(compute='_compute_boolean_fields', string='Boolean Fields', store=False)
+    text_fields = fields.Text(compute='_compute_field_summaries', string='Text Fields', store=False)
+    numeric_fields = fields.Text(compute='_compute_field_summaries', string='Numeric Fields', store=False)
+    boolean_fields = fields.Text(compute='_compute_field_summaries', string='Boolean Fields', store=False)
+    
+    # Stored copies for list and search views, recomputed when the values of an item change
+    text_summary = fields.Text(compute='_compute_stored_field_summaries', string='Text Values', store=True)
+    numeric_summary = fields.Text(compute='_compute_stored_field_summaries', string='Numeric Values', store=True)
+    boolean_summary = fields.Text(compute='_compute_stored_field_summaries', string='Boolean Values', store=True)
     
     _sql_constraints = [
         ('inventory_external_id_unique', 'UNIQUE(inventory_id, external_id)', 'External ID must be unique per inventory')
     ]
     
+    def init(self):
+        # Containment searches on the custom values (custom_values @> '{"Color": "red"}')
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS inventory_connector_item_custom_values_idx
+                ON inventory_connector_item USING GIN (custom_values jsonb_path_ops)
+        """)
+    
     def name_get(self):
         result = []
         for record in self:
             result.append((record.id, f"{record.inventory_id.name}: {record.name}"))
         return result
     
-    @api.depends('field_value_ids')
-    def _compute_text_fields(self):
-        for item in self:
-            text_values = item.field_value_ids.filtered(lambda v: v.field_type in ['text', 'multiline'])
-            if text_values:
-                item.text_fields = ', '.join([f"{v.field_name}: {v.text_value or ''}" for v in text_values])
-            else:
-                item.text_fields = ''
-    
-    @api.depends('field_value_ids')
-    def _compute_numeric_fields(self):
+    @api.model
+    def _bulk_replace_tags(self, item_tag_ids):
+        """Replace the tags of {item id: tag ids} with plain SQL and adjust the stored tag item counts"""
+        if not item_tag_ids:
+            return
+        
+        field = self._fields['tag_ids']
+        self.flush_model(['tag_ids', 'active'])
+        Tag = self.env['inventory.connector.tag']
+        # Tags created by this import still have their count to compute: it
+        # must run before the rows below are written, or they count twice
+        Tag.flush_model(['item_count'])
+        cr = self.env.cr
+        deltas = defaultdict(int)
+        
+        cr.execute(f"""
+            WITH removed AS (
+                DELETE FROM {field.relation}
+                 WHERE {field.column1} = ANY(%s)
+             RETURNING {field.column1} AS item_id, {field.column2} AS tag_id
+            )
+            SELECT removed.tag_id, COUNT(*)
+              FROM removed
+              JOIN inventory_connector_item item ON item.id = removed.item_id
+             WHERE item.active
+          GROUP BY removed.tag_id
+        """, (list(item_tag_ids),))
+        for tag_id, count in cr.fetchall():
+            deltas[tag_id] -= count
+        
+        pairs = [(item_id, tag_id) for item_id, tag_ids in item_tag_ids.items() for tag_id in tag_ids]
+        for offset in range(0, len(pairs), INSERT_BATCH_SIZE):
+            chunk = pairs[offset:offset + INSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s, %s)'] * len(chunk))
+            cr.execute(f"""
+                WITH added AS (
+                    INSERT INTO {field.relation} ({field.column1}, {field.column2})
+                    VALUES {placeholders}
+                    ON CONFLICT DO NOTHING
+                 RETURNING {field.column1} AS item_id, {field.column2} AS tag_id
+                )
+                SELECT added.tag_id, COUNT(*)
+                  FROM added
+                  JOIN inventory_connector_item item ON item.id = added.item_id
+                 WHERE item.active
+              GROUP BY added.tag_id
+            """, [value for pair in chunk for value in pair])
+            for tag_id, count in cr.fetchall():
+                deltas[tag_id] += count
+        
+        # The ORM cache does not know about the relation rows changed above
+        self.invalidate_model(['tag_ids'])
+        Tag.invalidate_model(['item_ids'])
+        Tag._bulk_add_item_counts(deltas)
+    
+    @api.model
+    def _inactive_ids(self, item_ids):
+        """Return the set of archived items among item_ids"""
+        if not item_ids:
+            return set()
+        self.flush_model(['active'])
+        self.env.cr.execute("""
+            SELECT id
+              FROM inventory_connector_item
+             WHERE id = ANY(%s) AND NOT active
+        """, (list(item_ids),))
+        return {row[0] for row in self.env.cr.fetchall()}
+    
+    def write(self, vals):
+        if 'active' not in vals:
+            return super().write(vals)
+        # Running aggregates only cover active items, their state follows archiving
+        updates = self.env['inventory.connector.inventory']._streaming_activity_updates(self, bool(vals['active']))
+        result = super().write(vals)
+        for inventory, aggregates in updates:
+            inventory._save_streaming_aggregates(aggregates)
+        return result
+    
+    def unlink(self):
+        updates = self.env['inventory.connector.inventory']._streaming_activity_updates(self, False)
+        result = super().unlink()
+        for inventory, aggregates in updates:
+            inventory._save_streaming_aggregates(aggregates)
+        return result
+    
+    @api.model
+    def _bulk_set_content_hash(self, hash_by_id):
+        """Store the content hashes of many items with one UPDATE per chunk"""
+        if not hash_by_id:
+            return
+        
+        self.flush_model(['content_hash'])
+        cr = self.env.cr
+        pairs = list(hash_by_id.items())
+        for offset in range(0, len(pairs), INSERT_BATCH_SIZE):
+            chunk = pairs[offset:offset + INSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s, %s)'] * len(chunk))
+            cr.execute(f"""
+                UPDATE inventory_connector_item AS item
+                   SET content_hash = data.content_hash
+                  FROM (VALUES {placeholders}) AS data(id, content_hash)
+                 WHERE item.id = data.id
+            """, [value for pair in chunk for value in pair])
+        self.invalidate_model(['content_hash'])
+    
+    @api.model
+    def _bulk_set_custom_values(self, values_by_id, return_previous=False):
+        """Store {item id: custom values} with one UPDATE per chunk; with return_previous, return the previous values"""
+        previous = {}
+        if not values_by_id:
+            return previous
+        
+        self.flush_model(['custom_values'])
+        cr = self.env.cr
+        pairs = [(item_id, json.dumps(values)) for item_id, values in values_by_id.items()]
+        returning = "RETURNING item.id, old.custom_values" if return_previous else ""
+        for offset in range(0, len(pairs), INSERT_BATCH_SIZE):
+            chunk = pairs[offset:offset + INSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s, %s::jsonb)'] * len(chunk))
+            # The self join reads the values as they were before the update
+            cr.execute(f"""
+                UPDATE inventory_connector_item AS item
+                   SET custom_values = data.custom_values
+                  FROM (VALUES {placeholders}) AS data(id, custom_values)
+                  JOIN inventory_connector_item AS old ON old.id = data.id
+                 WHERE item.id = data.id
+                {returning}
+            """, [value for pair in chunk for value in pair])
+            if return_previous:
+                previous.update(cr.fetchall())
+        self.invalidate_model(['custom_values'])
+        # Schedule the recompute of the stored item summaries
+        self.browse(list(values_by_id)).modified(['custom_values'])
+        return previous
+    
+    def _read_field_summaries(self):
+        """Return {item id: (text, numeric, boolean summary)} for the items in self"""
+        parts = {item.id: ([], [], []) for item in self}
+        item_ids = [item_id for item_id in self.ids if isinstance(item_id, int)]
+        if item_ids:
+            query, params = self.env['inventory.connector.field.value']._values_query(item_ids=item_ids)
+            self.env.cr.execute(f"""
+                SELECT item_id, field_name, field_type, text_value, numeric_value, boolean_value
+                  FROM ({query}) v
+              ORDER BY item_id, position
+            """, params)
+            for item_id, field_name, field_type, text_value, numeric_value, boolean_value in self.env.cr.fetchall():
+                texts, numerics, booleans = parts[item_id]
+                if field_type in ('text', 'multiline'):
+                    texts.append(f"{field_name}: {text_value or ''}")
+                elif field_type == 'numeric':
+                    numerics.append(f"{field_name}: {numeric_value or 0.0}")
+                elif field_type == 'boolean':
+                    booleans.append(f"{field_name}: {'Yes' if boolean_value else 'No'}")
+        return {item_id: tuple(', '.join(values) for values in item_parts) for item_id, item_parts in parts.items()}
+    
+    @api.depends('field_value_ids', 'custom_values')
+    def _compute_field_summaries(self):
+        summaries = self._read_field_summaries()
         for item in self:
-            numeric_values = item.field_value_ids.filtered(lambda v: v.field_type == 'numeric')
-            if numeric_values:
-                item.numeric_fields = ', '.join([f"{v.field_name}: {v.numeric_value}" for v in numeric_values])
-            else:
-                item.numeric_fields = ''
-    
-    @api.depends('field_value_ids')
-    def _compute_boolean_fields(self):
+            item.text_fields, item.numeric_fields, item.boolean_fields = summaries[item.id]
+    
+    @api.depends('field_value_ids.field_name', 'field_value_ids.field_type', 'field_value_ids.text_value',
+                 'field_value_ids.numeric_value', 'field_value_ids.boolean_value', 'custom_values')
+    def _compute_stored_field_summaries(self):
+        summaries = self._read_field_summaries()
         for item in self:
-            boolean_values = item.field_value_ids.filtered(lambda v: v.field_type == 'boolean')
-            if boolean_values:
-                item.boolean_fields = ', '.join([f"{v.field_name}: {'Yes' if v.boolean_value else 'No'}" for v in boolean_values])
-            else:
-                item.boolean_fields = ''
\ No newline at end of file
+            item.text_summary, item.numeric_summary, item.boolean_summary = summaries[item.id]
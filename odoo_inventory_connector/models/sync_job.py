@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+# Running jobs found without their worker are requeued this many times, then failed
+MAX_JOB_INTERRUPTIONS = 3
+
+class InventoryConnectorSyncJob(models.Model):
+    _name = 'inventory.connector.sync.job'
+    _description = 'Inventory Synchronization Job'
+    _order = 'id desc'
+
+    name = fields.Char('Description', required=True)
+    inventory_id = fields.Many2one('inventory.connector.inventory', string='Inventory', required=True, ondelete='cascade')
+    job_type = fields.Selection([
+        ('sync', 'Synchronize Metadata'),
+        ('import', 'Import Items'),
+        ('full', 'Synchronize and Import'),
+    ], string='Job Type', required=True, default='full')
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', required=True, default='pending', index=True)
+    user_id = fields.Many2one('res.users', string='Requested By', default=lambda self: self.env.user)
+    started_at = fields.Datetime('Started At', readonly=True)
+    finished_at = fields.Datetime('Finished At', readonly=True)
+    
+    # Progress, updated while the job runs
+    pages_done = fields.Integer('Pages Done', readonly=True)
+    items_done = fields.Integer('Items Done', readonly=True)
+    total_items = fields.Integer('Expected Items', readonly=True)
+    progress = fields.Float('Progress (%)', readonly=True)
+    items_per_second = fields.Float('Items / Second', digits=(16, 1), readonly=True)
+    eta = fields.Datetime('Estimated Completion', readonly=True)
+    result_message = fields.Text('Result', readonly=True)
+    metadata_done = fields.Boolean('Metadata Synchronized', readonly=True,
+        help="Set once the metadata step ran, so the next chunks of the job only continue the import.")
+    interrupted_count = fields.Integer('Interruptions', readonly=True,
+        help="Times the job was found running without a worker (killed at the time limit) and requeued.")
+    
+    @api.model
+    def _enqueue(self, inventory, job_type):
+        """Queue a job for inventory, reusing a pending or running one of the same type"""
+        self._recover_stale_jobs()
+        job = self.search([
+            ('inventory_id', '=', inventory.id),
+            ('job_type', '=', job_type),
+            ('state', 'in', ('pending', 'running')),
+        ], limit=1)
+        if not job:
+            job = self.create({
+                'name': f"{dict(self._fields['job_type'].selection)[job_type]}: {inventory.name}",
+                'inventory_id': inventory.id,
+                'job_type': job_type,
+            })
+        self._trigger_runner()
+        return job
+    
+    @api.model
+    def _trigger_runner(self):
+        """Run the job runner as soon as possible instead of waiting for its next call"""
+        cron = self.env.ref('odoo_inventory_connector.ir_cron_inventory_connector_jobs', raise_if_not_found=False)
+        if cron:
+            cron._trigger()
+    
+    @api.model
+    def _recover_stale_jobs(self):
+        """Requeue the running jobs whose worker died, fail them after MAX_JOB_INTERRUPTIONS"""
+        self.flush_model(['state', 'inventory_id'])
+        self.env['inventory.connector.inventory'].flush_model(['sync_lease_owner', 'sync_lease_until'])
+        self.env.cr.execute("""
+            SELECT job.id
+              FROM inventory_connector_sync_job job
+              JOIN inventory_connector_inventory inventory ON inventory.id = job.inventory_id
+             WHERE job.state = 'running'
+               AND (inventory.sync_lease_until IS NULL
+                    OR inventory.sync_lease_until < (now() at time zone 'UTC')
+                    OR inventory.sync_lease_owner NOT LIKE 'job:' || job.id || ':%')
+               FOR UPDATE OF job SKIP LOCKED
+        """)
+        jobs = self.browse([row[0] for row in self.env.cr.fetchall()])
+        for job in jobs:
+            interrupted_count = job.interrupted_count + 1
+            if interrupted_count > MAX_JOB_INTERRUPTIONS:
+                _logger.error("Inventory job %s was interrupted %s times, giving up", job.id, interrupted_count)
+                job.write({
+                    'state': 'failed',
+                    'finished_at': fields.Datetime.now(),
+                    'eta': False,
+                    'interrupted_count': interrupted_count,
+                    'result_message': _('The job was interrupted %s times before it could finish') % interrupted_count,
+                })
+            else:
+                _logger.warning("Inventory job %s lost its worker, requeued", job.id)
+                job.write({'state': 'pending', 'interrupted_count': interrupted_count})
+        return jobs
+    
+    def _report_progress(self, pages_done, items_done):
+        """Store progress from a separate cursor so it is visible while the job transaction is open"""
+        self.ensure_one()
+        now = fields.Datetime.now()
+        elapsed = (now - self.started_at).total_seconds() if self.started_at else 0
+        rate = items_done / elapsed if elapsed > 0 else 0.0
+        total = self.total_items
+        progress = min(100.0, items_done * 100.0 / total) if total else 0.0
+        eta = now + timedelta(seconds=(total - items_done) / rate) if rate and total > items_done else None
+        
+        with self.pool.cursor() as cr:
+            cr.execute("""
+                UPDATE inventory_connector_sync_job
+                   SET pages_done = %s, items_done = %s, progress = %s, items_per_second = %s, eta = %s
+                 WHERE id = %s
+            """, (pages_done, items_done, progress, rate, eta, self.id))
+    
+    def _run(self, lease_minutes, deadline=None):
+        """Run one chunk of this pending job and commit its progress; return False if the inventory is busy"""
+        self.ensure_one()
+        inventory = self.inventory_id
+        owner = f"job:{self.id}:{uuid.uuid4().hex[:8]}"
+        
+        # Commits the lease; the job stays pending when another run holds it
+        if not inventory._acquire_sync_lease(owner, lease_minutes):
+            return False
+        
+        try:
+            values = {'state': 'running'}
+            if not self.started_at:
+                values.update(started_at=fields.Datetime.now(), total_items=inventory.item_count)
+            self.write(values)
+            self.env.cr.commit()
+            counts = None
+            if self.job_type in ('sync', 'full') and not self.metadata_done:
+                inventory.action_sync_inventory()
+                self.write({'total_items': inventory.item_count, 'metadata_done': True})
+                self.env.cr.commit()
+            if self.job_type in ('import', 'full'):
+                counts = inventory._import_items(progress_callback=self._report_progress, deadline=deadline)
+                if inventory.import_resume_page:
+                    # Out of time: the committed checkpoint is where the next chunk starts
+                    self.write({'state': 'pending'})
+                    self.env.cr.commit()
+                    self._trigger_runner()
+                    return True
+            
+            values = {
+                'state': 'done',
+                'finished_at': fields.Datetime.now(),
+                'progress': 100.0,
+                'eta': False,
+                'result_message': _('Metadata synchronized'),
+            }
+            if counts is not None:
+                values['items_done'] = sum(counts.values())
+                values['result_message'] = _('%s items imported, %s items updated, %s unchanged items skipped') % (
+                    counts['imported'], counts['updated'], counts['skipped'])
+            self.write(values)
+            self.env.cr.commit()
+            return True
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.error("Inventory job %s failed: %s", self.id, str(e))
+            self.write({
+                'state': 'failed',
+                'finished_at': fields.Datetime.now(),
+                'eta': False,
+                'result_message': str(e),
+            })
+            self.env.cr.commit()
+            return True
+        finally:
+            inventory._release_sync_lease(owner)
+    
+    @api.model
+    def _cron_run_jobs(self):
+        """Scheduled action: run pending jobs one after the other within the scheduler time budget"""
+        settings = self.env['inventory.connector.inventory']._get_scheduler_settings()
+        deadline = time.monotonic() + settings['time_budget']
+        busy_ids = []
+        self._recover_stale_jobs()
+        self.env.cr.commit()
+        
+        while time.monotonic() < deadline:
+            self.env.cr.execute("""
+                SELECT id
+                  FROM inventory_connector_sync_job
+                 WHERE state = 'pending' AND NOT (id = ANY(%s))
+              ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """, (busy_ids,))
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            if not job._run(settings['lease_minutes'], deadline):
+                # Inventory leased by another worker, retry on a later run
+                busy_ids.append(job.id)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models
+import logging
+
+from ..tools.sync_metrics import PHASES
+
+_logger = logging.getLogger(__name__)
+
+PHASE_SELECTION = [
+    ('info', 'Inventory Info'),
+    ('aggregated', 'Aggregated Data'),
+    ('items', 'Items'),
+    ('tags', 'Tags'),
+    ('field_values', 'Field Values'),
+]
+
+class InventoryConnectorSyncRun(models.Model):
+    _name = 'inventory.connector.sync.run'
+    _description = 'Inventory Synchronization Run'
+    _order = 'id desc'
+
+    name = fields.Char('Description', required=True)
+    inventory_id = fields.Many2one('inventory.connector.inventory', string='Inventory', required=True, ondelete='cascade', index=True)
+    run_type = fields.Selection([
+        ('sync', 'Synchronize Metadata'),
+        ('import', 'Import Items'),
+    ], string='Run Type', required=True)
+    state = fields.Selection([
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', required=True, default='done')
+    started_at = fields.Datetime('Started At', readonly=True)
+    duration = fields.Float('Duration (s)', digits=(16, 3), readonly=True)
+    error = fields.Text('Error', readonly=True)
+    phase_ids = fields.One2many('inventory.connector.sync.run.phase', 'run_id', string='Phases', readonly=True)
+    
+    # Totals over all phases
+    total_queries = fields.Integer('SQL Queries', compute='_compute_totals', store=True)
+    total_http_requests = fields.Integer('HTTP Requests', compute='_compute_totals', store=True)
+    total_http_bytes = fields.Integer('HTTP Bytes', compute='_compute_totals', store=True)
+    items_processed = fields.Integer('Items Processed', compute='_compute_totals', store=True)
+    items_per_second = fields.Float('Items / Second', digits=(16, 1), compute='_compute_totals', store=True)
+    
+    @api.depends('duration', 'phase_ids.query_count', 'phase_ids.http_requests', 'phase_ids.http_bytes',
+                 'phase_ids.rows_created', 'phase_ids.rows_updated', 'phase_ids.rows_skipped')
+    def _compute_totals(self):
+        for run in self:
+            phases = run.phase_ids
+            run.total_queries = sum(phases.mapped('query_count'))
+            run.total_http_requests = sum(phases.mapped('http_requests'))
+            run.total_http_bytes = sum(phases.mapped('http_bytes'))
+            items = phases.filtered(lambda phase: phase.phase == 'items')
+            run.items_processed = sum(items.mapped('rows_processed'))
+            run.items_per_second = run.items_processed / run.duration if run.duration else 0.0
+    
+    @api.model
+    def _prepare_values(self, inventory, run_type, started_at, metrics, state='done', error=None):
+        """Build the create values of a run from a SyncMetrics collector"""
+        run_label = dict(self._fields['run_type'].selection)[run_type]
+        return {
+            'name': f"{run_label}: {inventory.name}",
+            'inventory_id': inventory.id,
+            'run_type': run_type,
+            'state': state,
+            'started_at': started_at,
+            'duration': metrics.duration,
+            'error': error,
+            'phase_ids': [
+                (0, 0, dict(metrics.phases[phase].as_dict(), phase=phase))
+                for phase in PHASES if phase in metrics.phases
+            ],
+        }
+    
+    @api.model
+    def _store(self, inventory, run_type, started_at, metrics):
+        """Record a successful run in the current transaction"""
+        run = self.sudo().create(self._prepare_values(inventory, run_type, started_at, metrics))
+        _logger.info("%s done in %.1fs (%s queries, %s HTTP requests)",
+                     run.name, run.duration, run.total_queries, run.total_http_requests)
+        return run
+    
+    @api.model
+    def _store_failed(self, inventory, run_type, started_at, metrics, error):
+        """Record a failed run from a separate cursor, so it survives the rollback of the failing transaction"""
+        try:
+            values = self._prepare_values(inventory, run_type, started_at, metrics, state='failed', error=error)
+            with self.pool.cursor() as cr:
+                self.with_env(self.env(cr=cr)).sudo().create(values)
+        except Exception as e:
+            # Never hide the original error behind a bookkeeping failure
+            _logger.warning("Could not record failed %s run of inventory %s: %s", run_type, inventory.id, str(e))
+
+
+class InventoryConnectorSyncRunPhase(models.Model):
+    _name = 'inventory.connector.sync.run.phase'
+    _description = 'Inventory Synchronization Run Phase'
+    _order = 'run_id desc, id'
+
+    run_id = fields.Many2one('inventory.connector.sync.run', string='Run', required=True, ondelete='cascade', index=True)
+    inventory_id = fields.Many2one(related='run_id.inventory_id', store=True, string='Inventory')
+    run_type = fields.Selection(related='run_id.run_type', store=True, string='Run Type')
+    started_at = fields.Datetime(related='run_id.started_at', store=True, string='Started At')
+    phase = fields.Selection(PHASE_SELECTION, string='Phase', required=True)
+    
+    wall_time = fields.Float('Wall Time (s)', digits=(16, 3))
+    http_time = fields.Float('HTTP Latency (s)', digits=(16, 3))
+    http_requests = fields.Integer('HTTP Requests')
+    http_bytes = fields.Integer('HTTP Bytes')
+    rows_created = fields.Integer('Rows Created')
+    rows_updated = fields.Integer('Rows Updated')
+    rows_skipped = fields.Integer('Rows Skipped')
+    rows_processed = fields.Integer('Rows Processed', compute='_compute_throughput', store=True)
+    rows_per_second = fields.Float('Rows / Second', digits=(16, 1), compute='_compute_throughput', store=True, aggregator='avg')
+    query_count = fields.Integer('SQL Queries')
+    
+    @api.depends('wall_time', 'rows_created', 'rows_updated', 'rows_skipped')
+    def _compute_throughput(self):
+        for phase in self:
+            phase.rows_processed = phase.rows_created + phase.rows_updated + phase.rows_skipped
+            phase.rows_per_second = phase.rows_processed / phase.wall_time if phase.wall_time else 0.0
@@ -12,13 +12,47 @@ class Tag(models.Model):
     
     # Items with this tag
     item_ids = fields.Many2many('inventory.connector.item', string='Items')
-    item_count = fields.Integer(compute='_compute_item_count', string='Item Count')
+    # Stored so tag lists can sort on it; the bulk tag import adjusts it in SQL, see _bulk_add_item_counts
+    item_count = fields.Integer(compute='_compute_item_count', string='Item Count', store=True)
     
     _sql_constraints = [
         ('inventory_name_unique', 'UNIQUE(inventory_id, name)', 'Tag names must be unique per inventory')
     ]
     
-    @api.depends('item_ids')
+    def _read_item_counts(self):
+        """Return {tag id: number of active items} for the tags in self"""
+        tag_ids = [tag_id for tag_id in self.ids if isinstance(tag_id, int)]
+        if not tag_ids:
+            return {}
+        field = self._fields['item_ids']
+        self.flush_model(['item_ids'])
+        self.env['inventory.connector.item'].flush_model(['active'])
+        self.env.cr.execute(f"""
+            SELECT rel.{field.column1}, COUNT(*)
+              FROM {field.relation} rel
+              JOIN inventory_connector_item item ON item.id = rel.{field.column2}
+             WHERE rel.{field.column1} = ANY(%s) AND item.active
+          GROUP BY rel.{field.column1}
+        """, (tag_ids,))
+        return dict(self.env.cr.fetchall())
+    
+    @api.depends('item_ids', 'item_ids.active')
     def _compute_item_count(self):
+        counts = self._read_item_counts()
         for tag in self:
-            tag.item_count = len(tag.item_ids)
\ No newline at end of file
+            tag.item_count = counts.get(tag.id, 0)
+    
+    @api.model
+    def _bulk_add_item_counts(self, deltas):
+        """Adjust the stored item counts by {tag id: delta} with one UPDATE"""
+        deltas = [(tag_id, delta) for tag_id, delta in deltas.items() if delta]
+        if not deltas:
+            return
+        placeholders = ', '.join(['(%s, %s)'] * len(deltas))
+        self.env.cr.execute(f"""
+            UPDATE inventory_connector_tag AS tag
+               SET item_count = tag.item_count + data.delta
+              FROM (VALUES {placeholders}) AS data(id, delta)
+             WHERE tag.id = data.id
+        """, [value for pair in deltas for value in pair])
+        self.invalidate_model(['item_count'])
\ No newline at end of file
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Text search configuration of the full-text fallback, language neutral
+TEXT_SEARCH_CONFIG = 'simple'
+
+class InventoryConnectorInventory(models.Model):
+    _inherit = 'inventory.connector.inventory'
+    
+    def action_view_items(self):
+        """Open the items of this inventory, with the text value search restricted to it"""
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Items of %s') % self.name,
+            'res_model': 'inventory.connector.item',
+            'view_mode': 'list,form',
+            'domain': [('inventory_id', '=', self.id)],
+            'context': {'default_inventory_id': self.id, 'search_inventory_ids': [self.id]},
+        }
+
+
+class FieldValue(models.Model):
+    _inherit = 'inventory.connector.field.value'
+    
+    def init(self):
+        super().init()
+        # Partial index over the searchable values only, matched by the
+        # field_type condition of Item._items_by_text_query
+        if self.env.registry.has_trigram:
+            self.env.cr.execute("""
+                CREATE INDEX IF NOT EXISTS inventory_connector_field_value_text_trgm_idx
+                    ON inventory_connector_field_value USING GIN (text_value gin_trgm_ops)
+                 WHERE field_type IN ('text', 'multiline')
+            """)
+        else:
+            _logger.info("pg_trgm is not installed, text values are indexed for full-text search instead")
+            self.env.cr.execute(f"""
+                CREATE INDEX IF NOT EXISTS inventory_connector_field_value_text_tsv_idx
+                    ON inventory_connector_field_value USING GIN (to_tsvector('{TEXT_SEARCH_CONFIG}', text_value))
+                 WHERE field_type IN ('text', 'multiline')
+            """)
+
+
+class Item(models.Model):
+    _inherit = 'inventory.connector.item'
+    
+    value_search = fields.Char('Text Values', compute='_compute_value_search', search='_search_value_search',
+        help="Search the text and multiline custom field values of the items")
+    
+    def init(self):
+        super().init()
+        # Compact storage: the same search over the string values of custom_values
+        if self.env.registry.has_trigram:
+            self.env.cr.execute("""
+                CREATE INDEX IF NOT EXISTS inventory_connector_item_custom_values_trgm_idx
+                    ON inventory_connector_item USING GIN ((custom_values::text) gin_trgm_ops)
+            """)
+        else:
+            self.env.cr.execute(f"""
+                CREATE INDEX IF NOT EXISTS inventory_connector_item_custom_values_tsv_idx
+                    ON inventory_connector_item USING GIN (jsonb_to_tsvector('{TEXT_SEARCH_CONFIG}', custom_values, '["string"]'))
+            """)
+    
+    def _compute_value_search(self):
+        for item in self:
+            item.value_search = False
+    
+    @api.model
+    def _items_by_text_query(self, term, inventory_ids=None):
+        """Return (query, params) selecting the ids of the items with a text value containing term"""
+        term = (term or '').strip()
+        if not term:
+            return None, []
+        self.env['inventory.connector.field.value'].flush_model(['item_id', 'field_type', 'text_value'])
+        self.flush_model(['inventory_id', 'custom_values'])
+        
+        if self.env.registry.has_trigram:
+            pattern = '%' + term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            row_match, row_params = "v.text_value ILIKE %s", [pattern]
+            # The index narrows down on the whole document, keys included; the
+            # string values are checked afterwards
+            json_match = """i.custom_values::text ILIKE %s AND EXISTS (
+                                SELECT 1 FROM jsonb_each(i.custom_values) e
+                                 WHERE jsonb_typeof(e.value) = 'string' AND e.value #>> '{}' ILIKE %s)"""
+            json_params = [pattern, pattern]
+        else:
+            row_match = f"to_tsvector('{TEXT_SEARCH_CONFIG}', v.text_value) @@ plainto_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+            row_params = [term]
+            json_match = (f"jsonb_to_tsvector('{TEXT_SEARCH_CONFIG}', i.custom_values, '[\"string\"]') "
+                          f"@@ plainto_tsquery('{TEXT_SEARCH_CONFIG}', %s)")
+            json_params = [term]
+        
+        scope, scope_params = "", []
+        if inventory_ids:
+            scope, scope_params = "AND i.inventory_id = ANY(%s)", [list(inventory_ids)]
+        query = f"""
+            SELECT v.item_id
+              FROM inventory_connector_field_value v
+              JOIN inventory_connector_item i ON i.id = v.item_id
+             WHERE v.field_type IN ('text', 'multiline') AND {row_match} {scope}
+             UNION
+            SELECT i.id
+              FROM inventory_connector_item i
+             WHERE i.custom_values IS NOT NULL AND {json_match} {scope}
+        """
+        return query, row_params + scope_params + json_params + scope_params
+    
+    def _search_value_search(self, operator, value):
+        if operator not in ('ilike', 'not ilike', 'like', 'not like', '='):
+            raise UserError(_("Unsupported operator %s for the text value search") % operator)
+        # Set by Inventory.action_view_items, narrows the index scans to one inventory
+        inventory_ids = self.env.context.get('search_inventory_ids')
+        query, params = self._items_by_text_query(value, inventory_ids)
+        domain_operator = 'not in' if operator.startswith('not') else 'in'
+        if query is None:
+            return [('id', domain_operator, [])]
+        # A subquery keeps the matching ids in the database instead of the domain
+        return [('id', domain_operator, SQL(f"({query})", *params))]
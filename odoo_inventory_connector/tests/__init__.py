@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from . import test_field_filter
+from . import test_import
+from . import test_import_wizard
+from . import test_incremental_sync
+from . import test_reconcile
+from . import test_sync_job
+from . import test_value_storage
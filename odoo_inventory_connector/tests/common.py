@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase
+
+from odoo.addons.odoo_inventory_connector.benchmarks.fake_inventory_api import FakeInventoryApi, SyntheticInventory
+
+TOKEN = 'test-token'
+
+
+class InventoryConnectorCase(TransactionCase):
+    """Inventory synced from the fake API of the benchmarks"""
+
+    item_count = 23
+
+    def setUp(self):
+        super().setUp()
+        self.synthetic = SyntheticInventory(self.item_count, tag_count=5)
+        self.api = FakeInventoryApi(self.synthetic, token=TOKEN, conditional=True).start()
+        self.addCleanup(self.api.stop)
+        # Checkpointed imports commit, which would end the test transaction
+        self.patch(type(self.env.cr), 'commit', lambda cr: None)
+        self.inventory = self._create_inventory()
+
+    def _create_inventory(self, **values):
+        return self.env['inventory.connector.inventory'].create(dict({
+            'name': 'Test Inventory',
+            'api_url': self.api.url,
+            'api_token': TOKEN,
+            'import_mode': 'paged',
+            'import_page_size': 5,
+            'auto_sync': False,
+        }, **values))
+
+    def _sync(self):
+        """Sync the inventory information then import the items, return the import counts"""
+        self.inventory.action_sync_inventory()
+        return self.inventory._import_items()
+
+    def _items_by_external_id(self):
+        items = self.inventory.with_context(active_test=False).item_ids
+        return {item.external_id: item for item in items}
+
+    def _stored_values(self):
+        """Return the sorted (external id, active, field name, field type, text, numeric, boolean) values"""
+        query, params = self.env['inventory.connector.field.value']._values_query(self.inventory)
+        self.env.cr.execute(f"""
+            SELECT i.external_id, v.active, v.field_name, v.field_type,
+                   v.text_value, v.numeric_value, v.boolean_value
+              FROM ({query}) v
+              JOIN inventory_connector_item i ON i.id = v.item_id
+        """, params)
+        return sorted(self.env.cr.fetchall(), key=lambda row: tuple('' if value is None else str(value) for value in row))
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestFieldFilter(InventoryConnectorCase):
+
+    def test_contains_matches_literally(self):
+        self._sync()
+        self.assertEqual(len(self.inventory._search_items_by_field('Text 1', ':', 'VALUE')), 23)
+        # Wildcards typed by the user match only themselves
+        for value in ('%', '_', 'value_', '\\'):
+            self.assertEqual(self.inventory._search_items_by_field('Text 1', ':', value), [], value)
+
+        item = self.inventory.item_ids[:1]
+        self.env['inventory.connector.field.value']._bulk_replace_values(
+            item.ids, [(item.id, 'Text 1', 'text', '100% cotton_blend', None, None)])
+        self.assertEqual(self.inventory._search_items_by_field('Text 1', ':', '0% cotton_b'), item.ids)
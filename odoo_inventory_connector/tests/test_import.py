@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import time
+
+from odoo.tests import tagged
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestImport(InventoryConnectorCase):
+
+    def _assert_payload_values(self, external_ids):
+        values = {(row[0], row[2]): row for row in self._stored_values()}
+        for external_id in external_ids:
+            payload = self.synthetic.item(int(external_id))
+            for name, value in payload['customFields'].items():
+                _external_id, _active, _name, field_type, text_value, numeric_value, boolean_value = values[external_id, name]
+                if field_type == 'numeric':
+                    self.assertAlmostEqual(numeric_value, value)
+                elif field_type == 'boolean':
+                    self.assertEqual(boolean_value, value)
+                else:
+                    self.assertEqual(text_value, value)
+
+    def _assert_tag_counts(self):
+        for tag in self.inventory.tag_ids:
+            self.assertEqual(tag.item_count, len(tag.item_ids.filtered('active')), tag.name)
+
+    def test_bulk_import(self):
+        counts = self._sync()
+        self.assertEqual(counts, {'imported': 23, 'updated': 0, 'skipped': 0})
+        items = self._items_by_external_id()
+        self.assertEqual(set(items), {str(index) for index in range(1, 24)})
+        for external_id, item in items.items():
+            payload = self.synthetic.item(int(external_id))
+            self.assertEqual(item.name, payload['name'])
+            self.assertEqual(sorted(item.tag_ids.mapped('name')), payload['tags'])
+        self._assert_payload_values(items)
+        self._assert_tag_counts()
+
+    def test_reimport_unchanged_items(self):
+        self._sync()
+        FieldValue = self.env['inventory.connector.field.value']
+        value_ids = FieldValue.search([('item_id.inventory_id', '=', self.inventory.id)]).ids
+        values = self._stored_values()
+
+        counts = self.inventory._import_items()
+        self.assertEqual(counts, {'imported': 0, 'updated': 0, 'skipped': 23})
+        # Unchanged content hashes: the value rows are not rewritten
+        self.assertEqual(FieldValue.search([('item_id.inventory_id', '=', self.inventory.id)]).ids, value_ids)
+        self.assertEqual(self._stored_values(), values)
+
+        self.synthetic.touch([4])
+        counts = self.inventory._import_items()
+        self.assertEqual(counts, {'imported': 0, 'updated': 1, 'skipped': 22})
+        self.assertEqual(self._items_by_external_id()['4'].name, 'Item 4 (edited)')
+        self.assertEqual(self._stored_values(), values)
+
+    def test_bulk_replace_tags(self):
+        self._sync()
+        items = self._items_by_external_id()
+        Tag = self.env['inventory.connector.tag']
+        red, green = Tag.create([{'name': name, 'inventory_id': self.inventory.id} for name in ('red', 'green')])
+        items['1'].active = False
+
+        Item = self.env['inventory.connector.item']
+        Item._bulk_replace_tags({items['1'].id: [red.id], items['2'].id: [red.id, green.id], items['3'].id: []})
+        self.assertEqual(items['1'].tag_ids, red)
+        self.assertEqual(items['2'].tag_ids, red | green)
+        self.assertFalse(items['3'].tag_ids)
+        # Archived items are not counted
+        self.assertEqual((red.item_count, green.item_count), (1, 1))
+        self._assert_tag_counts()
+
+        items['1'].active = True
+        self.assertEqual(red.item_count, 2)
+
+    def test_bulk_replace_values(self):
+        self._sync()
+        items = self._items_by_external_id()
+        item = items['5']
+        FieldValue = self.env['inventory.connector.field.value']
+        previous = sorted(
+            (value.item_id.id, value.field_name, value.field_type, value.text_value or None,
+             value.numeric_value if value.field_type == 'numeric' else None,
+             value.boolean_value if value.field_type == 'boolean' else None)
+            for value in item.field_value_ids
+        )
+
+        removed = FieldValue._bulk_replace_values([item.id], [(item.id, 'Text 1', 'text', 'new', None, None)],
+                                                  return_removed=True)
+        self.assertEqual(sorted(removed), previous)
+        item.invalidate_recordset(['field_value_ids'])
+        self.assertEqual(item.field_value_ids.mapped('field_name'), ['Text 1'])
+        self.assertEqual(item.field_value_ids.display_value, 'new')
+        # The other items keep their values
+        self._assert_payload_values([external_id for external_id in items if external_id != '5'])
+
+    def test_checkpoint_resume(self):
+        self.inventory.checkpoint_import = True
+        self.inventory.action_sync_inventory()
+
+        # An expired deadline stops the import after the first page
+        counts = self.inventory._import_items(deadline=time.monotonic())
+        self.assertEqual(counts, {'imported': 5, 'updated': 0, 'skipped': 0})
+        self.assertEqual(self.inventory.import_resume_page, 1)
+        self.assertEqual(self.inventory.import_resume_external_id, '5')
+        self.assertEqual(set(self._items_by_external_id()), {str(index) for index in range(1, 6)})
+
+        counts = self.inventory._import_items()
+        self.assertEqual(counts, {'imported': 23, 'updated': 0, 'skipped': 0})
+        self.assertEqual(self.inventory.import_resume_page, 0)
+        self.assertFalse(self.inventory.import_resume_state)
+        self.assertEqual(len(self._items_by_external_id()), 23)
+        self._assert_payload_values(self._items_by_external_id())
+        self._assert_tag_counts()
+
+    def test_checkpoint_dropped_after_settings_change(self):
+        self.inventory.checkpoint_import = True
+        self.inventory.action_sync_inventory()
+        self.inventory._import_items(deadline=time.monotonic())
+
+        self.inventory.import_page_size = 10
+        counts = self.inventory._import_items()
+        # The page cursor no longer matches: the import starts over
+        self.assertEqual(counts, {'imported': 18, 'updated': 0, 'skipped': 5})
+        self.assertEqual(self.inventory.import_resume_page, 0)
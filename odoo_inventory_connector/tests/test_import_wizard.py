@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from datetime import datetime
+
+from odoo.tests import tagged
+
+from odoo.addons.odoo_inventory_connector.benchmarks.fake_inventory_api import API_PREFIX
+
+from .common import TOKEN, InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestImportWizard(InventoryConnectorCase):
+
+    def test_import_inventory(self):
+        self.inventory.unlink()
+        wizard = self.env['inventory.connector.import.wizard'].create({
+            'api_token': TOKEN,
+            'api_url': f"{self.api.url}{API_PREFIX}",
+        })
+        action = wizard.action_import_inventory()
+        inventory = self.env['inventory.connector.inventory'].browse(action['res_id'])
+        self.assertEqual(inventory.name, 'Benchmark Inventory')
+        self.assertEqual(inventory.category, 'Benchmark')
+        self.assertTrue(inventory.is_public)
+        self.assertEqual(inventory.updated_at, datetime(2025, 9, 1, 12, 0, 0))
+        self.assertTrue(self.env['inventory.connector.sync.job'].search([('inventory_id', '=', inventory.id)]))
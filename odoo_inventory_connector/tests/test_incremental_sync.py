@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+import json
+from unittest.mock import patch
+
+from odoo.tests import tagged
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestIncrementalSync(InventoryConnectorCase):
+
+    def setUp(self):
+        super().setUp()
+        self.inventory.incremental_sync = True
+
+    def test_item_edit_without_inventory_update(self):
+        counts = self._sync()
+        self.assertEqual(counts['imported'], 23)
+        updated_at = self.inventory.updated_at
+        watermark = self.inventory.items_watermark
+
+        # The backend moves the item updatedAt only, as ItemService does
+        self.synthetic.touch([3])
+        counts = self._sync()
+        self.assertEqual(self.inventory.updated_at, updated_at)
+        self.assertEqual(counts['updated'], 1)
+        self.assertGreater(self.inventory.items_watermark, watermark)
+        item = self.inventory.item_ids.filtered(lambda item: item.external_id == '3')
+        self.assertEqual(item.name, 'Item 3 (edited)')
+
+    def test_unchanged_items(self):
+        self._sync()
+        counts = self._sync()
+        self.assertEqual((counts['imported'], counts['updated']), (0, 0))
+        self.assertGreater(self.api.stats['not_modified'], 0)
+
+    def test_validators_kept_after_success_only(self):
+        Inventory = type(self.inventory)
+        with patch.object(Inventory, '_process_custom_fields', side_effect=ValueError("broken payload")):
+            # The sync carries on with the basic information
+            self.inventory.action_sync_inventory()
+        self.assertNotIn('aggregated', json.loads(self.inventory.http_validators or '{}'))
+        self.assertFalse(self.inventory.field_definition_ids)
+
+        not_modified = self.api.stats['not_modified']
+        self.inventory.action_sync_inventory()
+        self.assertIn('aggregated', json.loads(self.inventory.http_validators))
+        self.assertTrue(self.inventory.field_definition_ids)
+        # Only /info could answer 304
+        self.assertLessEqual(self.api.stats['not_modified'], not_modified + 1)
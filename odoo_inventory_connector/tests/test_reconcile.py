@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from odoo.addons.odoo_inventory_connector.tools import payload_normalizer
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestReconcile(InventoryConnectorCase):
+
+    def _custom_fields(self):
+        return self.synthetic.aggregated()['customFields']
+
+    def test_unchanged_schema(self):
+        self.inventory.action_sync_inventory()
+        definition_ids = self.inventory.field_definition_ids.ids
+        self.assertEqual(len(definition_ids), 6)
+
+        counts = self.inventory._process_custom_fields(payload_normalizer.CUSTOM_FIELD.normalize_all(self._custom_fields()))
+        self.assertEqual(counts, (0, 0, 6))
+        self.inventory.action_sync_inventory()
+        self.assertEqual(self.inventory.field_definition_ids.ids, definition_ids)
+
+    def test_changed_schema(self):
+        self.inventory.action_sync_inventory()
+        definitions = {definition.name: definition for definition in self.inventory.field_definition_ids}
+
+        custom_fields = [field for field in self._custom_fields() if field['name'] != 'Flag 2']
+        custom_fields[0] = dict(custom_fields[0], description='Renamed')
+        custom_fields.append({'name': 'Text 3', 'type': 'text', 'description': '', 'showInTable': False})
+        counts = self.inventory._process_custom_fields(payload_normalizer.CUSTOM_FIELD.normalize_all(custom_fields))
+        self.assertEqual(counts, (1, 1, 4))
+
+        self.assertFalse(definitions['Flag 2'].exists())
+        self.assertEqual(definitions['Text 1'].description, 'Renamed')
+        by_name = {definition.name: definition for definition in self.inventory.field_definition_ids}
+        self.assertEqual(by_name['Text 1'], definitions['Text 1'])
+        self.assertEqual(by_name['Text 3'].sequence, 6)
+        self.assertFalse(by_name['Text 3'].show_in_table)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestSyncJob(InventoryConnectorCase):
+
+    def test_busy_inventory_leaves_job_pending(self):
+        job = self.env['inventory.connector.sync.job']._enqueue(self.inventory, 'sync')
+        self.assertTrue(self.inventory._acquire_sync_lease('manual', 5))
+
+        self.assertFalse(job._run(5))
+        self.assertEqual(job.state, 'pending')
+        self.assertFalse(job.started_at)
+        # A pending job is not mistaken for one that lost its worker
+        self.assertFalse(job._recover_stale_jobs())
+        self.assertEqual(job.interrupted_count, 0)
+
+        self.inventory._release_sync_lease('manual')
+        self.assertTrue(job._run(5))
+        self.assertEqual(job.state, 'done')
+        self.assertTrue(job.started_at)
+        self.assertTrue(job.metadata_done)
+        self.assertFalse(self.inventory.sync_lease_owner)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import tagged
+
+from .common import InventoryConnectorCase
+
+
+@tagged('post_install', '-at_install')
+class TestValueStorage(InventoryConnectorCase):
+
+    def test_values_query_parity(self):
+        self._sync()
+        self.inventory.item_ids[:2].active = False
+        values = self._stored_values()
+        self.assertTrue(values)
+
+        self.inventory.write({'value_storage': 'jsonb'})
+        self.assertEqual(self._stored_values(), values)
+        FieldValue = self.env['inventory.connector.field.value']
+        self.assertFalse(FieldValue.search_count([('item_id.inventory_id', '=', self.inventory.id)]))
+
+        self.inventory.write({'value_storage': 'rows'})
+        self.assertEqual(self._stored_values(), values)
+        items = self.inventory.with_context(active_test=False).item_ids
+        self.assertFalse(any(items.mapped('custom_values')))
+
+    def test_jsonb_import(self):
+        self.inventory.value_storage = 'jsonb'
+        self._sync()
+        jsonb_values = self._stored_values()
+
+        inventory = self.inventory
+        self.inventory = self._create_inventory(name='Rows Inventory')
+        self._sync()
+        # Same payload, same values; only the item ids differ and they are not compared
+        self.assertEqual(self._stored_values(), jsonb_values)
+        self.assertFalse(self.env['inventory.connector.field.value'].search_count([('item_id.inventory_id', '=', inventory.id)]))
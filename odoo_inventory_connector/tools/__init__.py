@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+
+from . import json_stream
+from . import field_mapper
+from . import http_client
+from . import page_pipeline
+from . import sync_metrics
+from . import streaming_aggregates
+from . import payload_normalizer
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Positional value slots sent by the API next to the customFields dict:
+# (field type, payload key prefix, label used when no definition is left)
+VALUE_SLOTS = (
+    ('text', 'textField', 'Text Field'),
+    ('numeric', 'numericField', 'Numeric Field'),
+    ('boolean', 'booleanField', 'Boolean Field'),
+)
+SLOT_COUNT = 3
+
+
+def _to_text(value):
+    return (str(value), None, None)
+
+
+def _to_numeric(value):
+    return (None, float(value), None)
+
+
+def _to_boolean(value):
+    return (None, None, bool(value))
+
+
+COERCERS = {
+    'numeric': _to_numeric,
+    'boolean': _to_boolean,
+}
+
+
+class FieldMapper(object):
+    """Turn normalized items into typed field values with the field definitions compiled once per sync"""
+
+    __slots__ = ('fields_by_name', 'slot_queues', 'slot_keys', '_unknown_fields')
+
+    def __init__(self, definitions):
+        self.fields_by_name = {}
+        self.slot_queues = {field_type: [] for field_type, _prefix, _label in VALUE_SLOTS}
+        for name, field_type in definitions:
+            if name in self.fields_by_name:
+                continue
+            self.fields_by_name[name] = (field_type, COERCERS.get(field_type, _to_text))
+            if field_type in self.slot_queues:
+                self.slot_queues[field_type].append(name)
+        # (normalized item attribute, fallback name) per slot
+        self.slot_keys = tuple(
+            (field_type, [(f"{field_type}_field{i}_value", f"{label} {i}")
+                          for i in range(1, SLOT_COUNT + 1)])
+            for field_type, _prefix, label in VALUE_SLOTS
+        )
+        self._unknown_fields = set()
+
+    def map_record(self, item):
+        """Return the (field_name, field_type, text_value, numeric_value, boolean_value) values of an Item record"""
+        rows = []
+        processed = set()
+        fields_by_name = self.fields_by_name
+
+        custom_fields = item.custom_fields
+        if custom_fields:
+            for field_name, field_value in custom_fields.items():
+                # Skip empty values
+                if field_value is None or field_value == '':
+                    continue
+                field = fields_by_name.get(field_name)
+                if field is None:
+                    if field_name not in self._unknown_fields:
+                        self._unknown_fields.add(field_name)
+                        _logger.warning("No field definition found for field '%s'", field_name)
+                    continue
+                field_type, coerce = field
+                rows.append((field_name, field_type) + coerce(field_value))
+                processed.add(field_name)
+
+        # Each filled slot takes the next definition of its type that has
+        # not been filled yet, falling back to a generic name
+        for field_type, keys in self.slot_keys:
+            queue = self.slot_queues[field_type]
+            position = 0
+            coerce = COERCERS.get(field_type, _to_text)
+            for attribute, default_name in keys:
+                value = getattr(item, attribute, None)
+                if value is None:
+                    continue
+                while position < len(queue) and queue[position] in processed:
+                    position += 1
+                if position < len(queue):
+                    field_name = queue[position]
+                    processed.add(field_name)
+                else:
+                    field_name = default_name
+                rows.append((field_name, field_type) + coerce(value))
+
+        return rows
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Defaults, overridable with system parameters (Settings > Technical > System Parameters)
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10
+
+PARAM_POOL_SIZE = 'inventory_connector.http_pool_size'
+PARAM_CONNECT_TIMEOUT = 'inventory_connector.http_connect_timeout'
+PARAM_READ_TIMEOUT = 'inventory_connector.http_read_timeout'
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _base_url(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url, pool_size=DEFAULT_POOL_SIZE):
+    """Return the shared keep-alive session for the scheme and host of url; it accepts no cookies"""
+    key = (_base_url(url), pool_size)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sessions[key] = session
+    return session
+
+
+def get_options(env):
+    """Read the pool size and timeouts from the system parameters"""
+    params = env['ir.config_parameter'].sudo()
+    read_timeout = params.get_param(PARAM_READ_TIMEOUT)
+    return {
+        'pool_size': int(params.get_param(PARAM_POOL_SIZE, DEFAULT_POOL_SIZE)),
+        'connect_timeout': float(params.get_param(PARAM_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)),
+        'read_timeout': float(read_timeout) if read_timeout else None,
+    }
+
+
+def get(env, url, timeout=30, **kwargs):
+    """GET url through the pooled session for its host, timeout being the read timeout"""
+    return fetch(url, get_options(env), timeout=timeout, **kwargs)
+
+
+def fetch(url, options, timeout=30, **kwargs):
+    """Same as get() with options already read, safe to call from worker threads"""
+    read_timeout = options['read_timeout'] or timeout
+    session = get_session(url, options['pool_size'])
+    return session.get(url, timeout=(options['connect_timeout'], read_timeout), **kwargs)
+
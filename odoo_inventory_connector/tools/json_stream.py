@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import codecs
+import json
+import re
+
+# Structural characters we care about while scanning (strings are skipped as a whole)
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+# A complete JSON string literal, including escaped quotes
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+DEFAULT_ARRAY_KEYS = ('items', 'data', 'results')
+
+
+def iter_json_array(chunks, array_keys=DEFAULT_ARRAY_KEYS):
+    """Incrementally parse a JSON array of objects, possibly wrapped under one of array_keys, and yield one dict at a time"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    element_decoder = json.JSONDecoder()
+    array_keys = {key.lower() for key in array_keys}
+
+    buf = ''
+    pos = 0
+    depth = 0
+    target_depth = None  # depth of the array whose elements are yielded
+    last_key = None
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+
+        while True:
+            match = _STRUCTURAL.search(buf, pos)
+            if not match:
+                pos = len(buf)
+                break
+
+            char = match.group()
+            index = match.start()
+
+            if target_depth is not None and depth == target_depth and char in '{[':
+                # Element start: let the C scanner decode the whole element
+                try:
+                    element, end = element_decoder.raw_decode(buf, index)
+                except json.JSONDecodeError:
+                    # Element continues in the next chunk
+                    pos = index
+                    break
+                yield element
+                pos = end
+                continue
+
+            if char == '"':
+                string_match = _STRING.match(buf, index)
+                if not string_match:
+                    # String continues in the next chunk
+                    pos = index
+                    break
+                if depth == 1 and target_depth is None:
+                    last_key = string_match.group()[1:-1]
+                pos = string_match.end()
+                continue
+
+            if char in '[{':
+                depth += 1
+                if target_depth is None and char == '[':
+                    if depth == 1 or (depth == 2 and last_key and last_key.lower() in array_keys):
+                        target_depth = depth
+            else:
+                if depth == target_depth:
+                    return
+                depth -= 1
+
+            pos = index + 1
+
+        # Drop everything that has been consumed
+        if pos:
+            buf = buf[pos:]
+            pos = 0
+
+    if target_depth is None and not depth:
+        # Empty payload or no array found: nothing to yield
+        return
+    raise ValueError("Unexpected end of JSON payload")
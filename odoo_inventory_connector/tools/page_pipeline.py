@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_BUFFERED = 8
+
+
+class PagePipeline(object):
+    """Fetch numbered pages in worker threads and yield them in page order, at most max_buffered pages ahead"""
+
+    def __init__(self, fetch_page, workers=DEFAULT_WORKERS, max_buffered=DEFAULT_MAX_BUFFERED, start_page=1):
+        self.fetch_page = fetch_page
+        self.start_page = start_page
+        self.workers = max(1, workers)
+        self.max_buffered = max(self.workers, max_buffered)
+
+        self._results = queue.Queue(maxsize=self.max_buffered)
+        self._window = threading.Semaphore(self.max_buffered)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._next_page = start_page
+        self._last_page = None
+        self._full_page_size = None
+
+    def _claim_page(self):
+        with self._lock:
+            if self._stop.is_set() or (self._last_page is not None and self._next_page > self._last_page):
+                return None
+            page = self._next_page
+            self._next_page += 1
+            return page
+
+    def _worker(self):
+        while True:
+            self._window.acquire()
+            page = self._claim_page()
+            if page is None:
+                self._window.release()
+                return
+            try:
+                items = self.fetch_page(page)
+            except Exception as e:
+                self._results.put((page, e))
+                return
+            with self._lock:
+                # Pages may arrive out of order: the largest one seen is a full page
+                self._full_page_size = max(self._full_page_size or 0, len(items))
+                if not items or len(items) < self._full_page_size:
+                    # Nothing after an empty or short page
+                    if self._last_page is None or page < self._last_page:
+                        self._last_page = page
+            self._results.put((page, items))
+
+    def __iter__(self):
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='inventory_connector_fetch')
+        for _i in range(self.workers):
+            executor.submit(self._worker)
+
+        buffered = {}
+        expected = self.start_page
+        previous_first_item = None
+        full_page_size = None
+        try:
+            while True:
+                page, items = self._results.get()
+                buffered[page] = items
+
+                while expected in buffered:
+                    items = buffered.pop(expected)
+                    # Errors of pages past the end are never reached
+                    if isinstance(items, Exception):
+                        raise items
+                    # Whole items are compared, whatever the casing of their id key
+                    first_item = items[0] if items else None
+                    if not items or (expected > self.start_page and first_item == previous_first_item):
+                        if items:
+                            _logger.warning("Items endpoint returned page %s twice, stopping pipeline", expected - 1)
+                        return
+                    yield items
+                    self._window.release()
+                    if full_page_size is None:
+                        full_page_size = len(items)
+                    elif len(items) < full_page_size:
+                        return
+                    previous_first_item = first_item
+                    expected += 1
+        finally:
+            # Wake up workers waiting for a window slot so they can exit;
+            # requests still in flight finish in the background
+            self._stop.set()
+            for _i in range(self.workers):
+                self._window.release()
+            executor.shutdown(wait=False)
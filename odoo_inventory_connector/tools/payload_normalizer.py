@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+import re
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# Key mappings remembered per normalizer, dropped past this many payload shapes
+MAX_SHAPES = 64
+
+_FRACTION = re.compile(r'\.(\d+)')
+
+
+def _canonical(key):
+    return key.replace('_', '').lower()
+
+
+def parse_datetime(value):
+    """Parse an API timestamp into a naive UTC datetime, None if it is not one"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    text = str(value).strip()
+    if text[-1:] in ('Z', 'z'):
+        text = text[:-1]
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        match = _FRACTION.search(text)
+        if not match:
+            return None
+        text = f"{text[:match.start(1)]}{match.group(1)[:6].ljust(6, '0')}{text[match.end(1):]}"
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class PayloadNormalizer(object):
+    """Turn API objects into namedtuple records, matching their keys whatever the casing"""
+
+    __slots__ = ('record_class', 'fields', 'keep_payload', '_mappings')
+
+    def __init__(self, name, fields, keep_payload=False):
+        self.fields = tuple(fields)
+        attributes = [attribute for attribute, _keys, _convert in self.fields]
+        if keep_payload:
+            attributes.append('payload')
+        self.record_class = namedtuple(name, attributes)
+        self.keep_payload = keep_payload
+        self._mappings = {}
+
+    def _learn(self, obj):
+        """Return the (API key or None, convert) pair of every field for the keys of obj"""
+        by_canonical = {}
+        for key in obj:
+            by_canonical.setdefault(_canonical(key), key)
+        getters = []
+        for _attribute, keys, convert in self.fields:
+            key = next((by_canonical[canonical] for canonical in map(_canonical, keys) if canonical in by_canonical), None)
+            getters.append((key, convert))
+        return tuple(getters)
+
+    def normalize(self, obj):
+        """Return the record of one API object, missing fields are None"""
+        if not isinstance(obj, dict):
+            obj = {}
+        shape = tuple(obj)
+        getters = self._mappings.get(shape)
+        if getters is None:
+            if len(self._mappings) >= MAX_SHAPES:
+                self._mappings.clear()
+            getters = self._mappings[shape] = self._learn(obj)
+        values = []
+        for key, convert in getters:
+            value = obj.get(key) if key is not None else None
+            if value is not None and convert is not None:
+                value = convert(value)
+            values.append(value)
+        if self.keep_payload:
+            values.append(obj)
+        return self.record_class._make(values)
+
+    def normalize_all(self, objects):
+        """Return the records of a list of API objects"""
+        normalize = self.normalize
+        return [normalize(obj) for obj in objects or ()]
+
+
+def _normalize_with(normalizer):
+    return normalizer.normalize
+
+
+def _normalize_all_with(normalizer):
+    return normalizer.normalize_all
+
+
+INFO = PayloadNormalizer('InventoryInfo', [
+    # Attributes are named after the inventory fields they are written to
+    ('name', ('title', 'name'), None),
+    ('description', ('description',), None),
+    ('external_id', ('id', 'inventoryId'), None),
+    ('category', ('category',), None),
+    ('is_public', ('isPublic', 'public'), None),
+    # Timestamps are left as sent, Inventory._parse_datetime logs the unparseable ones
+    ('created_at', ('createdAt', 'createDate', 'creationDate'), None),
+    ('updated_at', ('updatedAt', 'updateDate', 'lastModified'), None),
+])
+
+NUMERIC_CONFIG = PayloadNormalizer('NumericConfig', [
+    ('min_value', ('minValue',), None),
+    ('max_value', ('maxValue',), None),
+    ('is_integer', ('isInteger',), None),
+])
+
+CUSTOM_FIELD = PayloadNormalizer('CustomField', [
+    ('name', ('name',), None),
+    ('field_type', ('type', 'fieldType'), None),
+    ('description', ('description',), None),
+    ('show_in_table', ('showInTable',), None),
+    ('numeric_config', ('numericConfig',), _normalize_with(NUMERIC_CONFIG)),
+])
+
+AGGREGATION = PayloadNormalizer('FieldAggregation', [
+    ('field_name', ('fieldName',), None),
+    ('field_type', ('fieldType',), None),
+    ('min_value', ('minValue',), None),
+    ('max_value', ('maxValue',), None),
+    ('average_value', ('averageValue',), None),
+    ('median_value', ('medianValue',), None),
+    ('true_count', ('trueCount',), None),
+    ('false_count', ('falseCount',), None),
+    ('true_percentage', ('truePercentage',), None),
+    ('most_common_values', ('mostCommonValues',), None),
+])
+
+AGGREGATED = PayloadNormalizer('AggregatedData', [
+    ('item_count', ('itemCount',), None),
+    ('custom_fields', ('customFields',), _normalize_all_with(CUSTOM_FIELD)),
+    ('aggregated_results', ('aggregatedResults',), _normalize_all_with(AGGREGATION)),
+])
+
+# Positional value slots of an item (textField1Value...), named like the
+# attributes field_mapper.FieldMapper.map_record() reads
+ITEM_VALUE_SLOTS = tuple(
+    (f"{field_type}_field{i}_value", f"{field_type}Field{i}Value")
+    for field_type in ('text', 'numeric', 'boolean') for i in range(1, 4)
+)
+
+ITEM = PayloadNormalizer('Item', [
+    ('id', ('id',), None),
+    ('name', ('name',), None),
+    ('updated_at', ('updatedAt',), parse_datetime),
+    ('tags', ('tags',), None),
+    ('tags_string', ('tagsString',), None),
+    ('custom_fields', ('customFields',), None),
+] + [(attribute, (key,), None) for attribute, key in ITEM_VALUE_SLOTS])
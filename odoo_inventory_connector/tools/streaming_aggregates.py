@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+import json
+import math
+
+# Bump when the serialized layout changes, stored states are then rebuilt
+STATE_VERSION = 1
+
+# Relative accuracy of the median estimate and bound on the sketch size
+SKETCH_RELATIVE_ACCURACY = 0.01
+SKETCH_MAX_BINS = 2048
+
+# Counters kept by the space-saving top-K and number of values reported
+TOP_K_CAPACITY = 64
+TOP_VALUES_LIMIT = 5
+
+
+class QuantileSketch(object):
+    """Mergeable quantile sketch with relative error guarantees (DDSketch)"""
+
+    __slots__ = ('relative_accuracy', 'max_bins', 'gamma', 'log_gamma', 'positive', 'negative', 'zero_count')
+
+    def __init__(self, relative_accuracy=SKETCH_RELATIVE_ACCURACY, max_bins=SKETCH_MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+
+    def _key(self, value):
+        return int(math.ceil(math.log(value) / self.log_gamma))
+
+    def _value(self, key):
+        return 2.0 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value, weight=1):
+        if value > 0:
+            store, key = self.positive, self._key(value)
+        elif value < 0:
+            store, key = self.negative, self._key(-value)
+        else:
+            self.zero_count = max(0, self.zero_count + weight)
+            return
+        count = store.get(key, 0) + weight
+        if count > 0:
+            store[key] = count
+        else:
+            store.pop(key, None)
+        if weight > 0 and len(store) > self.max_bins:
+            self._collapse(store)
+
+    def remove(self, value):
+        self.add(value, -1)
+
+    def _collapse(self, store):
+        # Fold the lowest magnitude buckets together, they matter least for relative error
+        keys = sorted(store)
+        excess = keys[:len(keys) - self.max_bins + 1]
+        target = excess[-1]
+        store[target] = sum(store.pop(key) for key in excess[:-1]) + store[target]
+
+    def merge(self, other):
+        for key, count in other.positive.items():
+            self.positive[key] = self.positive.get(key, 0) + count
+        for key, count in other.negative.items():
+            self.negative[key] = self.negative.get(key, 0) + count
+        self.zero_count += other.zero_count
+        for store in (self.positive, self.negative):
+            if len(store) > self.max_bins:
+                self._collapse(store)
+
+    @property
+    def count(self):
+        return sum(self.positive.values()) + sum(self.negative.values()) + self.zero_count
+
+    def quantile(self, q):
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_dict(self):
+        return {
+            'p': {str(key): count for key, count in self.positive.items()},
+            'n': {str(key): count for key, count in self.negative.items()},
+            'z': self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls()
+        sketch.positive = {int(key): count for key, count in data.get('p', {}).items()}
+        sketch.negative = {int(key): count for key, count in data.get('n', {}).items()}
+        sketch.zero_count = data.get('z', 0)
+        return sketch
+
+
+class TopK(object):
+    """Space-saving heavy hitters: the most frequent values in bounded memory"""
+
+    __slots__ = ('capacity', 'counters')
+
+    def __init__(self, capacity=TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counters = {}  # value -> [count, error]
+
+    def add(self, value):
+        counter = self.counters.get(value)
+        if counter is not None:
+            counter[0] += 1
+        elif len(self.counters) < self.capacity:
+            self.counters[value] = [1, 0]
+        else:
+            evicted = min(self.counters, key=lambda key: self.counters[key][0])
+            floor = self.counters.pop(evicted)[0]
+            self.counters[value] = [floor + 1, floor]
+
+    def remove(self, value):
+        counter = self.counters.get(value)
+        if counter is None:
+            return
+        counter[0] -= 1
+        if counter[0] <= 0:
+            del self.counters[value]
+
+    def top(self, limit=TOP_VALUES_LIMIT):
+        ranked = sorted(self.counters.items(), key=lambda pair: (-pair[1][0], pair[0]))
+        return [(value, counter[0]) for value, counter in ranked[:limit]]
+
+    def to_dict(self):
+        return self.counters
+
+    @classmethod
+    def from_dict(cls, data):
+        top_k = cls()
+        top_k.counters = {value: list(counter) for value, counter in data.items()}
+        return top_k
+
+
+class FieldAggregate(object):
+    """Running statistics of one field, updated one value at a time"""
+
+    __slots__ = ('field_type', 'count', 'mean', 'm2', 'min', 'max', 'extremes_stale',
+                 'sketch', 'true_count', 'false_count', 'top_k')
+
+    def __init__(self, field_type):
+        self.field_type = field_type
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.extremes_stale = False
+        self.sketch = QuantileSketch() if field_type == 'numeric' else None
+        self.true_count = 0
+        self.false_count = 0
+        self.top_k = TopK() if field_type in ('text', 'multiline') else None
+
+    def add(self, text_value, numeric_value, boolean_value):
+        if self.field_type == 'numeric':
+            if numeric_value is None:
+                return
+            self.count += 1
+            delta = numeric_value - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (numeric_value - self.mean)
+            if self.min is None or numeric_value < self.min:
+                self.min = numeric_value
+            if self.max is None or numeric_value > self.max:
+                self.max = numeric_value
+            self.sketch.add(numeric_value)
+        elif self.field_type == 'boolean':
+            if boolean_value:
+                self.true_count += 1
+            else:
+                self.false_count += 1
+        elif self.top_k is not None and text_value:
+            self.count += 1
+            self.top_k.add(text_value)
+
+    def remove(self, text_value, numeric_value, boolean_value):
+        if self.field_type == 'numeric':
+            if numeric_value is None or not self.count:
+                return
+            if self.count == 1:
+                self.count, self.mean, self.m2 = 0, 0.0, 0.0
+                self.min = self.max = None
+                self.extremes_stale = False
+            else:
+                # Welford's update run backwards
+                mean = (self.count * self.mean - numeric_value) / (self.count - 1)
+                self.m2 = max(0.0, self.m2 - (numeric_value - mean) * (numeric_value - self.mean))
+                self.mean = mean
+                self.count -= 1
+                if numeric_value == self.min or numeric_value == self.max:
+                    self.extremes_stale = True
+            self.sketch.remove(numeric_value)
+        elif self.field_type == 'boolean':
+            if boolean_value:
+                self.true_count = max(0, self.true_count - 1)
+            else:
+                self.false_count = max(0, self.false_count - 1)
+        elif self.top_k is not None and text_value:
+            self.count = max(0, self.count - 1)
+            self.top_k.remove(text_value)
+
+    def set_extremes(self, min_value, max_value):
+        self.min = min_value
+        self.max = max_value
+        self.extremes_stale = False
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    def aggregation_values(self):
+        """Values of the inventory.connector.field.aggregation columns"""
+        if self.field_type == 'numeric':
+            median = self.sketch.quantile(0.5)
+            return {
+                'min_value': self.min or 0.0,
+                'max_value': self.max or 0.0,
+                'average_value': self.mean,
+                'median_value': median or 0.0,
+                'stddev_value': math.sqrt(self.variance),
+            }
+        if self.field_type == 'boolean':
+            total = self.true_count + self.false_count
+            return {
+                'true_count': self.true_count,
+                'false_count': self.false_count,
+                'true_percentage': self.true_count * 100.0 / total if total else 0.0,
+            }
+        if self.top_k is not None:
+            return {
+                'common_values_json': json.dumps([
+                    {'value': value, 'frequency': frequency, 'percentage': frequency * 100.0 / self.count}
+                    for value, frequency in self.top_k.top() if self.count
+                ]),
+            }
+        return {}
+
+    def to_dict(self):
+        data = {'v': STATE_VERSION, 'type': self.field_type}
+        if self.field_type == 'numeric':
+            data.update(count=self.count, mean=self.mean, m2=self.m2, min=self.min, max=self.max,
+                        stale=self.extremes_stale, sketch=self.sketch.to_dict())
+        elif self.field_type == 'boolean':
+            data.update(true=self.true_count, false=self.false_count)
+        elif self.top_k is not None:
+            data.update(count=self.count, top=self.top_k.to_dict())
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild from to_dict() output, None if the state is missing or outdated"""
+        if not data or data.get('v') != STATE_VERSION:
+            return None
+        aggregate = cls(data['type'])
+        if aggregate.field_type == 'numeric':
+            aggregate.count = data['count']
+            aggregate.mean = data['mean']
+            aggregate.m2 = data['m2']
+            aggregate.min = data['min']
+            aggregate.max = data['max']
+            aggregate.extremes_stale = data['stale']
+            aggregate.sketch = QuantileSketch.from_dict(data['sketch'])
+        elif aggregate.field_type == 'boolean':
+            aggregate.true_count = data['true']
+            aggregate.false_count = data['false']
+        elif aggregate.top_k is not None:
+            aggregate.count = data['count']
+            aggregate.top_k = TopK.from_dict(data['top'])
+        return aggregate
+
+
+class StreamingAggregates(object):
+    """Running aggregates of all fields of an inventory, fed with added and removed field value rows"""
+
+    def __init__(self, aggregates=None):
+        self.aggregates = aggregates or {}
+        self.changed = set()
+
+    def add_rows(self, rows):
+        for field_name, field_type, text_value, numeric_value, boolean_value in rows:
+            aggregate = self.aggregates.get(field_name)
+            if aggregate is None or aggregate.field_type != field_type:
+                aggregate = self.aggregates[field_name] = FieldAggregate(field_type)
+            self.changed.add(field_name)
+            aggregate.add(text_value, numeric_value, boolean_value)
+
+    def remove_rows(self, rows):
+        for field_name, field_type, text_value, numeric_value, boolean_value in rows:
+            aggregate = self.aggregates.get(field_name)
+            if aggregate is None or aggregate.field_type != field_type:
+                continue
+            self.changed.add(field_name)
+            aggregate.remove(text_value, numeric_value, boolean_value)
+
+    def stale_extremes(self):
+        """Field names whose min/max must be recomputed after removals"""
+        return [field_name for field_name, aggregate in self.aggregates.items() if aggregate.extremes_stale]
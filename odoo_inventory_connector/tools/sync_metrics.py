@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from contextlib import contextmanager
+
+PHASES = ('info', 'aggregated', 'items', 'tags', 'field_values')
+
+
+class PhaseStats(object):
+    """Counters of one sync phase"""
+
+    __slots__ = ('wall_time', 'http_time', 'http_requests', 'http_bytes',
+                 'rows_created', 'rows_updated', 'rows_skipped', 'query_count')
+
+    def __init__(self):
+        self.wall_time = 0.0
+        self.http_time = 0.0
+        self.http_requests = 0
+        self.http_bytes = 0
+        self.rows_created = 0
+        self.rows_updated = 0
+        self.rows_skipped = 0
+        self.query_count = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class SyncMetrics(object):
+    """Collect per-phase timings, HTTP traffic, row counts and SQL query counts of a sync"""
+
+    def __init__(self, cr=None):
+        self.cr = cr
+        self.phases = {}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def stats(self, phase):
+        stats = self.phases.get(phase)
+        if stats is None:
+            with self._lock:
+                stats = self.phases.setdefault(phase, PhaseStats())
+        return stats
+
+    def _query_count(self):
+        return getattr(self.cr, 'sql_log_count', 0) if self.cr is not None else 0
+
+    @contextmanager
+    def phase(self, name):
+        """Attribute the wall time and queries of the enclosed block to phase name"""
+        stats = self.stats(name)
+        start = time.monotonic()
+        queries = self._query_count()
+        try:
+            yield stats
+        finally:
+            stats.wall_time += time.monotonic() - start
+            stats.query_count += self._query_count() - queries
+
+    def timed_iter(self, name, iterable):
+        """Iterate over iterable, attributing the time spent producing each element to phase name"""
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    element = next(iterator)
+                except StopIteration:
+                    return
+            yield element
+
+    def add_http(self, name, response=None, elapsed=None, nbytes=None):
+        """Record one HTTP request of phase name"""
+        if elapsed is None and response is not None:
+            elapsed = response.elapsed.total_seconds()
+        if nbytes is None and response is not None:
+            # Streamed bodies are counted with add_bytes() instead
+            nbytes = len(response.content or b'')
+        stats = self.stats(name)
+        with self._lock:
+            stats.http_requests += 1
+            stats.http_time += elapsed or 0.0
+            stats.http_bytes += nbytes or 0
+
+    def add_bytes(self, name, chunks):
+        """Pass chunks through, adding their size to the HTTP bytes of phase name"""
+        stats = self.stats(name)
+        for chunk in chunks:
+            with self._lock:
+                stats.http_bytes += len(chunk)
+            yield chunk
+
+    def count(self, name, created=0, updated=0, skipped=0):
+        stats = self.stats(name)
+        stats.rows_created += created
+        stats.rows_updated += updated
+        stats.rows_skipped += skipped
+
+    @property
+    def duration(self):
+        return time.monotonic() - self.started
+
+
+class NullMetrics(object):
+    """Drop-in for SyncMetrics when no run is being recorded"""
+
+    @contextmanager
+    def phase(self, name):
+        yield None
+
+    def timed_iter(self, name, iterable):
+        return iterable
+
+    def add_http(self, name, response=None, elapsed=None, nbytes=None):
+        pass
+
+    def add_bytes(self, name, chunks):
+        return chunks
+
+    def count(self, name, created=0, updated=0, skipped=0):
+        pass
+
+
+NULL_METRICS = NullMetrics()
@@ -2,9 +2,10 @@
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
-import requests
 import logging
 
+from ..tools import http_client
+
 _logger = logging.getLogger(__name__)
 
 class ImportInventoryWizard(models.TransientModel):
@@ -29,28 +30,21 @@ class ImportInventoryWizard(models.TransientModel):
         try:
             # First, check if the token is valid by getting basic info
             info_url = f"{self.api_url}/info"
-            response = requests.get(info_url, params={'token': self.api_token}, timeout=10)
+            response = http_client.get(self.env, info_url, params={'token': self.api_token}, timeout=10)
             
             if response.status_code != 200:
                 raise UserError(_("Invalid API token or URL. Server returned: %s") % response.text)
                 
-            info_data = response.json()
+            Inventory = self.env['inventory.connector.inventory']
+            values = Inventory._info_values(response.json())
+            values.setdefault('name', 'Imported Inventory')
+            values.update(api_token=self.api_token, api_url=self.api_url)
             
             # Create the inventory
-            inventory = self.env['inventory.connector.inventory'].create({
-                'name': info_data.get('title', 'Imported Inventory'),
-                'description': info_data.get('description'),
-                'external_id': info_data.get('id'),
-                'api_token': self.api_token,
-                'api_url': self.api_url,
-                'category': info_data.get('category'),
-                'is_public': info_data.get('isPublic', False),
-                'created_at': info_data.get('createdAt'),
-                'updated_at': info_data.get('updatedAt'),
-            })
+            inventory = Inventory.create(values)
             
-            # Immediately sync to get all data
-            inventory.action_sync_inventory()
+            # Get all data in the background instead of holding this request
+            self.env['inventory.connector.sync.job']._enqueue(inventory, 'full')
             
             # Show the new inventory record
             return {
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Unit tests of tools/json_stream.py"""
+
+import json
+import unittest
+
+from tools import json_stream
+
+ITEMS = [
+    {'id': 1, 'name': 'Bracket [in] {name}', 'tags': ['a', 'b']},
+    {'id': 2, 'name': 'Escaped \\"quote\\" and \\\\', 'customFields': {'Weight': 1.5, 'Ok': True}},
+    {'id': 3, 'name': 'Ünïcödé €', 'customFields': {'Nested': {'list': [1, [2, 3]]}}},
+    {'id': 4, 'name': '', 'tags': []},
+]
+
+
+def _chunked(data, size):
+    return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+
+    def _parse(self, payload, size, **kwargs):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        return list(json_stream.iter_json_array(_chunked(data, size), **kwargs))
+
+    def test_top_level_array_any_chunk_size(self):
+        # Size 1 splits every string, number, escape and multi-byte character
+        for size in (1, 2, 3, 7, 64, 100000):
+            with self.subTest(size=size):
+                self.assertEqual(self._parse(ITEMS, size), ITEMS)
+
+    def test_wrapped_array(self):
+        payload = {'total': 4, 'meta': {'pages': [1, 2]}, 'tags': ['x'], 'Items': ITEMS, 'after': [5]}
+        for size in (1, 5, 100000):
+            with self.subTest(size=size):
+                self.assertEqual(self._parse(payload, size), ITEMS)
+
+    def test_custom_array_keys(self):
+        payload = {'items': [{'id': 0}], 'rows': ITEMS}
+        self.assertEqual(self._parse(payload, 3, array_keys=('rows',)), ITEMS)
+
+    def test_str_chunks(self):
+        data = json.dumps(ITEMS, ensure_ascii=False)
+        self.assertEqual(list(json_stream.iter_json_array(_chunked(data, 4))), ITEMS)
+
+    def test_empty_payloads(self):
+        self.assertEqual(list(json_stream.iter_json_array([])), [])
+        self.assertEqual(list(json_stream.iter_json_array([b'', b'[', b']'])), [])
+        self.assertEqual(self._parse({'items': []}, 1), [])
+
+    def test_truncated_payload(self):
+        data = json.dumps(ITEMS).encode('utf-8')[:-10]
+        stream = json_stream.iter_json_array(_chunked(data, 8))
+        self.assertEqual(next(stream), ITEMS[0])
+        with self.assertRaises(ValueError):
+            list(stream)
+
+
+if __name__ == '__main__':
+    unittest.main()
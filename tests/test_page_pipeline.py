@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Unit tests of tools/page_pipeline.py, with in-memory page fetchers"""
+
+import random
+import threading
+import time
+import unittest
+
+from tools import page_pipeline
+
+
+class FakePages(object):
+    """Pages of item_count items served page_size at a time, with random delays"""
+
+    def __init__(self, item_count, page_size, max_delay=0.005, errors=None):
+        self.items = [{'Id': item_id} for item_id in range(1, item_count + 1)]
+        self.page_size = page_size
+        self.max_delay = max_delay
+        self.errors = errors or {}
+        self.fetched = []
+        self.lock = threading.Lock()
+        self.random = random.Random(7)
+
+    def __call__(self, page):
+        with self.lock:
+            self.fetched.append(page)
+            delay = self.random.uniform(0, self.max_delay)
+        time.sleep(delay)
+        if page in self.errors:
+            raise self.errors[page]
+        offset = (page - 1) * self.page_size
+        return self.items[offset:offset + self.page_size]
+
+
+def _fetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('inventory_connector_fetch')]
+
+
+class TestPagePipeline(unittest.TestCase):
+
+    def tearDown(self):
+        # Workers of a closed pipeline exit once their request returns
+        deadline = time.monotonic() + 2
+        while _fetch_threads() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(_fetch_threads(), [])
+
+    def test_pages_in_order(self):
+        pages = FakePages(1050, 100)
+        result = list(page_pipeline.PagePipeline(pages, workers=4, max_buffered=6))
+        self.assertEqual([len(items) for items in result], [100] * 10 + [50])
+        self.assertEqual([item for items in result for item in items], pages.items)
+
+    def test_ends_on_empty_page(self):
+        pages = FakePages(400, 100)
+        result = list(page_pipeline.PagePipeline(pages, workers=3))
+        self.assertEqual(sum(len(items) for items in result), 400)
+        self.assertIn(5, pages.fetched)
+
+    def test_capped_page_size(self):
+        # The server applies its own page size, the first page tells which
+        pages = FakePages(95, 20)
+        result = list(page_pipeline.PagePipeline(pages, workers=2))
+        self.assertEqual([len(items) for items in result], [20, 20, 20, 20, 15])
+
+    def test_start_page(self):
+        pages = FakePages(100, 10)
+        result = list(page_pipeline.PagePipeline(pages, workers=2, start_page=4))
+        self.assertEqual([item for items in result for item in items], pages.items[30:])
+
+    def test_repeated_page(self):
+        items = [{'Id': 1}, {'Id': 2}]
+        with self.assertLogs(page_pipeline.__name__, 'WARNING'):
+            result = list(page_pipeline.PagePipeline(lambda page: list(items), workers=2, max_buffered=2))
+        self.assertEqual(result, [items])
+
+    def test_error_propagates(self):
+        pages = FakePages(1000, 100, errors={3: RuntimeError("page 3")})
+        received = []
+        with self.assertRaisesRegex(RuntimeError, "page 3"):
+            for items in page_pipeline.PagePipeline(pages, workers=4):
+                received.append(items)
+        self.assertEqual(len(received), 2)
+
+    def test_error_past_the_end_is_ignored(self):
+        pages = FakePages(250, 100, errors={5: RuntimeError("page 5")})
+        result = list(page_pipeline.PagePipeline(pages, workers=4, max_buffered=8))
+        self.assertEqual(sum(len(items) for items in result), 250)
+
+    def test_early_close(self):
+        pages = FakePages(100000, 10)
+        pipeline = page_pipeline.PagePipeline(pages, workers=3, max_buffered=4)
+        iterator = iter(pipeline)
+        for _i in range(2):
+            next(iterator)
+        iterator.close()
+        time.sleep(0.05)
+        fetched = len(pages.fetched)
+        # At most the consumed pages plus one window of prefetched ones
+        self.assertLessEqual(fetched, 2 + pipeline.max_buffered + pipeline.workers)
+        time.sleep(0.05)
+        self.assertEqual(len(pages.fetched), fetched)
+
+
+if __name__ == '__main__':
+    unittest.main()
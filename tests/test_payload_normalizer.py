@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Unit tests of tools/payload_normalizer.py: key mapping and timestamp parsing"""
+
+import unittest
+from datetime import datetime
+
+from tools import field_mapper, payload_normalizer
+parse_datetime = payload_normalizer.parse_datetime
+
+
+class TestParseDatetime(unittest.TestCase):
+
+    def test_empty_values(self):
+        for value in (None, '', 0):
+            self.assertIsNone(parse_datetime(value))
+
+    def test_datetime_passes_through(self):
+        value = datetime(2025, 3, 1, 12, 30)
+        self.assertIs(parse_datetime(value), value)
+
+    def test_iso_formats(self):
+        expected = datetime(2025, 3, 1, 12, 30, 15)
+        for value in ('2025-03-01T12:30:15', '2025-03-01 12:30:15', '2025-03-01T12:30:15Z',
+                      '2025-03-01T12:30:15z', ' 2025-03-01T12:30:15 '):
+            with self.subTest(value=value):
+                self.assertEqual(parse_datetime(value), expected)
+        self.assertEqual(parse_datetime('2025-03-01'), datetime(2025, 3, 1))
+
+    def test_fractions(self):
+        # .NET writes 7 digits, older Python only parses 3 or 6
+        for value, microsecond in (('2025-03-01T12:30:15.1', 100000),
+                                   ('2025-03-01T12:30:15.12345', 123450),
+                                   ('2025-03-01T12:30:15.123456', 123456),
+                                   ('2025-03-01T12:30:15.1234567Z', 123456),
+                                   ('2025-03-01T12:30:15.123456789', 123456)):
+            with self.subTest(value=value):
+                self.assertEqual(parse_datetime(value), datetime(2025, 3, 1, 12, 30, 15, microsecond))
+
+    def test_offsets_are_converted_to_naive_utc(self):
+        self.assertEqual(parse_datetime('2025-03-01T01:30:00+02:00'), datetime(2025, 2, 28, 23, 30))
+        self.assertEqual(parse_datetime('2025-03-01T12:30:15.1234567-05:00'),
+                         datetime(2025, 3, 1, 17, 30, 15, 123456))
+
+    def test_invalid_values(self):
+        for value in ('not a date', '2025-13-01T00:00:00', '2025-03-01T12:30:15.abc', '.5', 'Z'):
+            with self.subTest(value=value):
+                self.assertIsNone(parse_datetime(value))
+
+
+class TestPayloadNormalizer(unittest.TestCase):
+
+    def _normalizer(self):
+        return payload_normalizer.PayloadNormalizer('Record', [
+            ('item_count', ('itemCount',), None),
+            ('name', ('title', 'name'), None),
+            ('size', ('size',), int),
+        ])
+
+    def test_key_spellings(self):
+        normalizer = self._normalizer()
+        for payload in ({'itemCount': 3, 'title': 'A', 'size': '7'},
+                        {'ItemCount': 3, 'Title': 'A', 'Size': '7'},
+                        {'item_count': 3, 'TITLE': 'A', 'size': 7}):
+            with self.subTest(payload=payload):
+                record = normalizer.normalize(payload)
+                self.assertEqual(tuple(record), (3, 'A', 7))
+
+    def test_key_priority_and_missing_fields(self):
+        normalizer = self._normalizer()
+        self.assertEqual(normalizer.normalize({'name': 'B', 'title': 'A'}).name, 'A')
+        self.assertEqual(normalizer.normalize({'Name': 'B'}).name, 'B')
+        record = normalizer.normalize({'other': 1, 'size': None})
+        self.assertEqual(tuple(record), (None, None, None))
+        self.assertEqual(tuple(normalizer.normalize(None)), (None, None, None))
+        self.assertEqual(tuple(normalizer.normalize(['not', 'a', 'dict'])), (None, None, None))
+
+    def test_shapes_are_cached_and_bounded(self):
+        normalizer = self._normalizer()
+        normalizer.normalize_all([{'itemCount': position, 'title': 'A'} for position in range(10)])
+        self.assertEqual(len(normalizer._mappings), 1)
+        # Same keys in another order is another shape, still mapped by name
+        self.assertEqual(normalizer.normalize({'title': 'A', 'itemCount': 2}).item_count, 2)
+        for position in range(payload_normalizer.MAX_SHAPES * 2):
+            self.assertEqual(normalizer.normalize({f'extra{position}': 0, 'itemCount': position}).item_count, position)
+        self.assertLessEqual(len(normalizer._mappings), payload_normalizer.MAX_SHAPES)
+
+    def test_keep_payload(self):
+        normalizer = payload_normalizer.PayloadNormalizer('Kept', [('id', ('id',), None)], keep_payload=True)
+        payload = {'Id': 5}
+        record = normalizer.normalize(payload)
+        self.assertEqual(record.id, 5)
+        self.assertIs(record.payload, payload)
+
+    def test_info_keeps_raw_timestamps(self):
+        info = payload_normalizer.INFO.normalize({'Title': 'Tools', 'CreateDate': '2025-01-01T00:00:00Z',
+                                                  'IsPublic': True, 'InventoryId': 4})
+        self.assertEqual((info.name, info.external_id, info.is_public), ('Tools', 4, True))
+        self.assertEqual(info.created_at, '2025-01-01T00:00:00Z')
+        self.assertIsNone(info.updated_at)
+
+    def test_nested_records(self):
+        aggregated = payload_normalizer.AGGREGATED.normalize({
+            'ItemCount': 2,
+            'CustomFields': [{'Name': 'Weight', 'Type': 'numeric', 'NumericConfig': {'MinValue': 0}}],
+            'aggregatedResults': [{'fieldName': 'Weight', 'AverageValue': 1.5}],
+        })
+        self.assertEqual(aggregated.item_count, 2)
+        custom_field = aggregated.custom_fields[0]
+        self.assertEqual((custom_field.name, custom_field.field_type), ('Weight', 'numeric'))
+        self.assertEqual(custom_field.numeric_config.min_value, 0)
+        self.assertEqual(aggregated.aggregated_results[0].average_value, 1.5)
+
+    def test_item_casing(self):
+        mapper = field_mapper.FieldMapper([('Color', 'text'), ('Size', 'text'), ('Weight', 'numeric')])
+        camel = {'id': 7, 'name': 'Drill', 'updatedAt': '2025-03-01T12:30:15.1234567Z', 'tagsString': 'a, b',
+                 'customFields': {'Color': 'red'}, 'textField1Value': 'L', 'numericField1Value': 2}
+        pascal = {key[0].upper() + key[1:]: value for key, value in camel.items()}
+        expected = [('Color', 'text', 'red', None, None), ('Size', 'text', 'L', None, None),
+                    ('Weight', 'numeric', None, 2.0, None)]
+        for payload in (camel, pascal):
+            with self.subTest(payload=payload):
+                item = payload_normalizer.ITEM.normalize(payload)
+                self.assertEqual((item.id, item.name, item.tags_string), (7, 'Drill', 'a, b'))
+                self.assertEqual(item.updated_at, datetime(2025, 3, 1, 12, 30, 15, 123456))
+                self.assertEqual(mapper.map_record(item), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
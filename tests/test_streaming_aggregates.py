@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Unit tests of tools/streaming_aggregates.py: add/remove/merge round-trips and serialization"""
+
+import json
+import random
+import statistics
+import unittest
+
+from tools import streaming_aggregates
+QuantileSketch = streaming_aggregates.QuantileSketch
+TopK = streaming_aggregates.TopK
+FieldAggregate = streaming_aggregates.FieldAggregate
+StreamingAggregates = streaming_aggregates.StreamingAggregates
+
+
+def _through_json(data):
+    # States are stored as JSON, which turns every key into a string
+    return json.loads(json.dumps(data))
+
+
+def _sample(count, seed=3):
+    rng = random.Random(seed)
+    return [round(rng.uniform(-50, 1000), 3) for _i in range(count)] + [0.0, 0.0]
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def test_median_within_relative_accuracy(self):
+        values = [value for value in _sample(2000) if value > 0]
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        median = statistics.median_low(values)
+        self.assertLessEqual(abs(sketch.quantile(0.5) - median), median * sketch.relative_accuracy * 1.01)
+
+    def test_remove_back_to_empty(self):
+        values = _sample(500)
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        for value in values:
+            sketch.remove(value)
+        self.assertEqual((sketch.positive, sketch.negative, sketch.zero_count), ({}, {}, 0))
+        self.assertIsNone(sketch.quantile(0.5))
+
+    def test_merge_matches_single_sketch(self):
+        values = _sample(1000)
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for position, value in enumerate(values):
+            whole.add(value)
+            (left if position % 2 else right).add(value)
+        left.merge(right)
+        self.assertEqual(left.to_dict(), whole.to_dict())
+        self.assertEqual(left.quantile(0.5), whole.quantile(0.5))
+
+    def test_max_bins(self):
+        sketch = QuantileSketch(max_bins=16)
+        for exponent in range(-30, 30):
+            sketch.add(2.0 ** exponent)
+        self.assertLessEqual(len(sketch.positive), 16)
+        self.assertEqual(sketch.count, 60)
+
+    def test_dict_round_trip(self):
+        sketch = QuantileSketch()
+        for value in _sample(300):
+            sketch.add(value)
+        restored = QuantileSketch.from_dict(_through_json(sketch.to_dict()))
+        self.assertEqual(restored.to_dict(), sketch.to_dict())
+        for q in (0.0, 0.25, 0.5, 0.99):
+            self.assertEqual(restored.quantile(q), sketch.quantile(q))
+
+
+class TestTopK(unittest.TestCase):
+
+    def test_exact_below_capacity(self):
+        top_k = TopK(capacity=10)
+        for value, count in (('red', 5), ('blue', 3), ('green', 3), ('black', 1)):
+            for _i in range(count):
+                top_k.add(value)
+        self.assertEqual(top_k.top(3), [('red', 5), ('blue', 3), ('green', 3)])
+        top_k.remove('red')
+        top_k.remove('black')
+        top_k.remove('unknown')
+        self.assertEqual(top_k.top(), [('red', 4), ('blue', 3), ('green', 3)])
+
+    def test_heavy_hitters_survive_eviction(self):
+        top_k = TopK(capacity=4)
+        for position in range(200):
+            top_k.add('frequent' if position % 2 else f"rare {position}")
+        self.assertEqual(len(top_k.counters), 4)
+        self.assertEqual(top_k.top(1)[0][0], 'frequent')
+
+    def test_dict_round_trip(self):
+        top_k = TopK()
+        for value in ('a', 'b', 'a', 'c', 'a', 'b'):
+            top_k.add(value)
+        restored = TopK.from_dict(_through_json(top_k.to_dict()))
+        self.assertEqual(restored.counters, top_k.counters)
+        restored.add('c')
+        self.assertNotEqual(restored.counters, top_k.counters)
+
+
+class TestFieldAggregate(unittest.TestCase):
+
+    def _numeric(self, values):
+        aggregate = FieldAggregate('numeric')
+        for value in values:
+            aggregate.add(None, value, None)
+        return aggregate
+
+    def test_numeric_statistics(self):
+        values = _sample(1000)
+        aggregate = self._numeric(values)
+        self.assertEqual(aggregate.count, len(values))
+        self.assertAlmostEqual(aggregate.mean, statistics.fmean(values), places=6)
+        self.assertAlmostEqual(aggregate.variance, statistics.pvariance(values), delta=1e-6 * statistics.pvariance(values))
+        self.assertEqual((aggregate.min, aggregate.max), (min(values), max(values)))
+
+    def test_welford_removal(self):
+        values = _sample(400)
+        kept, removed = values[:150], values[150:]
+        aggregate = self._numeric(values)
+        for value in removed:
+            aggregate.remove(None, value, None)
+        expected = self._numeric(kept)
+        self.assertEqual(aggregate.count, expected.count)
+        self.assertAlmostEqual(aggregate.mean, expected.mean, places=6)
+        self.assertAlmostEqual(aggregate.variance, expected.variance, delta=1e-6 * expected.variance)
+        self.assertEqual(aggregate.sketch.to_dict(), expected.sketch.to_dict())
+
+    def test_welford_removal_down_to_zero(self):
+        values = _sample(50)
+        aggregate = self._numeric(values)
+        for value in reversed(values):
+            aggregate.remove(None, value, None)
+        self.assertEqual((aggregate.count, aggregate.mean, aggregate.m2), (0, 0.0, 0.0))
+        self.assertEqual((aggregate.min, aggregate.max, aggregate.extremes_stale), (None, None, False))
+        self.assertEqual(aggregate.sketch.count, 0)
+        self.assertEqual(aggregate.aggregation_values()['average_value'], 0.0)
+        # Removing from an empty aggregate is a no-op
+        aggregate.remove(None, 5.0, None)
+        self.assertEqual(aggregate.count, 0)
+
+    def test_removing_an_extreme_marks_it_stale(self):
+        aggregate = self._numeric([1.0, 5.0, 9.0])
+        aggregate.remove(None, 5.0, None)
+        self.assertFalse(aggregate.extremes_stale)
+        aggregate.remove(None, 9.0, None)
+        self.assertTrue(aggregate.extremes_stale)
+        aggregate.set_extremes(1.0, 1.0)
+        self.assertFalse(aggregate.extremes_stale)
+
+    def test_boolean_and_text(self):
+        boolean = FieldAggregate('boolean')
+        for value in (True, True, False, True):
+            boolean.add(None, None, value)
+        boolean.remove(None, None, True)
+        self.assertEqual(boolean.aggregation_values(), {'true_count': 2, 'false_count': 1,
+                                                        'true_percentage': 200.0 / 3})
+        text = FieldAggregate('text')
+        for value in ('L', 'M', 'L', '', None):
+            text.add(value, None, None)
+        text.remove('M', None, None)
+        self.assertEqual(text.count, 2)
+        self.assertEqual(json.loads(text.aggregation_values()['common_values_json']),
+                         [{'value': 'L', 'frequency': 2, 'percentage': 100.0}])
+
+    def test_dict_round_trip(self):
+        aggregates = [self._numeric(_sample(100)), FieldAggregate('boolean'), FieldAggregate('text'),
+                      FieldAggregate('document')]
+        aggregates[1].add(None, None, True)
+        aggregates[2].add('value', None, None)
+        for aggregate in aggregates:
+            with self.subTest(field_type=aggregate.field_type):
+                restored = FieldAggregate.from_dict(_through_json(aggregate.to_dict()))
+                self.assertEqual(restored.to_dict(), aggregate.to_dict())
+                self.assertEqual(restored.aggregation_values(), aggregate.aggregation_values())
+
+    def test_outdated_state(self):
+        data = self._numeric([1.0]).to_dict()
+        self.assertIsNone(FieldAggregate.from_dict(dict(data, v=streaming_aggregates.STATE_VERSION - 1)))
+        self.assertIsNone(FieldAggregate.from_dict(None))
+
+
+class TestStreamingAggregates(unittest.TestCase):
+
+    def test_add_and_remove_rows(self):
+        aggregates = StreamingAggregates()
+        aggregates.add_rows([
+            ('Weight', 'numeric', None, 2.0, None),
+            ('Weight', 'numeric', None, 4.0, None),
+            ('Ok', 'boolean', None, None, True),
+        ])
+        self.assertEqual(aggregates.changed, {'Weight', 'Ok'})
+        aggregates.changed.clear()
+        aggregates.remove_rows([('Weight', 'numeric', None, 4.0, None), ('Missing', 'text', 'x', None, None)])
+        self.assertEqual(aggregates.changed, {'Weight'})
+        self.assertEqual(aggregates.aggregates['Weight'].count, 1)
+        self.assertEqual(aggregates.stale_extremes(), ['Weight'])
+
+    def test_type_change(self):
+        aggregates = StreamingAggregates()
+        aggregates.add_rows([('Size', 'numeric', None, 2.0, None)])
+        # Rows of the old type belong to a dropped state
+        aggregates.add_rows([('Size', 'text', 'L', None, None)])
+        aggregates.remove_rows([('Size', 'numeric', None, 2.0, None)])
+        aggregate = aggregates.aggregates['Size']
+        self.assertEqual((aggregate.field_type, aggregate.count), ('text', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()